@@ -0,0 +1,91 @@
+""" Benchmark construction and arithmetic of
+    :class:`bitshares.amount.Amount` and
+    :class:`bitshares.compactamount.CompactAmount`.
+
+    No node is needed, the asset is known upfront.
+
+    Usage::
+
+        python3 benchmarks/bench_amount.py [number]
+"""
+import sys
+import timeit
+import tracemalloc
+from bitshares.amount import Amount
+from bitshares.asset import Asset
+from bitshares.compactamount import AssetInfo, CompactAmount
+
+# No node is needed
+bitshares = object()
+
+Asset.cache.set("1.3.0", {
+    "id": "1.3.0",
+    "symbol": "BTS",
+    "precision": 5,
+    "options": {"flags": 0, "issuer_permissions": 0, "description": ""},
+    "dynamic_asset_data_id": "2.3.0",
+}, aliases=["BTS"])
+asset = Asset("1.3.0", bitshares_instance=bitshares)
+info = AssetInfo.from_asset(asset)
+balances = [{"amount": 1000 + i, "asset_id": "1.3.0"} for i in range(1000)]
+
+
+def memory(func):
+    """ Bytes allocated for 1000 instances
+    """
+    tracemalloc.start()
+    objs = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return size
+
+
+def report(name, number, amount, compact):
+    print("{:30s} {:10.2f} us {:10.2f} us {:8.1f}x".format(
+        name, amount / number * 1e6, compact / number * 1e6, amount / compact))
+
+
+def main(number=10000):
+    number = int(number)
+    print("{:30s} {:>13s} {:>13s} {:>9s}".format(
+        "", "Amount", "CompactAmount", "speedup"))
+
+    a = Amount(1.5, asset, bitshares_instance=bitshares)
+    c = CompactAmount(150000, info)
+
+    report("construct", number,
+           timeit.timeit(lambda: Amount(1.5, asset, bitshares_instance=bitshares), number=number),
+           timeit.timeit(lambda: CompactAmount(150000, info), number=number))
+    report("from chain", number,
+           timeit.timeit(lambda: Amount(balances[0], bitshares_instance=bitshares), number=number),
+           timeit.timeit(lambda: CompactAmount.from_chain(balances[0]), number=number))
+    report("a + b", number,
+           timeit.timeit(lambda: a + a, number=number),
+           timeit.timeit(lambda: c + c, number=number))
+    report("a * 3", number,
+           timeit.timeit(lambda: a * 3, number=number),
+           timeit.timeit(lambda: c * 3, number=number))
+    report("a < b", number,
+           timeit.timeit(lambda: a < a, number=number),
+           timeit.timeit(lambda: c < c, number=number))
+    report("sum of 1000 balances", number // 100,
+           timeit.timeit(lambda: sum(
+               [Amount(b, bitshares_instance=bitshares) for b in balances[1:]],
+               Amount(balances[0], bitshares_instance=bitshares)), number=number // 100),
+           timeit.timeit(lambda: sum(
+               CompactAmount.from_chain(b) for b in balances), number=number // 100))
+    print("{:30s} {:10.2f} us".format(
+        "CompactAmount.from_amount()",
+        timeit.timeit(lambda: CompactAmount.from_amount(a), number=number) / number * 1e6))
+    print("{:30s} {:10.2f} us".format(
+        "CompactAmount.to_amount()",
+        timeit.timeit(lambda: c.to_amount(bitshares_instance=bitshares), number=number) / number * 1e6))
+
+    print("memory for 1000 instances: {:,} bytes vs. {:,} bytes".format(
+        memory(lambda: [Amount(b, bitshares_instance=bitshares) for b in balances]),
+        memory(lambda: [CompactAmount.from_chain(b) for b in balances])))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,135 @@
+""" Benchmark encoding and decoding of typical RPC payloads with all
+    installed JSON backends of :mod:`bitsharesapi.codec`.
+
+    Usage::
+
+        python3 benchmarks/bench_codec.py [rounds]
+"""
+import sys
+import timeit
+from bitsharesapi import codec
+
+
+def get_block_reply(num_txs=60):
+    """ A reply to ``get_block`` with ``num_txs`` transfers and limit
+        orders
+    """
+    txs = []
+    for i in range(num_txs):
+        txs.append({
+            "ref_block_num": 62001 + i,
+            "ref_block_prefix": 390951726,
+            "expiration": "2017-02-23T09:33:22",
+            "operations": [
+                [0, {
+                    "fee": {"amount": 100, "asset_id": "1.3.0"},
+                    "from": "1.2.%d" % (100 + i),
+                    "to": "1.2.17",
+                    "amount": {"amount": 100000 + i, "asset_id": "1.3.0"},
+                    "extensions": []}],
+                [1, {
+                    "fee": {"amount": 578, "asset_id": "1.3.0"},
+                    "seller": "1.2.%d" % (100 + i),
+                    "amount_to_sell": {"amount": 2932 + i, "asset_id": "1.3.121"},
+                    "min_to_receive": {"amount": 1000000, "asset_id": "1.3.0"},
+                    "expiration": "2018-02-23T09:33:22",
+                    "fill_or_kill": False,
+                    "extensions": []}]],
+            "extensions": [],
+            "signatures": [
+                "20784246dc1064ed5f87dbbb9aaff3fcce052135269a8653fb500da46e"
+                "7068bec56e85ea997b8d250a9cc926777c700eed41e34ba1cabe65940965"
+                "ebe133ff9098"],
+            "operation_results": [[0, {}], [1, "1.7.%d" % (68612 + i)]],
+        })
+    return {
+        "id": 1, "jsonrpc": "2.0",
+        "result": {
+            "previous": "0062f19df70ecf3a478a84b4607d9ad8b3e3b607",
+            "timestamp": "2017-02-23T09:32:54",
+            "witness": "1.6.25",
+            "transaction_merkle_root": "e4a1d5bd0b4c0d4e5f9a6ff9f0cb1b5a9bfa3f4c",
+            "extensions": [],
+            "witness_signature": "1f3c8e" * 21,
+            "transactions": txs}}
+
+
+def get_full_accounts_reply(num_balances=40, num_orders=40):
+    """ A reply to ``get_full_accounts`` for a single busy account
+    """
+    account = {
+        "id": "1.2.100", "membership_expiration_date": "1969-12-31T23:59:59",
+        "registrar": "1.2.17", "referrer": "1.2.17",
+        "lifetime_referrer": "1.2.17", "network_fee_percentage": 2000,
+        "lifetime_referrer_fee_percentage": 3000,
+        "referrer_rewards_percentage": 0, "name": "init0",
+        "owner": {"weight_threshold": 1, "account_auths": [],
+                  "key_auths": [["BTS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV", 1]],
+                  "address_auths": []},
+        "active": {"weight_threshold": 1, "account_auths": [],
+                   "key_auths": [["BTS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV", 1]],
+                   "address_auths": []},
+        "options": {"memo_key": "BTS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV",
+                    "voting_account": "1.2.5", "num_witness": 0,
+                    "num_committee": 0,
+                    "votes": ["1:%d" % i for i in range(30)],
+                    "extensions": []},
+        "statistics": "2.6.100", "whitelisting_accounts": [],
+        "blacklisting_accounts": [], "whitelisted_accounts": [],
+        "blacklisted_accounts": [], "owner_special_authority": [0, {}],
+        "active_special_authority": [0, {}], "top_n_control_flags": 0}
+    return {
+        "id": 2, "jsonrpc": "2.0",
+        "result": [["init0", {
+            "account": account,
+            "statistics": {"id": "2.6.100", "owner": "1.2.100",
+                           "most_recent_op": "2.9.1195638", "total_ops": 505865,
+                           "total_core_in_orders": "6788960277634",
+                           "lifetime_fees_paid": "44257768405",
+                           "pending_fees": 0, "pending_vested_fees": 100},
+            "registrar_name": "init0", "referrer_name": "init0",
+            "lifetime_referrer_name": "init0", "votes": [],
+            "balances": [
+                {"id": "2.5.%d" % i, "owner": "1.2.100",
+                 "asset_type": "1.3.%d" % i, "balance": 10000000 + i}
+                for i in range(num_balances)],
+            "vesting_balances": [],
+            "limit_orders": [
+                {"id": "1.7.%d" % i, "expiration": "2018-02-23T09:33:22",
+                 "seller": "1.2.100", "for_sale": 2932 + i,
+                 "sell_price": {"base": {"amount": 2932, "asset_id": "1.3.121"},
+                                "quote": {"amount": 1000000, "asset_id": "1.3.0"}},
+                 "deferred_fee": 578}
+                for i in range(num_orders)],
+            "call_orders": [], "settle_orders": [],
+            "proposals": [], "assets": [], "withdraws": []}]]}
+
+
+def bench(name, payload, rounds):
+    encoded = codec.dumps(payload)
+    text = encoded.decode("utf8")
+    t_enc = timeit.timeit(lambda: codec.dumps(payload), number=rounds)
+    t_dec = timeit.timeit(lambda: codec.loads(text), number=rounds)
+    print("{:8s} {:20s} {:8d} bytes  encode {:8.1f} us  decode {:8.1f} us".format(
+        codec.backend, name, len(encoded),
+        t_enc / rounds * 1e6, t_dec / rounds * 1e6))
+
+
+def main(rounds=2000):
+    payloads = [
+        ("get_block", get_block_reply()),
+        ("get_full_accounts", get_full_accounts_reply()),
+    ]
+    for backend in codec.preferred_backends:
+        try:
+            codec.use(backend)
+        except ImportError:
+            print("{:8s} not installed".format(backend))
+            continue
+        for name, payload in payloads:
+            bench(name, payload, rounds)
+    codec.use()
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,143 @@
+""" Benchmark the throughput of transfers with
+    :class:`bitshares.pipeline.BroadcastPipeline` against broadcasting
+    one transaction after another with
+    :class:`bitshares.transactionbuilder.TransactionBuilder`.
+
+    The node is a local fake that answers every round trip after
+    ``latency`` milliseconds. Fees and reference blocks are computed
+    locally in both cases, hence the difference stems from signing
+    concurrently and batching the broadcasts.
+
+    Usage::
+
+        python3 benchmarks/bench_pipeline.py [transactions] [latency in ms] [workers]
+"""
+import sys
+import time
+from bitshares.account import Account
+from bitshares.fees import FeeSchedule
+from bitshares.pipeline import BroadcastPipeline
+from bitshares.tapos import TaposProvider
+from bitshares.transactionbuilder import TransactionBuilder
+from bitsharesbase import operations
+from bitsharesbase.account import PrivateKey
+
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+chain_id = "4018d7844c78f6a6c41c6a552b898022310fc5dec06da467ee7905a8dad512c8"
+
+
+class FakeNode(object):
+    """ Accepts every transaction after ``latency`` seconds per round trip
+    """
+    chain_params = {"chain_id": chain_id, "prefix": "BTS", "core_symbol": "BTS"}
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.round_trips = 0
+        self.broadcast = 0
+
+    def _round_trip(self):
+        self.round_trips += 1
+        time.sleep(self.latency)
+
+    def batch(self, calls, return_exceptions=False):
+        self._round_trip()
+        return [getattr(self, "_" + call[0])(*call[1]) for call in calls]
+
+    def _broadcast_transaction(self, tx):
+        self.broadcast += 1
+
+    def broadcast_transaction(self, tx, api=None):
+        self._round_trip()
+        self._broadcast_transaction(tx)
+
+    def get_objects(self, ids):
+        self._round_trip()
+        return [{
+            "id": "2.0.0",
+            "parameters": {
+                "maximum_transaction_size": 2048,
+                "current_fees": {
+                    "scale": 10000,
+                    "parameters": [[0, {"fee": 20000, "price_per_kbyte": 10240}]],
+                },
+            },
+        }]
+
+    def get_dynamic_global_properties(self):
+        self._round_trip()
+        return {
+            "head_block_number": 1000,
+            "head_block_id": "000003e8b1c7a9a5ab8ed2b3a1f6f1d2e1b2c3d4",
+            "time": "2000-01-01T00:00:00"}
+
+
+class FakeWallet(object):
+    def getPrivateKeyForPublicKey(self, pub):
+        return wif
+
+
+class FakeBitShares(object):
+    proposer = None
+    nobroadcast = False
+    expiration = 30
+    config = {}
+
+    def __init__(self, latency):
+        self.rpc = FakeNode(latency)
+        self.wallet = FakeWallet()
+        self.fee_schedule = FeeSchedule(bitshares_instance=self)
+        self.tapos = TaposProvider(bitshares_instance=self)
+
+
+def transfer(i):
+    return operations.Transfer(**{
+        "fee": {"amount": 0, "asset_id": "1.3.0"},
+        "from": "1.2.100",
+        "to": "1.2.101",
+        "amount": {"amount": i + 1, "asset_id": "1.3.0"},
+    })
+
+
+def sequential(bitshares, number):
+    for i in range(number):
+        builder = TransactionBuilder(bitshares_instance=bitshares)
+        builder.appendOps(transfer(i))
+        builder.appendSigner("init0", "active")
+        builder.broadcast()
+
+
+def pipelined(bitshares, number, workers):
+    with BroadcastPipeline(bitshares_instance=bitshares, workers=workers) as pipeline:
+        futures = [pipeline.submit(transfer(i), "init0") for i in range(number)]
+    for future in futures:
+        future.result()
+
+
+def main(number=20, latency=20, workers=4):
+    number, latency, workers = int(number), float(latency) / 1000, int(workers)
+    pub = format(PrivateKey(wif).pubkey, "BTS")
+    Account.cache.set("1.2.100", {
+        "id": "1.2.100", "name": "init0",
+        "active": {"weight_threshold": 1, "key_auths": [[pub, 1]], "account_auths": []},
+    }, aliases=["init0"])
+
+    for name, run in [
+        ("sequential", lambda b: sequential(b, number)),
+        ("pipeline", lambda b: pipelined(b, number, workers)),
+    ]:
+        bitshares = FakeBitShares(latency)
+        # Warm up the fee schedule and the reference block
+        bitshares.fee_schedule.refresh()
+        bitshares.tapos.refresh()
+        bitshares.rpc.round_trips = 0
+        start = time.time()
+        run(bitshares)
+        seconds = time.time() - start
+        assert bitshares.rpc.broadcast == number
+        print("{:12s} {:10.1f} tx/s {:8d} round trips".format(
+            name, number / seconds, bitshares.rpc.round_trips))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
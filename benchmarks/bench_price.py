@@ -0,0 +1,61 @@
+""" Benchmark construction, copies and arithmetic of
+    :class:`bitshares.price.Price` and :class:`bitshares.price.Order`.
+
+    No node is needed, the assets are known upfront.
+
+    Usage::
+
+        python3 benchmarks/bench_price.py [number]
+"""
+import sys
+import timeit
+from bitshares.asset import Asset
+from bitshares.price import Price, Order
+
+# No node is needed
+bitshares = object()
+
+for id, symbol, precision in [("1.3.0", "BTS", 5), ("1.3.121", "USD", 4)]:
+    Asset.cache.set(id, {
+        "id": id,
+        "symbol": symbol,
+        "precision": precision,
+        "options": {"flags": 0, "issuer_permissions": 0, "description": ""},
+        "dynamic_asset_data_id": "2.3.0",
+    }, aliases=[symbol])
+
+sell_price = {
+    "base": {"amount": 3150, "asset_id": "1.3.121"},
+    "quote": {"amount": 100000, "asset_id": "1.3.0"},
+}
+order = {
+    "id": "1.7.1000",
+    "seller": "1.2.100",
+    "for_sale": 3150,
+    "sell_price": sell_price,
+}
+
+
+def report(name, number, seconds):
+    print("{:30s} {:10.2f} us".format(name, seconds / number * 1e6))
+
+
+def main(number=10000):
+    number = int(number)
+    p = Price.from_chain(sell_price, bitshares_instance=bitshares)
+
+    report("Price(dict)", number, timeit.timeit(
+        lambda: Price(sell_price, bitshares_instance=bitshares), number=number))
+    report("Price.from_chain()", number, timeit.timeit(
+        lambda: Price.from_chain(sell_price, bitshares_instance=bitshares), number=number))
+    report("Order(dict)", number, timeit.timeit(
+        lambda: Order(order, bitshares_instance=bitshares), number=number))
+    report("Order.from_chain()", number, timeit.timeit(
+        lambda: Order.from_chain(order, bitshares_instance=bitshares), number=number))
+    report("p.copy()", number, timeit.timeit(lambda: p.copy(), number=number))
+    report("p * 2", number, timeit.timeit(lambda: p * 2, number=number))
+    report("p < p", number, timeit.timeit(lambda: p < p, number=number))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
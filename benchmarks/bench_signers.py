@@ -0,0 +1,70 @@
+""" Benchmark signatures per second with all installed backends of
+    :mod:`bitsharesbase.signers`.
+
+    Usage::
+
+        python3 benchmarks/bench_signers.py [signatures]
+"""
+import hashlib
+import sys
+import time
+from bitsharesbase import operations, signers
+from bitsharesbase.objects import Operation
+from bitsharesbase.signedtransactions import Signed_Transaction
+
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+
+
+def transaction(i):
+    return Signed_Transaction(
+        ref_block_num=34294,
+        ref_block_prefix=3707022213,
+        expiration="2016-04-06T08:29:27",
+        operations=[Operation(operations.Transfer(**{
+            "fee": {"amount": 100, "asset_id": "1.3.0"},
+            "from": "1.2.100",
+            "to": "1.2.101",
+            "amount": {"amount": i + 1, "asset_id": "1.3.0"},
+        }))])
+
+
+def bench(number):
+    secret = signers.decode_wif(wif)
+    digests = [hashlib.sha256(b"%d" % i).digest() for i in range(number)]
+    # Warm up (e.g. precomputed tables)
+    signers.sign_digest(digests[0], secret)
+    start = time.time()
+    for digest in digests:
+        signers.sign_digest(digest, secret)
+    digest_rate = number / (time.time() - start)
+
+    txs = [transaction(i) for i in range(number)]
+    start = time.time()
+    for tx in txs:
+        tx.sign([wif], chain="BTS")
+    tx_rate = number / (time.time() - start)
+    print("{:10s} {:10.1f} digests/s {:10.1f} transactions/s".format(
+        signers.backend, digest_rate, tx_rate))
+
+
+def main(number=200):
+    for backend in signers.preferred_backends + ["graphene"]:
+        try:
+            signers.use(backend)
+        except ImportError:
+            print("{:10s} not installed".format(backend))
+            continue
+        if backend == "graphene":
+            # The digest is signed as part of the transaction only
+            start = time.time()
+            for i in range(5):
+                transaction(i).sign([wif], chain="BTS")
+            print("{:10s} {:>21s} {:10.1f} transactions/s".format(
+                backend, "", 5 / (time.time() - start)))
+        else:
+            bench(number)
+    signers.use()
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
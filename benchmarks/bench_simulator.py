@@ -0,0 +1,61 @@
+""" Benchmark the event throughput of :class:`bitshares.simulator.Simulator`
+    with a random walk of order book snapshots and trades and a simple
+    market making strategy.
+
+    No node is needed.
+
+    Usage::
+
+        python3 benchmarks/bench_simulator.py [number of events]
+"""
+import random
+import sys
+import time
+from bitshares.simulator import Simulator
+
+market = {
+    "base": {"id": "1.3.0", "symbol": "BTS", "precision": 5},
+    "quote": {"id": "1.3.121", "symbol": "USD", "precision": 4},
+}
+
+
+def events(number, seed=1):
+    rng = random.Random(seed)
+    price = 300.0
+    for i in range(number):
+        price *= 1 + rng.gauss(0, 0.001)
+        if i % 100 == 0:
+            yield (i, "snapshot", {
+                "bids": [(price * (1 - 0.001 * j), rng.uniform(1, 50)) for j in range(1, 21)],
+                "asks": [(price * (1 + 0.001 * j), rng.uniform(1, 50)) for j in range(1, 21)],
+            })
+        else:
+            side = "buy" if rng.random() < 0.5 else "sell"
+            yield (i, "trade", side, price * (1.002 if side == "buy" else 0.998), rng.uniform(0.1, 5))
+
+
+def strategy(sim, event):
+    if event[0] % 50 == 0:
+        for order in sim.accountopenorders():
+            sim.cancel(order["orderid"])
+        bid, ask = sim.best_bid, sim.best_ask
+        if bid and ask:
+            sim.buy(bid, 1, expiration=100)
+            sim.sell(ask, 1, expiration=100)
+
+
+def main(number=1000000):
+    number = int(number)
+    data = list(events(number))
+    sim = Simulator(market)
+    start = time.time()
+    pnl = sim.run(data, strategy)
+    seconds = time.time() - start
+    print("{:30s} {:10.2f} us".format("per event", seconds / number * 1e6))
+    print("{:30s} {:10.2f} M".format("events per minute", number / seconds * 60 / 1e6))
+    print("{:30s} {:10d}".format("matches", sim.matches))
+    print("{:30s} {:10d}".format("strategy fills", pnl["fills"]))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,67 @@
+""" Benchmark the startup of short-lived processes: the time it takes to
+    import the library, to instanciate :class:`bitshares.BitShares` and
+    to obtain the result of the first API call.
+
+    Each measurement runs in a fresh interpreter. Without a node, only
+    the import and the (lazy) instanciation are measured.
+
+    Usage::
+
+        python3 benchmarks/bench_startup.py [wss://node.bitshares.eu] [rounds]
+"""
+import subprocess
+import statistics
+import sys
+
+IMPORT = """
+import time
+t = time.time()
+import bitshares
+print(time.time() - t)
+"""
+
+CONSTRUCT = """
+import time
+t = time.time()
+from bitshares import BitShares
+bitshares = BitShares({node!r}, autoconnect={autoconnect})
+print(time.time() - t)
+"""
+
+FIRST_CALL = """
+import time
+t = time.time()
+from bitshares import BitShares
+bitshares = BitShares({node!r}, autoconnect={autoconnect})
+bitshares.rpc.get_dynamic_global_properties()
+print(time.time() - t)
+"""
+
+
+def measure(code, rounds):
+    times = []
+    for _ in range(rounds):
+        out = subprocess.check_output([sys.executable, "-c", code])
+        times.append(float(out.decode().strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def report(name, seconds):
+    print("{:40s} {:8.1f} ms".format(name, seconds * 1e3))
+
+
+def main(node=None, rounds=5):
+    rounds = int(rounds)
+    report("import bitshares", measure(IMPORT, rounds))
+    report("BitShares(autoconnect=False)", measure(
+        CONSTRUCT.format(node=node or "wss://localhost", autoconnect=False),
+        rounds))
+    if not node:
+        return
+    for autoconnect in [True, False]:
+        report("first call (autoconnect={})".format(autoconnect), measure(
+            FIRST_CALL.format(node=node, autoconnect=autoconnect), rounds))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -6,11 +6,25 @@ __all__ = [
     "account",
     "amount",
     "asset",
+    "compactamount",
+    "amountarray",
     "block",
     "blockchain",
     "dex",
     "market",
+    "orderbook",
+    "openorders",
+    "depth",
+    "candles",
+    "tradehistory",
+    "accounttrades",
+    "simulator",
     "storage",
+    "objectcache",
+    "coherence",
+    "fees",
+    "tapos",
+    "pipeline",
     "price",
     "utils",
     "wallet",
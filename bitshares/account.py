@@ -1,5 +1,7 @@
+import re
 from bitshares.instance import shared_bitshares_instance
 from .amount import Amount
+from .objectcache import ObjectCache
 from .exceptions import AccountDoesNotExistsException
 
 
@@ -26,11 +28,14 @@ class Account(dict):
 
         .. note:: This class comes with its own caching function to reduce the
                   load on the API server. Instances of this class can be
-                  refreshed with ``Account.refresh()``.
+                  refreshed with ``Account.refresh()``. Accounts are cached
+                  by id and name in ``Account.cache`` (see
+                  :class:`bitshares.objectcache.ObjectCache`) for
+                  five minutes.
 
     """
 
-    accounts_cache = dict()
+    cache = ObjectCache(max_size=1000, ttl=300)
 
     def __init__(
         self,
@@ -51,9 +56,12 @@ class Account(dict):
         else:
             raise ValueError("Account() expects an account name, id or an instance of Account")
 
-        if self.name in Account.accounts_cache:
-            super(Account, self).__init__(Account.accounts_cache[self.name])
+        cached = Account.cache.get(self.name)
+        # Entries obtained without ``full`` lack orders, balances, etc.
+        if cached and (not full or "balances" in cached):
+            super(Account, self).__init__(cached)
             self.cached = True
+            self.name = self["name"]
         elif not lazy and not self.cached:
             self.refresh()
             self.cached = True
@@ -61,8 +69,7 @@ class Account(dict):
     def refresh(self):
         """ Refresh/Obtain an account's data from the API server
         """
-        import re
-        if re.match("^1\.2\.[0-9]*$", self.name):
+        if re.match(r"^1\.2\.[0-9]*$", self.name):
             account = self.bitshares.rpc.get_objects([self.name])[0]
         else:
             account = self.bitshares.rpc.lookup_account_names([self.name])[0]
@@ -72,10 +79,10 @@ class Account(dict):
         if self.full:
             account = self.bitshares.rpc.get_full_accounts([account["id"]], False)[0][1]
             super(Account, self).__init__(account["account"])
-            self._cache(account["account"])
             for k, v in account.items():
                 if k != "account":
                     self[k] = v
+            self._cache(dict(self))
         else:
             super(Account, self).__init__(account)
             self._cache(account)
@@ -84,7 +91,97 @@ class Account(dict):
 
     def _cache(self, account):
         # store in cache
-        Account.accounts_cache[account["name"]] = account
+        Account.cache.set(account["id"], account, aliases=[account["name"]])
+
+    @classmethod
+    def bulk(
+        cls,
+        accounts,
+        full=False,
+        bitshares_instance=None,
+        chunk_size=50
+    ):
+        """ Obtain many accounts at once. Accounts that are not in the
+            cache are obtained with chunked calls to
+            ``lookup_account_names``, ``get_objects`` or
+            ``get_full_accounts`` that are all sent in a single round trip
+            (see :func:`bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC.batch`).
+
+            :param list accounts: Account names or ids
+            :param bool full: Obtain all account data including orders,
+                positions, etc.
+            :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+            :param int chunk_size: Number of accounts to obtain per call
+            :returns: Instances of :class:`Account` in the order of
+                ``accounts``
+            :raises bitshares.exceptions.AccountDoesNotExistsException: if
+                an account does not exist
+
+            .. code-block:: python
+
+                from bitshares.account import Account
+                accounts = Account.bulk(["init0", "init1", "1.2.100"])
+        """
+        bitshares = bitshares_instance or shared_bitshares_instance()
+        keys = [a.strip().lower() for a in accounts]
+
+        found = dict()
+        missing = []
+        for key in set(keys):
+            cached = cls.cache.get(key)
+            if cached and (not full or "balances" in cached):
+                found[key] = cached
+            else:
+                missing.append(key)
+
+        if full:
+            # get_full_accounts takes names as well as ids
+            calls = [
+                ["get_full_accounts", [missing[i:i + chunk_size], False]]
+                for i in range(0, len(missing), chunk_size)
+            ]
+        else:
+            ids = [k for k in missing if re.match(r"^1\.2\.[0-9]*$", k)]
+            names = [k for k in missing if not re.match(r"^1\.2\.[0-9]*$", k)]
+            calls = [
+                ["get_objects", [ids[i:i + chunk_size]]]
+                for i in range(0, len(ids), chunk_size)
+            ] + [
+                ["lookup_account_names", [names[i:i + chunk_size]]]
+                for i in range(0, len(names), chunk_size)
+            ]
+            missing = ids + names
+
+        results = []
+        for result in bitshares.rpc.batch(calls):
+            results.extend(result)
+
+        if full:
+            results = dict(results)
+            for key in missing:
+                if key not in results:
+                    raise AccountDoesNotExistsException(key)
+                account = dict(results[key]["account"])
+                for k, v in results[key].items():
+                    if k != "account":
+                        account[k] = v
+                found[key] = account
+                cls.cache.set(account["id"], account, aliases=[account["name"]])
+        else:
+            for key, account in zip(missing, results):
+                if not account:
+                    raise AccountDoesNotExistsException(key)
+                found[key] = account
+                cls.cache.set(account["id"], account, aliases=[account["name"]])
+
+        ret = []
+        for key in keys:
+            account = cls(key, lazy=True, full=full, bitshares_instance=bitshares)
+            dict.__init__(account, found[key])
+            account.name = found[key]["name"]
+            account.cached = True
+            ret.append(account)
+        return ret
 
     def __getitem__(self, key):
         if not self.cached:
@@ -142,6 +239,10 @@ class Account(dict):
     @property
     def openorders(self):
         """ Returns open Orders
+
+            The full account is loaded upon first access. Use
+            :func:`indexed_openorders` to obtain orders that are kept up
+            to date without reloading the account.
         """
         from .price import Order
         if not self.full:
@@ -149,6 +250,24 @@ class Account(dict):
             self.refresh()
         return [Order(o) for o in self["limit_orders"]]
 
+    def indexed_openorders(self, index):
+        """ Returns open Orders from an index of the account's open
+            orders instead of loading the full account
+
+            :param bitshares.openorders.OpenOrderIndex index: Index of
+                the open orders of this account
+            :raises ValueError: if ``index`` holds the orders of another
+                account
+        """
+        from .price import Order
+        if index.account_id != self["id"]:
+            raise ValueError(
+                "The index holds the orders of %s, not %s" % (
+                    index.account_id, self["id"]))
+        return [
+            Order(o, bitshares_instance=self.bitshares)
+            for o in index.orders()]
+
     def history(
         self, first=None,
         last=1, limit=100,
@@ -0,0 +1,194 @@
+from bitshares.instance import shared_bitshares_instance
+from bitsharesapi.exceptions import NoMethodWithName
+from .price import FilledOrder
+from .utils import formatTimeString
+
+#: Operation id of ``fill_order``
+FILL_ORDER = 4
+
+
+class AccountTrades(object):
+    """ Trades (``fill_order`` operations) of an account in a market,
+        newest first
+
+        :param bitshares.account.Account account: The account (instance,
+            name or id)
+        :param bitshares.market.Market market: The market
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+        :param int cursor: Number of the account history entry
+            (``1.11.x``) to continue below, e.g. :attr:`cursor` of a
+            previous scan
+        :param int stop: Number of the account history entry to stop at
+            (exclusive), e.g. :attr:`newest` of a previous scan to only
+            obtain the trades since then
+        :param int page_size: Entries per call (at most 100)
+
+        Instead of filtering the recent fills of the whole market, the
+        history of the account is paged with
+        ``get_account_history_operations``, so that the API server only
+        returns ``fill_order`` operations. Older API servers that lack
+        this call are paged with ``get_account_history``. History entries
+        only carry the block number, the ``time`` of the trades is taken
+        from the headers of their blocks.
+
+        .. code-block:: python
+
+            from bitshares.market import Market
+            from bitshares.accounttrades import AccountTrades
+            trades = AccountTrades("init0", Market("USD:BTS"))
+            for trade in trades:
+                print(trade)
+
+            # Later on, only the new trades
+            new = AccountTrades("init0", Market("USD:BTS"), stop=trades.newest)
+
+        Several scans can run at once with :func:`scan`.
+    """
+    def __init__(
+        self,
+        account,
+        market,
+        bitshares_instance=None,
+        cursor=None,
+        stop=0,
+        page_size=100
+    ):
+        from .account import Account
+        self.bitshares = bitshares_instance or shared_bitshares_instance()
+        if isinstance(account, str) and account.startswith("1.2."):
+            self.account_id = account
+        else:
+            self.account_id = Account(account, bitshares_instance=self.bitshares)["id"]
+        self.market = market
+        self.assets = set([market["base"]["id"], market["quote"]["id"]])
+        #: Number of the oldest entry that has been scanned
+        self.cursor = cursor
+        self.stop = stop
+        #: Number of the newest entry that has been scanned
+        self.newest = None
+        self.page_size = page_size
+        #: Use ``get_account_history_operations``
+        self.operations_api = True
+        #: All entries down to ``stop`` have been scanned
+        self.done = bool(cursor is not None and cursor - 1 <= stop)
+
+    def _call(self):
+        """ The API call that obtains the next page
+        """
+        # "1.11.0" asks for the most recent entries
+        start = "1.11.{}".format(self.cursor - 1 if self.cursor else 0)
+        stop = "1.11.{}".format(self.stop)
+        if self.operations_api:
+            return [
+                "get_account_history_operations",
+                [self.account_id, FILL_ORDER, start, stop, self.page_size],
+                "history"]
+        return [
+            "get_account_history",
+            [self.account_id, stop, self.page_size, start],
+            "history"]
+
+    def _process(self, page):
+        """ Advance the cursor and return the trades of a page
+        """
+        trades = []
+        cursor = self.cursor
+        for entry in page:
+            number = int(entry["id"].split(".")[2])
+            if number <= self.stop:
+                self.done = True
+                break
+            if self.cursor is not None and number >= self.cursor:
+                # Duplicate of the previous page
+                continue
+            if self.newest is None or number > self.newest:
+                self.newest = number
+            self.cursor = number
+            op = entry["op"]
+            if op[0] != FILL_ORDER:
+                continue
+            op = op[1]
+            if (
+                op["pays"]["asset_id"] not in self.assets or
+                op["receives"]["asset_id"] not in self.assets
+            ):
+                continue
+            trade = FilledOrder.from_chain(
+                op, self.market["base"]["id"],
+                bitshares_instance=self.bitshares)
+            dict.__setitem__(trade, "block_num", entry.get("block_num"))
+            trades.append(trade)
+        if (
+            len(page) < self.page_size or
+            self.cursor == cursor or
+            self.cursor - 1 <= self.stop
+        ):
+            self.done = True
+        return trades
+
+    def next_page(self):
+        """ Obtain the trades of the next page
+
+            :returns: List of :class:`bitshares.price.FilledOrder`, which
+                may be empty even if there are more pages (see
+                :attr:`done`)
+        """
+        if self.done:
+            return []
+        return scan([self])[self]
+
+    def __iter__(self):
+        while not self.done:
+            for trade in self.next_page():
+                yield trade
+
+
+def scan(scanners):
+    """ Obtain the next page of many :class:`AccountTrades` scans (of
+        several accounts and markets) with a single round trip, and the
+        times of the trades with another one
+
+        :param list scanners: Instances of :class:`AccountTrades`
+        :returns: Dictionary with the trades per scanner
+
+        .. code-block:: python
+
+            scanners = [AccountTrades(a, m) for a in accounts for m in markets]
+            trades = dict((s, []) for s in scanners)
+            while not all(s.done for s in scanners):
+                for s, page in scan(scanners).items():
+                    trades[s].extend(page)
+    """
+    pending = [s for s in scanners if not s.done]
+    result = dict((s, []) for s in scanners)
+    if not pending:
+        return result
+    rpc = pending[0].bitshares.rpc
+    try:
+        pages = rpc.batch([s._call() for s in pending])
+    except NoMethodWithName:
+        if not any(s.operations_api for s in pending):
+            raise
+        # This API server only knows get_account_history
+        for s in pending:
+            s.operations_api = False
+        pages = rpc.batch([s._call() for s in pending])
+    for s, page in zip(pending, pages):
+        result[s] = s._process(page)
+    _add_times(rpc, [t for trades in result.values() for t in trades])
+    return result
+
+
+def _add_times(rpc, trades):
+    """ Set the ``time`` of trades from the headers of their blocks
+    """
+    blocks = sorted(set(t["block_num"] for t in trades if t["block_num"]))
+    if not blocks:
+        return
+    headers = rpc.batch([["get_block_header", [b]] for b in blocks])
+    times = dict(
+        (b, formatTimeString(h["timestamp"]))
+        for b, h in zip(blocks, headers) if h)
+    for trade in trades:
+        if trade["block_num"] in times:
+            dict.__setitem__(trade, "time", times[trade["block_num"]])
@@ -101,12 +101,13 @@ class Amount(dict):
         self["amount"] = float(self["amount"])
 
     def copy(self):
-        """ Copy the instance and make sure not to use a reference
+        """ Copy the instance and make sure not to use a reference. The
+            asset is shared between the copies.
         """
-        return Amount(
-            amount=self["amount"],
-            asset=self["asset"].copy(),
-            bitshares_instance=self.bitshares)
+        a = Amount.__new__(Amount)
+        a.bitshares = self.bitshares
+        dict.update(a, self)
+        return a
 
     @property
     def amount(self):
@@ -0,0 +1,402 @@
+from .compactamount import AssetInfo, CompactAmount
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "AmountArray and PriceArray require numpy. "
+            "Install it with 'pip install numpy'"
+        )
+
+
+def _asset_column(asset_ids, bitshares_instance=None):
+    """ Turn a list of asset ids into a list of unique assets (instances of
+        :class:`bitshares.compactamount.AssetInfo`) and an index column
+    """
+    assets = []
+    positions = dict()
+    column = np.empty(len(asset_ids), dtype=np.int32)
+    for i, asset_id in enumerate(asset_ids):
+        pos = positions.get(asset_id)
+        if pos is None:
+            pos = positions[asset_id] = len(assets)
+            assets.append(AssetInfo.get(asset_id, bitshares_instance))
+        column[i] = pos
+    return assets, column
+
+
+def _satoshis(values, asset):
+    """ Convert decimal strings (as used by ``get_order_book``) into
+        integer amounts
+    """
+    return np.rint(
+        np.array(values, dtype=np.float64) * 10 ** asset.precision
+    ).astype(np.int64)
+
+
+class AmountArray(object):
+    """ Vectorized container for many amounts of (possibly) different
+        assets, backed by NumPy arrays
+
+        :param numpy.ndarray amounts: Integer amounts (satoshis)
+        :param list assets: Instances of
+            :class:`bitshares.compactamount.AssetInfo`
+        :param numpy.ndarray asset_index: For each amount, the position of
+            its asset in ``assets``
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+
+        Usually, instances are obtained from raw API results:
+
+        .. code-block:: python
+
+            from bitshares import BitShares
+            from bitshares.amountarray import AmountArray
+            bitshares = BitShares()
+            balances = AmountArray.from_balances(
+                bitshares.rpc.get_account_balances("1.2.100", []))
+            for amount in balances.aggregate():
+                print(amount)
+
+        Indexing with an integer returns a
+        :class:`bitshares.compactamount.CompactAmount`, indexing with a
+        slice, an index array or a boolean mask returns a new
+        :class:`AmountArray`.
+
+        .. note:: This class requires ``numpy``.
+    """
+    def __init__(self, amounts, assets, asset_index, bitshares_instance=None):
+        _require_numpy()
+        self.bitshares = bitshares_instance
+        self.amounts = np.asarray(amounts, dtype=np.int64)
+        self.assets = list(assets)
+        self.asset_index = np.asarray(asset_index, dtype=np.int32)
+
+    @classmethod
+    def from_balances(cls, balances, bitshares_instance=None):
+        """ Create an instance from the result of
+            ``get_account_balances`` (``amount``/``asset_id``) or from the
+            ``balances`` of ``get_full_accounts`` (``balance``/``asset_type``)
+        """
+        _require_numpy()
+        if balances and "asset_type" in balances[0]:
+            amounts = [int(b["balance"]) for b in balances]
+            asset_ids = [b["asset_type"] for b in balances]
+        else:
+            amounts = [int(b["amount"]) for b in balances]
+            asset_ids = [b["asset_id"] for b in balances]
+        assets, column = _asset_column(asset_ids, bitshares_instance)
+        return cls(amounts, assets, column, bitshares_instance)
+
+    @classmethod
+    def from_orders(cls, orders, bitshares_instance=None):
+        """ Create an instance of the amounts for sale from the result of
+            ``get_limit_orders`` (or the ``limit_orders`` of
+            ``get_full_accounts``)
+        """
+        _require_numpy()
+        amounts = [int(o["for_sale"]) for o in orders]
+        asset_ids = [o["sell_price"]["base"]["asset_id"] for o in orders]
+        assets, column = _asset_column(asset_ids, bitshares_instance)
+        return cls(amounts, assets, column, bitshares_instance)
+
+    @classmethod
+    def from_order_book(cls, book, side="bids", asset="quote", bitshares_instance=None):
+        """ Create an instance from the result of ``get_order_book``
+
+            :param dict book: The order book
+            :param str side: ``bids`` or ``asks``
+            :param str asset: Take the ``base`` or ``quote`` amounts
+        """
+        _require_numpy()
+        info = AssetInfo.get(book[asset], bitshares_instance)
+        orders = book[side]
+        return cls(
+            _satoshis([o[asset] for o in orders], info),
+            [info],
+            np.zeros(len(orders), dtype=np.int32),
+            bitshares_instance)
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __iter__(self):
+        for amount, index in zip(self.amounts.tolist(), self.asset_index.tolist()):
+            yield CompactAmount(amount, self.assets[index])
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return CompactAmount(
+                int(self.amounts[key]),
+                self.assets[self.asset_index[key]])
+        return AmountArray(
+            self.amounts[key], self.assets, self.asset_index[key], self.bitshares)
+
+    def __repr__(self):
+        return "<AmountArray of {} amounts in {} assets>".format(
+            len(self), len(self.assets))
+
+    @property
+    def precisions(self):
+        """ The precision of the asset of each amount
+        """
+        return np.array(
+            [a.precision for a in self.assets], dtype=np.int64
+        )[self.asset_index]
+
+    @property
+    def values(self):
+        """ The amounts as floats (i.e. taking into account the precision)
+        """
+        return self.amounts / np.power(10.0, self.precisions)
+
+    def asset_mask(self, asset):
+        """ Boolean mask of all amounts of ``asset`` (id or symbol)
+        """
+        info = AssetInfo.get(asset, self.bitshares)
+        if info not in self.assets:
+            return np.zeros(len(self), dtype=bool)
+        return self.asset_index == self.assets.index(info)
+
+    def filter(self, mask):
+        """ Return the amounts for which ``mask`` is ``True``, e.g.
+
+            .. code-block:: python
+
+                balances.filter(balances.asset_mask("USD"))
+                balances.filter(balances.amounts > 0)
+        """
+        return self[np.asarray(mask, dtype=bool)]
+
+    def sort(self, descending=False):
+        """ Return the amounts sorted by value. Amounts of different assets
+            are compared by their float value.
+        """
+        order = np.argsort(self.values, kind="stable")
+        if descending:
+            order = order[::-1]
+        return self[order]
+
+    def aggregate(self):
+        """ Return the sum for each asset (one entry per asset)
+        """
+        totals = np.zeros(len(self.assets), dtype=np.int64)
+        np.add.at(totals, self.asset_index, self.amounts)
+        return AmountArray(
+            totals, self.assets, np.arange(len(self.assets)), self.bitshares)
+
+    def convert(self, prices, target):
+        """ Convert all amounts into ``target`` asset
+
+            :param dict prices: Maps asset ids or symbols to the price of
+                that asset in ``target`` units. Values can be floats
+                (e.g. ``0.2`` USD per BTS) or instances of
+                :class:`bitshares.price.Price` with ``target`` as base.
+            :param str target: Symbol or id of the target asset
+            :returns: :class:`AmountArray` of the converted amounts (of
+                the same length). Amounts of assets without price are
+                converted to ``0``.
+
+            Amounts are rounded down to full satoshis of ``target``.
+        """
+        target = AssetInfo.get(target, self.bitshares)
+        factors = np.zeros(len(self.assets), dtype=np.float64)
+        for pos, asset in enumerate(self.assets):
+            if asset is target:
+                factors[pos] = 1.0
+                continue
+            price = prices.get(asset.id, prices.get(asset.symbol))
+            if price is None:
+                continue
+            if not isinstance(price, (int, float)):
+                assert price["base"]["symbol"] == target.symbol
+                assert price["quote"]["symbol"] == asset.symbol
+                price = price["price"]
+            factors[pos] = price * 10.0 ** (target.precision - asset.precision)
+        converted = np.floor(self.amounts * factors[self.asset_index])
+        return AmountArray(
+            converted.astype(np.int64),
+            [target],
+            np.zeros(len(self), dtype=np.int32),
+            self.bitshares)
+
+    def total(self):
+        """ Return the sum of all amounts (which need to be of the same
+            asset) as :class:`bitshares.compactamount.CompactAmount`
+        """
+        assert len(np.unique(self.asset_index)) <= 1, "Amounts of different assets"
+        asset = self.assets[self.asset_index[0]] if len(self) else self.assets[0]
+        return CompactAmount(int(self.amounts.sum()), asset)
+
+    def to_amounts(self):
+        """ Return a list of :class:`bitshares.amount.Amount`
+        """
+        return [a.to_amount(self.bitshares) for a in self]
+
+
+class PriceArray(object):
+    """ Vectorized container for many prices, backed by NumPy arrays
+
+        :param numpy.ndarray base_amounts: Integer amounts of the base
+        :param numpy.ndarray quote_amounts: Integer amounts of the quote
+        :param list assets: Instances of
+            :class:`bitshares.compactamount.AssetInfo`
+        :param numpy.ndarray base_index: Position of the base asset of
+            each price in ``assets``
+        :param numpy.ndarray quote_index: Position of the quote asset of
+            each price in ``assets``
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+
+        .. code-block:: python
+
+            from bitshares.amountarray import PriceArray
+            orders = bitshares.rpc.get_limit_orders("1.3.0", "1.3.121", 100)
+            prices = PriceArray.from_orders(orders)
+            print(prices.values.max())
+
+        Indexing with an integer returns a :class:`bitshares.price.Price`,
+        indexing with a slice, an index array or a boolean mask returns a
+        new :class:`PriceArray`.
+
+        .. note:: This class requires ``numpy``.
+    """
+    def __init__(
+        self,
+        base_amounts,
+        quote_amounts,
+        assets,
+        base_index,
+        quote_index,
+        bitshares_instance=None
+    ):
+        _require_numpy()
+        self.bitshares = bitshares_instance
+        self.base_amounts = np.asarray(base_amounts, dtype=np.int64)
+        self.quote_amounts = np.asarray(quote_amounts, dtype=np.int64)
+        self.assets = list(assets)
+        self.base_index = np.asarray(base_index, dtype=np.int32)
+        self.quote_index = np.asarray(quote_index, dtype=np.int32)
+
+    @classmethod
+    def from_prices(cls, prices, bitshares_instance=None):
+        """ Create an instance from raw prices, i.e. dictionaries with
+            ``base`` and ``quote`` as they are used on the blockchain
+        """
+        _require_numpy()
+        assets, column = _asset_column(
+            [p["base"]["asset_id"] for p in prices] +
+            [p["quote"]["asset_id"] for p in prices],
+            bitshares_instance)
+        return cls(
+            [int(p["base"]["amount"]) for p in prices],
+            [int(p["quote"]["amount"]) for p in prices],
+            assets,
+            column[:len(prices)],
+            column[len(prices):],
+            bitshares_instance)
+
+    @classmethod
+    def from_orders(cls, orders, bitshares_instance=None):
+        """ Create an instance of the ``sell_price`` of the result of
+            ``get_limit_orders`` (or the ``limit_orders`` of
+            ``get_full_accounts``)
+        """
+        return cls.from_prices(
+            [o["sell_price"] for o in orders], bitshares_instance)
+
+    @classmethod
+    def from_order_book(cls, book, side="bids", bitshares_instance=None):
+        """ Create an instance from the result of ``get_order_book``
+
+            :param dict book: The order book
+            :param str side: ``bids`` or ``asks``
+        """
+        _require_numpy()
+        base = AssetInfo.get(book["base"], bitshares_instance)
+        quote = AssetInfo.get(book["quote"], bitshares_instance)
+        orders = book[side]
+        return cls(
+            _satoshis([o["base"] for o in orders], base),
+            _satoshis([o["quote"] for o in orders], quote),
+            [base, quote],
+            np.zeros(len(orders), dtype=np.int32),
+            np.ones(len(orders), dtype=np.int32),
+            bitshares_instance)
+
+    def __len__(self):
+        return len(self.base_amounts)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            from .price import Price
+            base = CompactAmount(
+                int(self.base_amounts[key]), self.assets[self.base_index[key]])
+            quote = CompactAmount(
+                int(self.quote_amounts[key]), self.assets[self.quote_index[key]])
+            return Price(
+                base=base.to_amount(self.bitshares),
+                quote=quote.to_amount(self.bitshares),
+                bitshares_instance=self.bitshares)
+        return PriceArray(
+            self.base_amounts[key], self.quote_amounts[key], self.assets,
+            self.base_index[key], self.quote_index[key], self.bitshares)
+
+    def __repr__(self):
+        return "<PriceArray of {} prices>".format(len(self))
+
+    @property
+    def values(self):
+        """ The prices as floats (``base/quote`` taking into account the
+            precisions). Prices with zero quote are ``inf``.
+        """
+        precisions = np.array([a.precision for a in self.assets], dtype=np.int64)
+        scale = np.power(
+            10.0,
+            precisions[self.quote_index] - precisions[self.base_index])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.base_amounts / self.quote_amounts * scale
+
+    def invert(self):
+        """ Return the inverted prices (e.g. ``BTS/USD`` instead of
+            ``USD/BTS``)
+        """
+        return PriceArray(
+            self.quote_amounts, self.base_amounts, self.assets,
+            self.quote_index, self.base_index, self.bitshares)
+
+    def market_mask(self, base, quote):
+        """ Boolean mask of all prices in ``base/quote``
+        """
+        base = AssetInfo.get(base, self.bitshares)
+        quote = AssetInfo.get(quote, self.bitshares)
+        if base not in self.assets or quote not in self.assets:
+            return np.zeros(len(self), dtype=bool)
+        return (
+            (self.base_index == self.assets.index(base)) &
+            (self.quote_index == self.assets.index(quote)))
+
+    def filter(self, mask):
+        """ Return the prices for which ``mask`` is ``True``
+        """
+        return self[np.asarray(mask, dtype=bool)]
+
+    def sort(self, descending=False):
+        """ Return the prices sorted by value
+        """
+        order = np.argsort(self.values, kind="stable")
+        if descending:
+            order = order[::-1]
+        return self[order]
+
+    def to_prices(self):
+        """ Return a list of :class:`bitshares.price.Price`
+        """
+        return list(self)
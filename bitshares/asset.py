@@ -1,5 +1,6 @@
 import json
 from bitshares.instance import shared_bitshares_instance
+from .objectcache import ObjectCache
 from .exceptions import AssetDoesNotExistsException
 
 
@@ -15,10 +16,23 @@ class Asset(dict):
 
         .. note:: This class comes with its own caching function to reduce the
                   load on the API server. Instances of this class can be
-                  refreshed with ``Asset.refresh()``.
+                  refreshed with ``Asset.refresh()``. Assets are cached by
+                  id and symbol in ``Asset.cache`` (see
+                  :class:`bitshares.objectcache.ObjectCache`) for an hour.
+                  Furthermore, the fields of assets that never change
+                  (id, symbol, precision, ...) are stored persistently
+                  (see :class:`bitshares.storage.AssetRegistry`) so that
+                  assets can be resolved without the API server once they
+                  have been seen. Other fields (e.g. ``options``) are
+                  obtained from the API server when they are accessed.
+                  Set ``Asset.use_registry = False`` to disable the
+                  registry.
     """
 
-    assets_cache = dict()
+    cache = ObjectCache(max_size=1000, ttl=3600)
+
+    #: Resolve assets from the persistent asset registry
+    use_registry = True
 
     def __init__(
         self,
@@ -40,9 +54,13 @@ class Asset(dict):
             self._cache(asset)
         elif isinstance(asset, str):
             self.asset = asset
-            if self.asset in Asset.assets_cache:
-                super(Asset, self).__init__(Asset.assets_cache[self.asset])
+            cached = Asset.cache.get(self.asset)
+            # Entries obtained without ``full`` lack the dynamic data
+            if cached and (not full or "dynamic_asset_data" in cached):
+                super(Asset, self).__init__(cached)
                 self.cached = True
+            elif not full and not lazy and self._load_from_registry():
+                pass
             elif not lazy and not self.cached:
                 self.refresh()
                 self.cached = True
@@ -52,17 +70,29 @@ class Asset(dict):
     def refresh(self):
         """ Refresh the data from the API server
         """
-        from bitsharesbase import asset_permissions
-
         asset = self.bitshares.rpc.get_asset(self.asset)
         if not asset:
             raise AssetDoesNotExistsException
-        super(Asset, self).__init__(asset)
+        if Asset.use_registry:
+            from .storage import assetRegistry
+            assetRegistry.add(self.bitshares.rpc, [asset])
+        self._load(asset)
         if self.full:
             if self.is_bitasset:
                 self["bitasset_data"] = self.bitshares.rpc.get_object(asset["bitasset_data_id"])
             self["dynamic_asset_data"] = self.bitshares.rpc.get_object(asset["dynamic_asset_data_id"])
 
+        self.cached = True
+        self._cache(dict(self))
+
+    def _load(self, asset):
+        """ Fill the instance with the asset object as obtained from the
+            API server
+        """
+        from bitsharesbase import asset_permissions
+
+        super(Asset, self).__init__(asset)
+
         # Permissions and flags
         self["permissions"] = asset_permissions.todict(asset["options"]["issuer_permissions"])
         self["flags"] = asset_permissions.todict(asset["options"]["flags"])
@@ -71,12 +101,128 @@ class Asset(dict):
         except:
             self["description"] = asset["options"]["description"]
 
+    def _load_from_registry(self):
+        """ Try to fill the instance with the fields of the persistent
+            asset registry
+        """
+        if not Asset.use_registry or self.bitshares.rpc is None:
+            return False
+        from .storage import assetRegistry
+        asset = assetRegistry.get(self.bitshares.rpc, self.asset)
+        if not asset:
+            return False
+        super(Asset, self).__init__(asset)
         self.cached = True
-        self._cache(asset)
+        self._cache(dict(self))
+        return True
+
+    @property
+    def partial(self):
+        """ Does the instance only hold the fields of the asset registry?
+        """
+        return (
+            super(Asset, self).__contains__("id") and
+            not super(Asset, self).__contains__("options"))
 
     def _cache(self, asset):
         # store in cache
-        Asset.assets_cache[asset["symbol"]] = asset
+        Asset.cache.set(asset["id"], asset, aliases=[asset["symbol"]])
+
+    @classmethod
+    def bulk(
+        cls,
+        assets,
+        full=False,
+        bitshares_instance=None,
+        chunk_size=50
+    ):
+        """ Obtain many assets at once. Assets that are neither in the
+            cache nor in the asset registry are obtained with chunked
+            calls to ``lookup_asset_symbols`` and ``get_objects`` that are
+            all sent in a single round trip (see
+            :func:`bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC.batch`).
+            With ``full``, the bitasset and dynamic asset data take
+            another round trip.
+
+            :param list assets: Symbols or ids of assets
+            :param bool full: Also obtain bitasset-data and dynamic asset data
+            :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+            :param int chunk_size: Number of objects to obtain per call
+            :returns: Instances of :class:`Asset` in the order of ``assets``
+            :raises bitshares.exceptions.AssetDoesNotExistsException: if an
+                asset does not exist
+
+            .. code-block:: python
+
+                from bitshares.asset import Asset
+                usd, cny, bts = Asset.bulk(["USD", "CNY", "1.3.0"])
+        """
+        bitshares = bitshares_instance or shared_bitshares_instance()
+        registry = None
+        if cls.use_registry and not full:
+            from .storage import assetRegistry as registry
+
+        missing = []
+        for key in set(assets):
+            cached = cls.cache.get(key)
+            if cached and (not full or "dynamic_asset_data" in cached):
+                continue
+            if registry and registry.get(bitshares.rpc, key):
+                continue
+            missing.append(key)
+
+        ids = [k for k in missing if len(k.split(".")) == 3]
+        symbols = [k for k in missing if len(k.split(".")) != 3]
+        calls = [
+            ["get_objects", [ids[i:i + chunk_size]]]
+            for i in range(0, len(ids), chunk_size)
+        ] + [
+            ["lookup_asset_symbols", [symbols[i:i + chunk_size]]]
+            for i in range(0, len(symbols), chunk_size)
+        ]
+        results = []
+        for result in bitshares.rpc.batch(calls):
+            results.extend(result)
+        fetched = dict(zip(ids + symbols, results))
+        for key, asset in fetched.items():
+            if not asset:
+                raise AssetDoesNotExistsException(key)
+        if fetched and cls.use_registry:
+            from .storage import assetRegistry
+            assetRegistry.add(bitshares.rpc, list(fetched.values()))
+
+        data = dict()
+        if full and fetched:
+            object_ids = []
+            for asset in fetched.values():
+                object_ids.append(asset["dynamic_asset_data_id"])
+                if "bitasset_data_id" in asset:
+                    object_ids.append(asset["bitasset_data_id"])
+            calls = [
+                ["get_objects", [object_ids[i:i + chunk_size]]]
+                for i in range(0, len(object_ids), chunk_size)
+            ]
+            for result in bitshares.rpc.batch(calls):
+                for obj in result:
+                    data[obj["id"]] = obj
+
+        ret = []
+        for key in assets:
+            asset = cls(key, lazy=True, full=full, bitshares_instance=bitshares)
+            if not asset.cached and key not in fetched:
+                if full or not asset._load_from_registry():
+                    # Expired from the cache in the meantime
+                    asset.refresh()
+            elif not asset.cached:
+                asset._load(fetched[key])
+                asset.cached = True
+                if full:
+                    if asset.is_bitasset:
+                        asset["bitasset_data"] = data[asset["bitasset_data_id"]]
+                    asset["dynamic_asset_data"] = data[asset["dynamic_asset_data_id"]]
+                asset._cache(dict(asset))
+            ret.append(asset)
+        return ret
 
     @property
     def is_bitasset(self):
@@ -97,11 +243,13 @@ class Asset(dict):
         return self["flags"]
 
     def __getitem__(self, key):
-        if not self.cached:
+        if not self.cached or (
+            self.partial and not super(Asset, self).__contains__(key)
+        ):
             self.refresh()
         return super(Asset, self).__getitem__(key)
 
     def items(self):
-        if not self.cached:
+        if not self.cached or self.partial:
             self.refresh()
         return super(Asset, self).items()
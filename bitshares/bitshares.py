@@ -4,9 +4,6 @@ import random
 import re
 from datetime import datetime, timedelta
 
-from bitsharesapi.bitsharesnoderpc import BitSharesNodeRPC
-from bitsharesbase.account import PrivateKey, PublicKey
-from bitsharesbase import transactions, operations
 from .asset import Asset
 from .account import Account
 from .amount import Amount
@@ -21,7 +18,6 @@ from .exceptions import (
     MissingKeyError,
 )
 from .wallet import Wallet
-from .transactionbuilder import TransactionBuilder
 
 log = logging.getLogger(__name__)
 
@@ -39,6 +35,9 @@ class BitShares(object):
         :param str proposer: Propose a transaction using this proposer *(optional)*
         :param int expiration: Delay in seconds until transactions are supposed to expire *(optional)*
         :param bool bundle: Do not broadcast transactions right away, but allow to bundle operations *(optional)*
+        :param bool autoconnect: Connect to the node right away. If ``False``, the connection is established with the first API call (defaults to ``True``) *(optional)*
+        :param bool local_fees: Compute the fees of transactions locally from the cached fee schedule instead of calling ``get_required_fees`` (see :class:`bitshares.fees.FeeSchedule`) *(optional)*
+        :param bool cached_tapos: Reference a cached recent block in transactions instead of calling ``get_dynamic_global_properties`` (see :class:`bitshares.tapos.TaposProvider`) *(optional)*
 
         Three wallet operation modes are possible:
 
@@ -65,7 +64,10 @@ class BitShares(object):
 
             uptick set node <host>
 
-        where ``<host>`` starts with ``ws://`` or ``wss://``.
+        where ``<host>`` starts with ``ws://`` or ``wss://``. Nodes that
+        are reachable through HTTP(S) can be used by providing an URL that
+        starts with ``http://`` or ``https://`` (see
+        :class:`bitsharesapi.httprpc.BitSharesHttpRPC`).
 
         The purpose of this class it to simplify interaction with
         BitShares.
@@ -116,6 +118,16 @@ class BitShares(object):
         self.expiration = int(kwargs.get("expiration", 30))
         self.proposer = kwargs.get("proposer", None)
         self.bundle = bool(kwargs.get("bundle", False))
+        if kwargs.get("local_fees", False):
+            from .fees import FeeSchedule
+            self.fee_schedule = FeeSchedule(bitshares_instance=self)
+        else:
+            self.fee_schedule = None
+        if kwargs.get("cached_tapos", False):
+            from .tapos import TaposProvider
+            self.tapos = TaposProvider(bitshares_instance=self)
+        else:
+            self.tapos = None
 
         # Store config for access through other Classes
         self.config = config
@@ -127,7 +139,7 @@ class BitShares(object):
                           **kwargs)
 
         self.wallet = Wallet(self.rpc, **kwargs)
-        self.txbuffer = TransactionBuilder(bitshares_instance=self)
+        self._txbuffer = None
 
     def _connect(self,
                  node="",
@@ -148,7 +160,23 @@ class BitShares(object):
         if not rpcpassword and "rpcpassword" in config:
             rpcpassword = config["rpcpassword"]
 
-        self.rpc = BitSharesNodeRPC(node, rpcuser, rpcpassword, **kwargs)
+        # The URL scheme selects the transport
+        urls = node if isinstance(node, list) else [node]
+        if urls[0][:4] == "http":
+            from bitsharesapi.httprpc import BitSharesHttpRPC as NodeRPC
+        else:
+            from bitsharesapi.bitsharesnoderpc import BitSharesNodeRPC as NodeRPC
+        self.rpc = NodeRPC(node, rpcuser, rpcpassword, **kwargs)
+
+    @property
+    def txbuffer(self):
+        """ The :class:`bitshares.transactionbuilder.TransactionBuilder`
+            that collects the operations of this instance
+        """
+        if self._txbuffer is None:
+            from .transactionbuilder import TransactionBuilder
+            self._txbuffer = TransactionBuilder(bitshares_instance=self)
+        return self._txbuffer
 
     def newWallet(self, pwd):
         """ Create a new wallet. This method is basically only calls
@@ -189,9 +217,8 @@ class BitShares(object):
             # In case we want to add more ops to the tx (bundle)
             self.txbuffer.appendSigner(account, permission)
         else:
-            # default behavior: sign + broadcast
+            # default behavior: sign + broadcast (which signs)
             self.txbuffer.appendSigner(account, permission)
-            self.txbuffer.sign()
             return self.txbuffer.broadcast()
 
     def sign(self, tx=None, wifs=[]):
@@ -203,6 +230,7 @@ class BitShares(object):
                 from the wallet as defined in "missing_signatures" key
                 of the transactions.
         """
+        from .transactionbuilder import TransactionBuilder
         if tx:
             txbuffer = TransactionBuilder(tx, bitshares_instance=self)
         else:
@@ -217,6 +245,7 @@ class BitShares(object):
 
             :param tx tx: Signed transaction to broadcast
         """
+        from .transactionbuilder import TransactionBuilder
         if tx:
             # If tx is provided, we broadcast the tx
             return TransactionBuilder(tx).broadcast()
@@ -285,6 +314,7 @@ class BitShares(object):
             :raises AccountExistsException: if the account already exists on the blockchain
 
         """
+        from bitsharesbase import operations
         if not registrar and config["default_account"]:
             registrar = config["default_account"]
         if not registrar:
@@ -392,6 +422,7 @@ class BitShares(object):
             :param str account: (optional) the source account for the transfer if not ``default_account``
         """
         from .memo import Memo
+        from bitsharesbase import operations
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -453,6 +484,8 @@ class BitShares(object):
                 by signatures to be able to interact
         """
         from copy import deepcopy
+        from bitsharesbase import operations
+        from bitsharesbase.account import PublicKey
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -515,6 +548,8 @@ class BitShares(object):
             :param int threshold: The threshold that needs to be reached
                 by signatures to be able to interact
         """
+        from bitsharesbase import operations
+        from bitsharesbase.account import PublicKey
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -591,6 +626,8 @@ class BitShares(object):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
+        from bitsharesbase import operations
+        from bitsharesbase.account import PublicKey
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -616,6 +653,7 @@ class BitShares(object):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
+        from bitsharesbase import operations
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -650,6 +688,7 @@ class BitShares(object):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
+        from bitsharesbase import operations
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -685,6 +724,7 @@ class BitShares(object):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
+        from bitsharesbase import operations
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -719,6 +759,7 @@ class BitShares(object):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
+        from bitsharesbase import operations
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -754,6 +795,7 @@ class BitShares(object):
 
             :param str orderNumber: The Order Object ide of the form ``1.7.xxxx``
         """
+        from bitsharesbase import operations
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -780,6 +822,7 @@ class BitShares(object):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
+        from bitsharesbase import operations
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -811,6 +854,7 @@ class BitShares(object):
                 to (defaults to ``default_account``)
         """
         from .proposal import Proposal
+        from bitsharesbase import operations
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -841,6 +885,7 @@ class BitShares(object):
                 to (defaults to ``default_account``)
         """
         from .proposal import Proposal
+        from bitsharesbase import operations
         if not account:
             if "default_account" in config:
                 account = config["default_account"]
@@ -1,4 +1,5 @@
 from bitshares.instance import shared_bitshares_instance
+from .objectcache import ObjectCache
 
 from .exceptions import BlockDoesNotExistsException
 from .utils import parse_time
@@ -23,9 +24,15 @@ class Block(dict):
 
         .. note:: This class comes with its own caching function to reduce the
                   load on the API server. Instances of this class can be
-                  refreshed with ``Account.refresh()``.
+                  refreshed with ``Block.refresh()``. The most recently
+                  used blocks are cached by block number in
+                  ``Block.cache`` (see
+                  :class:`bitshares.objectcache.ObjectCache`).
 
     """
+
+    cache = ObjectCache(max_size=100)
+
     def __init__(
         self,
         block,
@@ -39,8 +46,13 @@ class Block(dict):
         if isinstance(block, Block):
             super(Block, self).__init__(block)
             self.cached = True
-        elif not lazy:
-            self.refresh()
+        else:
+            cached = Block.cache.get(block)
+            if cached:
+                super(Block, self).__init__(cached)
+                self.cached = True
+            elif not lazy:
+                self.refresh()
 
     def refresh(self):
         """ Even though blocks never change, you freshly obtain its contents
@@ -51,6 +63,7 @@ class Block(dict):
             raise BlockDoesNotExistsException
         super(Block, self).__init__(block)
         self.cached = True
+        Block.cache.set(self.block, block)
 
     def __getitem__(self, key):
         if not self.cached:
@@ -0,0 +1,273 @@
+import time
+import threading
+from bitshares.instance import shared_bitshares_instance
+from .utils import formatTime, timestamp
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+#: Resolutions in seconds
+RESOLUTIONS = {
+    "1m": 60,
+    "5m": 300,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+#: Columns of the arrays returned by :func:`Candles.arrays`
+COLUMNS = ["open", "high", "low", "close", "base_volume", "quote_volume"]
+
+
+class Candles(object):
+    """ OHLCV candles of a market
+
+        :param bitshares.market.Market market: The market
+        :param str resolution: ``1m``, ``5m``, ``1h`` or ``1d`` (or the
+            bucket size in seconds as supported by the node)
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+        :param int slices_per_batch: Number of ``get_market_history``
+            calls (200 buckets each) to send in a single round trip
+
+        Completed buckets are obtained with ``get_market_history`` and
+        stored on disk (see :class:`bitshares.storage.CandleStore`), so
+        that every period is only obtained once. Missing periods of
+        arbitrary length are split into slices that are all sent at once
+        (see :func:`bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC.batch`).
+        The current (open) bucket is built from ``get_trade_history``
+        and can be updated from the live trade feed afterwards.
+
+        Prices are denoted in ``base``/``quote``.
+
+        .. code-block:: python
+
+            from datetime import datetime, timedelta
+            from bitshares.market import Market
+            from bitshares.candles import Candles
+            candles = Candles(Market("USD:BTS"), "1h")
+            data = candles.fetch(datetime.utcnow() - timedelta(days=30))
+            data["time"], data["close"], data["base_volume"]
+
+            # Keep the open bucket up to date
+            book = Market("USD:BTS").liveorderbook()
+            book.websocket.on_market += candles.process_market
+            book.start()
+    """
+    def __init__(
+        self,
+        market,
+        resolution="1h",
+        bitshares_instance=None,
+        slices_per_batch=50
+    ):
+        self.bitshares = bitshares_instance or shared_bitshares_instance()
+        self.market = market
+        self.seconds = RESOLUTIONS.get(resolution, resolution)
+        self.slices_per_batch = slices_per_batch
+        self.lock = threading.RLock()
+
+        self.base_id = market["base"]["id"]
+        self.quote_id = market["quote"]["id"]
+        self.base_precision = 10 ** market["base"]["precision"]
+        self.quote_precision = 10 ** market["quote"]["precision"]
+
+        #: Buckets that are known, open time -> list of values in the
+        #: order of :data:`COLUMNS`
+        self.buckets = dict()
+
+    def bucket(self, timestamp):
+        """ Opening time of the bucket that contains ``timestamp``
+        """
+        return int(timestamp) // self.seconds * self.seconds
+
+    def _key(self):
+        return (
+            self.bitshares.rpc.chain_params["chain_id"],
+            self.base_id, self.quote_id, self.seconds)
+
+    def fetch(self, start=None, stop=None, fill=False):
+        """ Obtain the candles of ``[start, stop)`` and return them as
+            arrays (see :func:`Candles.arrays`)
+
+            :param start: Start as ``datetime`` (UTC) or timestamp
+                (defaults to 200 buckets before ``stop``)
+            :param stop: Stop as ``datetime`` (UTC) or timestamp
+                (defaults to now)
+            :param bool fill: Add buckets without trades
+        """
+        from .storage import candleStore
+        now = time.time()
+        stop = timestamp(stop) if stop is not None else int(now)
+        start = timestamp(start) if start is not None else stop - 200 * self.seconds
+        start = self.bucket(start)
+        current = self.bucket(now)
+        completed = min(self.bucket(stop + self.seconds - 1), current)
+
+        key = self._key()
+        if start < completed:
+            missing = candleStore.missing(key, start, completed)
+            if missing:
+                for s, e, buckets in self._market_history(missing):
+                    candleStore.add(key, buckets, s, e)
+            with self.lock:
+                for row in candleStore.get(key, start, completed):
+                    self.buckets[row[0]] = list(row[1:])
+
+        if stop > current and current not in self.buckets:
+            self._trade_history(current)
+        return self.arrays(start, stop, fill=fill)
+
+    def _market_history(self, ranges):
+        """ Obtain the buckets of all ``ranges`` with sliced calls to
+            ``get_market_history``
+
+            :returns: Tuples ``(start, stop, buckets)`` per slice
+        """
+        slices = []
+        for start, stop in ranges:
+            for s in range(start, stop, 200 * self.seconds):
+                slices.append((s, min(s + 200 * self.seconds, stop)))
+        for i in range(0, len(slices), self.slices_per_batch):
+            chunk = slices[i:i + self.slices_per_batch]
+            results = self.bitshares.rpc.batch([
+                ["get_market_history", [
+                    self.base_id, self.quote_id, self.seconds,
+                    formatTime(float(s)), formatTime(float(e - self.seconds))
+                ], "history"]
+                for s, e in chunk
+            ])
+            for (s, e), result in zip(chunk, results):
+                buckets = []
+                for b in result:
+                    bucket = self._parse_bucket(b)
+                    if s <= bucket[0] < e:
+                        buckets.append(bucket)
+                yield s, e, buckets
+
+    def _parse_bucket(self, b):
+        """ Turn a bucket object of ``get_market_history`` into a tuple
+            ``(open, open price, high, low, close, base volume, quote
+            volume)`` in the orientation of the market
+        """
+        if b["key"]["base"] == self.base_id:
+            def price(field):
+                return (
+                    (int(b[field + "_base"]) / self.base_precision) /
+                    (int(b[field + "_quote"]) / self.quote_precision))
+            high, low = price("high"), price("low")
+            base_volume, quote_volume = b["base_volume"], b["quote_volume"]
+        else:
+            # The node orders the assets by id
+            def price(field):
+                return (
+                    (int(b[field + "_quote"]) / self.base_precision) /
+                    (int(b[field + "_base"]) / self.quote_precision))
+            high, low = price("low"), price("high")
+            base_volume, quote_volume = b["quote_volume"], b["base_volume"]
+        return (
+            timestamp(b["key"]["open"]),
+            price("open"), high, low, price("close"),
+            int(base_volume) / self.base_precision,
+            int(quote_volume) / self.quote_precision,
+        )
+
+    def _trade_history(self, start, limit=100):
+        """ Build the bucket opening at ``start`` from
+            ``get_trade_history``
+        """
+        from .tradehistory import fetch_trades
+        trades = fetch_trades(
+            self.bitshares.rpc, self.base_id, self.quote_id,
+            start, int(time.time()) + 1, limit)
+        with self.lock:
+            self.buckets.pop(start, None)
+            # Oldest first
+            for trade in reversed(trades):
+                self.process_trade(
+                    timestamp(trade["date"]), float(trade["price"]),
+                    float(trade["amount"]), float(trade["value"]))
+
+    def process_trade(self, timestamp, price, quote, base):
+        """ Update the bucket of ``timestamp`` with a trade
+
+            :param int timestamp: Time of the trade
+            :param float price: Price in ``base``/``quote``
+            :param float quote: Amount of ``quote``
+            :param float base: Amount of ``base``
+        """
+        t = self.bucket(timestamp)
+        with self.lock:
+            bucket = self.buckets.get(t)
+            if bucket is None:
+                self.buckets[t] = [price, price, price, price, base, quote]
+            else:
+                bucket[1] = max(bucket[1], price)
+                bucket[2] = min(bucket[2], price)
+                bucket[3] = price
+                bucket[4] += base
+                bucket[5] += quote
+
+    def process_market(self, data):
+        """ Update the open bucket with the fills of a market
+            notification (see ``subscribe_to_market``)
+        """
+        now = time.time()
+        for notice in data:
+            if not isinstance(notice, list) or not notice:
+                continue
+            if not isinstance(notice[0], list) or notice[0][0] != 4:
+                continue
+            fill = notice[0][1]
+            # Each trade comes as fill of the maker and of the taker
+            if not fill.get("is_maker", True):
+                continue
+            if fill["pays"]["asset_id"] == self.quote_id:
+                quote, base = fill["pays"], fill["receives"]
+            else:
+                quote, base = fill["receives"], fill["pays"]
+            if quote["asset_id"] != self.quote_id or base["asset_id"] != self.base_id:
+                continue
+            quote = int(quote["amount"]) / self.quote_precision
+            base = int(base["amount"]) / self.base_precision
+            if quote:
+                self.process_trade(now, base / quote, quote, base)
+
+    def arrays(self, start=None, stop=None, fill=False):
+        """ Return the known buckets of ``[start, stop)`` as dictionary
+            of NumPy arrays ``time`` (opening time as timestamp),
+            ``open``, ``high``, ``low``, ``close``,
+            ``base_volume`` and ``quote_volume`` (requires ``numpy``)
+
+            :param start: Start as ``datetime`` (UTC) or timestamp
+            :param stop: Stop as ``datetime`` (UTC) or timestamp
+            :param bool fill: Add buckets without trades (at the close
+                of the previous bucket and without volume)
+        """
+        if np is None:
+            raise ImportError(
+                "Candles.arrays() requires numpy. "
+                "Install it with 'pip install numpy'"
+            )
+        start = timestamp(start) if start is not None else 0
+        stop = timestamp(stop) if stop is not None else float("inf")
+        with self.lock:
+            opens = sorted(t for t in self.buckets if start <= t < stop)
+            rows = [self.buckets[t] for t in opens]
+        times = np.array(opens, dtype=np.int64)
+        values = np.array(rows, dtype=np.float64).reshape(-1, len(COLUMNS))
+        if fill and len(times):
+            full = np.arange(times[0], times[-1] + 1, self.seconds, dtype=np.int64)
+            pos = (times - times[0]) // self.seconds
+            # Index of the last bucket with trades
+            last = np.zeros(len(full), dtype=np.int64)
+            last[pos] = np.arange(len(times))
+            last = np.maximum.accumulate(last)
+            filled = np.repeat(values[last, 3:4], 4, axis=1)
+            filled = np.hstack([filled, np.zeros((len(full), 2))])
+            filled[pos] = values
+            times, values = full, filled
+        data = {"time": times}
+        for i, column in enumerate(COLUMNS):
+            data[column] = values[:, i]
+        return data
@@ -0,0 +1,246 @@
+import logging
+import threading
+from bitsharesapi.websocket import BitSharesWebsocket
+from bitshares.instance import shared_bitshares_instance
+from .account import Account
+from .asset import Asset
+from .witness import Witness
+log = logging.getLogger(__name__)
+
+
+class CoherenceWebsocket(BitSharesWebsocket):
+    """ Websocket connection that (re-)subscribes to all cached objects
+        once it is established
+    """
+    def __init__(self, coherence, *args, **kwargs):
+        self.coherence = coherence
+        super(CoherenceWebsocket, self).__init__(*args, **kwargs)
+
+    def on_open(self, ws):
+        super(CoherenceWebsocket, self).on_open(ws)
+        self.coherence.connected = True
+        self.coherence.subscribe_all()
+
+    def on_close(self, ws):
+        self.coherence.connected = False
+        super(CoherenceWebsocket, self).on_close(ws)
+
+
+class CacheCoherence(object):
+    """ Keep the cached accounts, assets and witnesses up to date by means
+        of push notifications from the node
+
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+
+        The node is asked to notify us about changes to the objects that
+        are in :attr:`bitshares.account.Account.cache`,
+        :attr:`bitshares.asset.Asset.cache` and
+        :attr:`bitshares.witness.Witness.cache`. Objects that are added
+        to the caches later on are subscribed to as well. Notifications
+        update the cached objects in place (e.g. balances and orders of
+        full accounts, or the ``dynamic_asset_data`` of assets), changed
+        asset options and removed objects are evicted from the cache.
+
+        .. code-block:: python
+
+            from bitshares.coherence import CacheCoherence
+            from bitshares.asset import Asset
+            coherence = CacheCoherence()
+            coherence.start()
+            # Always up to date without polling the node
+            Asset("USD", full=True)["dynamic_asset_data"]["current_supply"]
+
+        .. note:: Instances of :class:`bitshares.account.Account` etc.
+                  take a copy of the cached object when they are created.
+                  Hence, only newly created instances see the changes.
+    """
+    caches = [Account.cache, Asset.cache, Witness.cache]
+
+    def __init__(self, bitshares_instance=None):
+        self.bitshares = bitshares_instance or shared_bitshares_instance()
+        self.connected = False
+        self.thread = None
+        self.lock = threading.RLock()
+
+        # object id -> (key, field) for objects that are stored
+        # as part of a cached object
+        self.index = dict()
+        # limit order id -> account id
+        self.orders = dict()
+
+        self.websocket = CoherenceWebsocket(
+            self,
+            urls=self.bitshares.rpc.urls,
+            user=self.bitshares.rpc.user,
+            password=self.bitshares.rpc.password,
+            objects=[
+                "1.2.x", "1.3.x", "1.6.x", "1.7.x",
+                "2.0.x", "2.1.x", "2.3.x", "2.4.x", "2.5.x", "2.6.x"
+            ],
+            on_object=self.process_object,
+            on_removed=self.process_removed,
+        )
+
+        for cache in self.caches:
+            cache.listeners.append(self.watch)
+
+    def start(self):
+        """ Listen to notifications in a background thread
+        """
+        self.thread = threading.Thread(target=self.listen)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def listen(self):
+        """ Listen to notifications. This call blocks similar to
+            ``run_forever()``.
+        """
+        self.websocket.run_forever()
+
+    def stop(self):
+        """ Stop updating the caches
+        """
+        for cache in self.caches:
+            if self.watch in cache.listeners:
+                cache.listeners.remove(self.watch)
+        self.connected = False
+        if self.websocket.ws:
+            self.websocket.ws.keep_running = False
+            self.websocket.ws.close()
+
+    def subscribe_all(self):
+        """ Subscribe to all objects that are currently cached
+        """
+        if getattr(self.bitshares, "fee_schedule", None) is not None:
+            try:
+                # The fee schedule lives in the global properties
+                self.websocket.get_objects(["2.0.0"])
+            except Exception as e:
+                log.warning("Could not subscribe to 2.0.0: %s" % str(e))
+        if getattr(self.bitshares, "tapos", None) is not None:
+            try:
+                # The head block lives in the dynamic global properties
+                self.websocket.get_objects(["2.1.0"])
+            except Exception as e:
+                log.warning("Could not subscribe to 2.1.0: %s" % str(e))
+        for cache in self.caches:
+            for key in cache.keys():
+                value = cache.peek(key)
+                if value is not None:
+                    self.watch(key, value)
+
+    def watch(self, key, value):
+        """ Index the object and ask the node to notify us about changes
+        """
+        ids = [value["id"]]
+        full_account = False
+        with self.lock:
+            for field in ["dynamic_asset_data", "bitasset_data", "statistics"]:
+                if isinstance(value.get(field), dict):
+                    self.index[value[field]["id"]] = (key, field)
+            for order in value.get("limit_orders", []):
+                self.orders[order["id"]] = key
+            if "balances" in value:
+                full_account = True
+            elif "dynamic_asset_data_id" in value:
+                ids.append(value["dynamic_asset_data_id"])
+                if "bitasset_data_id" in value:
+                    ids.append(value["bitasset_data_id"])
+        if not self.connected:
+            # We subscribe to all cached objects on connect
+            return
+        try:
+            if full_account:
+                self.websocket.get_full_accounts(ids, True)
+            else:
+                self.websocket.get_objects(ids)
+        except Exception as e:
+            log.warning("Could not subscribe to %s: %s" % (ids, str(e)))
+
+    def _update(self, cache, key, func):
+        """ Replace the cached object with a modified copy
+        """
+        entry = cache.peek(key)
+        if entry is None:
+            return
+        entry = dict(entry)
+        func(entry)
+        cache.update(key, entry)
+
+    def _update_list(self, key, field, id, notice=None):
+        """ Update or add ``notice`` in the list ``field`` of the cached
+            full account ``key`` (remove the object ``id`` without
+            ``notice``)
+        """
+        def update(entry):
+            if field not in entry:
+                return
+            items = [x for x in entry[field] if x["id"] != id]
+            if notice is not None:
+                items.append(notice)
+            entry[field] = items
+        self._update(Account.cache, key, update)
+
+    def process_object(self, notice):
+        """ Apply a notification to the cached objects
+        """
+        id = notice["id"]
+        space = id[:4]
+        with self.lock:
+            if id in self.index:
+                key, field = self.index[id]
+                if field == "statistics":
+                    self._update(Account.cache, key, lambda e: e.update({field: notice}))
+                else:
+                    self._update(Asset.cache, key, lambda e: e.update({field: notice}))
+
+            elif space == "1.7.":
+                self.orders[id] = notice["seller"]
+                self._update_list(notice["seller"], "limit_orders", id, notice)
+
+            elif id == "2.0.0":
+                schedule = getattr(self.bitshares, "fee_schedule", None)
+                if schedule is not None:
+                    schedule.process_object(notice)
+
+            elif id == "2.1.0":
+                tapos = getattr(self.bitshares, "tapos", None)
+                if tapos is not None:
+                    tapos.process_object(notice)
+
+            elif space == "2.5." and "owner" in notice:
+                self._update_list(notice["owner"], "balances", id, notice)
+
+            elif space == "1.3.":
+                if Asset.use_registry:
+                    from .storage import assetRegistry
+                    assetRegistry.add(self.bitshares.rpc, [notice])
+                # Permissions, flags, etc. derive from the options
+                Asset.cache.remove(id)
+
+            elif space in ["1.2.", "1.6."]:
+                cache = Account.cache if space == "1.2." else Witness.cache
+                self._update(cache, id, lambda e: e.update(notice))
+
+    def process_removed(self, id):
+        """ Apply the notification that the object ``id`` has been
+            removed
+        """
+        space = id[:4]
+        with self.lock:
+            if id in self.index:
+                key, field = self.index.pop(id)
+                cache = Account.cache if field == "statistics" else Asset.cache
+                cache.remove(key)
+
+            elif space == "1.7.":
+                key = self.orders.pop(id, None)
+                if key:
+                    self._update_list(key, "limit_orders", id)
+
+            elif space in ["1.2.", "1.3.", "1.6."]:
+                cache = {
+                    "1.2.": Account.cache,
+                    "1.3.": Asset.cache,
+                    "1.6.": Witness.cache}[space]
+                cache.remove(id)
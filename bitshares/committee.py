@@ -1,5 +1,8 @@
+import re
 from bitshares.instance import shared_bitshares_instance
 from .account import Account
+from .objectcache import ObjectCache
+from .witness import Witnesses
 from .exceptions import CommitteeMemberDoesNotExistsException
 
 
@@ -10,7 +13,15 @@ class Committee(dict):
         :param bitshares bitshares_instance: BitShares() instance to use when accesing a RPC
         :param bool lazy: Use lazy loading
 
+        .. note:: Committee members are cached by committee member id,
+                  account id and account name in ``Committee.cache`` (see
+                  :class:`bitshares.objectcache.ObjectCache`) for a
+                  minute.
+
     """
+
+    cache = ObjectCache(max_size=1000, ttl=60)
+
     def __init__(
         self,
         member,
@@ -22,16 +33,29 @@ class Committee(dict):
 
         self.bitshares = bitshares_instance or shared_bitshares_instance()
 
-        if not lazy:
+        cached = Committee.cache.get(self.member)
+        if cached:
+            super(Committee, self).__init__(cached)
+            self.cached = True
+        elif not lazy:
             self.refresh()
 
     def refresh(self):
-        account = Account(self.member)
-        member = self.bitshares.rpc.get_committee_member_by_account(account["id"])
-        if not member:
-            raise CommitteeMemberDoesNotExistsException
+        if re.match(r"^1\.5\.[0-9]*$", self.member):
+            member = self.bitshares.rpc.get_objects([self.member])[0]
+            if not member:
+                raise CommitteeMemberDoesNotExistsException
+            account = Account(member["committee_member_account"])
+        else:
+            account = Account(self.member)
+            member = self.bitshares.rpc.get_committee_member_by_account(account["id"])
+            if not member:
+                raise CommitteeMemberDoesNotExistsException
         super(Committee, self).__init__(member)
         self.cached = True
+        Committee.cache.set(
+            member["id"], member,
+            aliases=[member["committee_member_account"], account["name"]])
 
     def __getitem__(self, key):
         if not self.cached:
@@ -45,4 +69,23 @@ class Committee(dict):
 
     @property
     def account(self):
-        return Account(self.member)
+        return Account(self["committee_member_account"])
+
+
+class CommitteeMembers(Witnesses):
+    """ Obtain **all** committee members of the chain with a few batched
+        calls (``lookup_committee_member_accounts`` and chunked
+        ``get_committee_members``)
+
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+        :param int chunk_size: Number of objects to obtain per call
+
+        Instances of this class are lists of
+        :class:`bitshares.committee.Committee` that can additionally be
+        indexed by committee member id, account id and account name (see
+        :class:`bitshares.witness.Witnesses`).
+    """
+    lookup_method = "lookup_committee_member_accounts"
+    objects_method = "get_committee_members"
+    account_field = "committee_member_account"
+    object_class = Committee
@@ -0,0 +1,237 @@
+from fractions import Fraction
+from functools import total_ordering
+from bitshares.instance import shared_bitshares_instance
+from .amount import Amount
+from .asset import Asset
+
+
+class AssetInfo(object):
+    """ The part of an asset that is needed to deal with amounts: its id,
+        symbol and precision. Instances are interned by asset id, i.e.
+        there is only a single instance per asset and they can be compared
+        by identity.
+
+        :param str id: Asset id, e.g. ``1.3.0``
+        :param str symbol: Symbol of the asset
+        :param int precision: Precision of the asset
+
+        .. code-block:: python
+
+            from bitshares.compactamount import AssetInfo
+            bts = AssetInfo("1.3.0", "BTS", 5)
+            assert AssetInfo.get("BTS") is bts
+    """
+    __slots__ = ["id", "symbol", "precision", "asset"]
+
+    #: Interned instances by asset id and symbol
+    known = dict()
+
+    def __new__(cls, id, symbol, precision):
+        info = cls.known.get(id)
+        if info is not None and info.symbol == symbol and info.precision == precision:
+            return info
+        info = super(AssetInfo, cls).__new__(cls)
+        info.id = id
+        info.symbol = symbol
+        info.precision = precision
+        #: The :class:`bitshares.asset.Asset` if known
+        info.asset = None
+        cls.known[id] = info
+        cls.known[symbol] = info
+        return info
+
+    def __init__(self, *args):
+        pass
+
+    @classmethod
+    def from_asset(cls, asset):
+        """ Obtain the instance for an asset object
+
+            :param dict asset: Instance of :class:`bitshares.asset.Asset`
+                or any dictionary with ``id``, ``symbol`` and ``precision``
+        """
+        info = cls.known.get(asset["id"])
+        if info is None or info.asset is None:
+            info = cls(asset["id"], asset["symbol"], asset["precision"])
+            info.asset = asset
+        return info
+
+    @classmethod
+    def get(cls, asset, bitshares_instance=None):
+        """ Obtain the instance for an asset id or symbol. Unknown assets
+            are resolved through :class:`bitshares.asset.Asset`.
+
+            :param str asset: Asset id or symbol
+            :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+        """
+        info = cls.known.get(asset)
+        if info is None:
+            info = cls.from_asset(
+                Asset(asset, bitshares_instance=bitshares_instance))
+        return info
+
+    def __repr__(self):
+        return "<AssetInfo {} {}>".format(self.id, self.symbol)
+
+    def __reduce__(self):
+        return (AssetInfo, (self.id, self.symbol, self.precision))
+
+
+@total_ordering
+class CompactAmount(object):
+    """ A memory-efficient and exact representation of an amount of an
+        asset as integer number of satoshis
+
+        :param int amount: Amount in satoshis (i.e. the integer amount as
+            used on the blockchain)
+        :param bitshares.compactamount.AssetInfo asset: The asset
+
+        Contrary to :class:`bitshares.amount.Amount`, instances carry no
+        dictionary and arithmetic is done with integers and never calls
+        the API:
+
+        .. code-block:: python
+
+            from bitshares.compactamount import CompactAmount
+            a = CompactAmount.from_chain({"amount": 100000, "asset_id": "1.3.0"})
+            b = a + a * 2
+            print(b, b.json())
+            amount = b.to_amount()
+
+        Multiplications and divisions round down to full satoshis, the
+        same way the blockchain does. Plain integers in additions,
+        subtractions and comparisons are taken as satoshis.
+    """
+    __slots__ = ["amount", "asset"]
+
+    def __init__(self, amount, asset):
+        self.amount = amount
+        self.asset = asset
+
+    @classmethod
+    def from_chain(cls, data, bitshares_instance=None):
+        """ Create an instance from an amount as obtained from the
+            blockchain, e.g. ``{"amount": 100000, "asset_id": "1.3.0"}``
+        """
+        return cls(
+            int(data["amount"]),
+            AssetInfo.get(data["asset_id"], bitshares_instance))
+
+    @classmethod
+    def from_amount(cls, amount):
+        """ Create an instance from an instance of
+            :class:`bitshares.amount.Amount`
+        """
+        asset = AssetInfo.from_asset(amount["asset"])
+        return cls(
+            int(round(amount["amount"] * 10 ** asset.precision)),
+            asset)
+
+    def to_amount(self, bitshares_instance=None):
+        """ Return an instance of :class:`bitshares.amount.Amount`
+        """
+        asset = self.asset.asset
+        if asset is None:
+            asset = Asset(self.asset.id, bitshares_instance=bitshares_instance)
+            self.asset.asset = asset
+        # Everything is known already, there is no need to go through
+        # Amount.__init__
+        amount = Amount.__new__(Amount)
+        amount.bitshares = bitshares_instance or shared_bitshares_instance()
+        amount["asset"] = asset
+        amount["symbol"] = self.asset.symbol
+        amount["amount"] = self.amount / 10 ** self.asset.precision
+        return amount
+
+    def json(self):
+        """ Return the amount the way it is used on the blockchain
+        """
+        return {"amount": self.amount, "asset_id": self.asset.id}
+
+    @property
+    def symbol(self):
+        """ Returns the symbol of the asset
+        """
+        return self.asset.symbol
+
+    def __float__(self):
+        return self.amount / 10 ** self.asset.precision
+
+    def __int__(self):
+        return self.amount
+
+    def __str__(self):
+        precision = self.asset.precision
+        sign = "-" if self.amount < 0 else ""
+        integer, fraction = divmod(abs(self.amount), 10 ** precision)
+        if precision:
+            return "{}{:,}.{:0{prec}d} {}".format(
+                sign, integer, fraction, self.asset.symbol, prec=precision)
+        return "{}{:,} {}".format(sign, integer, self.asset.symbol)
+
+    def __repr__(self):
+        return "<CompactAmount {}>".format(str(self))
+
+    def _other(self, other):
+        """ Return the satoshis of ``other`` which has to be of the same
+            asset
+        """
+        if isinstance(other, CompactAmount):
+            assert other.asset is self.asset
+            return other.amount
+        return int(other)
+
+    def _scale(self, factor):
+        """ Multiply by ``factor`` and round down
+        """
+        if isinstance(factor, int):
+            return self.amount * factor
+        if isinstance(factor, float):
+            # 0.29 shall mean 29/100, not the closest binary fraction
+            factor = Fraction(repr(factor))
+        return (self.amount * Fraction(factor)).__floor__()
+
+    def __add__(self, other):
+        return CompactAmount(self.amount + self._other(other), self.asset)
+
+    def __sub__(self, other):
+        return CompactAmount(self.amount - self._other(other), self.asset)
+
+    def __mul__(self, other):
+        return CompactAmount(self._scale(other), self.asset)
+
+    def __floordiv__(self, other):
+        if isinstance(other, int):
+            return CompactAmount(self.amount // other, self.asset)
+        if isinstance(other, float):
+            other = Fraction(repr(other))
+        return CompactAmount(self._scale(1 / Fraction(other)), self.asset)
+
+    def __truediv__(self, other):
+        if isinstance(other, CompactAmount):
+            # Ratio of two amounts of the same asset
+            return Fraction(self.amount, self._other(other))
+        return self.__floordiv__(other)
+
+    def __neg__(self):
+        return CompactAmount(-self.amount, self.asset)
+
+    def __abs__(self):
+        return CompactAmount(abs(self.amount), self.asset)
+
+    def __bool__(self):
+        return self.amount != 0
+
+    def __eq__(self, other):
+        if isinstance(other, CompactAmount):
+            return self.amount == other.amount and self.asset is other.asset
+        return self.amount == other
+
+    def __lt__(self, other):
+        return self.amount < self._other(other)
+
+    def __hash__(self):
+        return hash((self.amount, self.asset.id))
+
+    __radd__ = __add__
+    __rmul__ = __mul__
@@ -0,0 +1,252 @@
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "MarketDepth requires numpy. "
+            "Install it with 'pip install numpy'"
+        )
+
+
+def _result(value, scalar):
+    """ Return floats for scalar queries and arrays otherwise
+    """
+    if scalar:
+        return float(value)
+    return value
+
+
+class DepthSide(object):
+    """ Cumulative depth of one side of an order book
+
+        :param list levels: Price levels as ``(price, quote amount)``,
+            best price first
+
+        All attributes are NumPy arrays with one entry per price level:
+        ``prices``, ``quote`` and ``base`` amounts as well as their
+        cumulative sums ``cum_quote`` and ``cum_base``.
+    """
+    def __init__(self, levels):
+        levels = np.array(levels, dtype=np.float64).reshape(-1, 2)
+        self.prices = levels[:, 0]
+        self.quote = levels[:, 1]
+        self.base = self.prices * self.quote
+        self.cum_quote = np.cumsum(self.quote)
+        self.cum_base = np.cumsum(self.base)
+
+    def __len__(self):
+        return len(self.prices)
+
+    @property
+    def best(self):
+        """ Best price or ``nan`` for an empty side
+        """
+        return self.prices[0] if len(self) else np.nan
+
+    def fill(self, amount, asset="quote"):
+        """ Walk the side until ``amount`` has been filled
+
+            :param amount: Amount (or array of amounts) to fill
+            :param str asset: ``quote`` or ``base``, the asset ``amount``
+                is denoted in
+            :returns: ``(quote, base, price)`` arrays with the filled
+                amounts and the price of the last level that has been
+                touched. Amounts that exceed the side give ``nan``.
+        """
+        amount = np.asarray(amount, dtype=np.float64)
+        n = len(self)
+        if not n:
+            nan = np.full(amount.shape, np.nan)
+            return nan, nan, nan
+        cum = self.cum_quote if asset == "quote" else self.cum_base
+        # First level that completes the amount
+        i = np.searchsorted(cum, amount, side="left")
+        exceeded = i >= n
+        i = np.minimum(i, n - 1)
+        prev_quote = np.where(i > 0, self.cum_quote[i - 1], 0.0)
+        prev_base = np.where(i > 0, self.cum_base[i - 1], 0.0)
+        price = self.prices[i]
+        if asset == "quote":
+            quote = amount
+            base = prev_base + (amount - prev_quote) * price
+        else:
+            base = amount
+            quote = prev_quote + (amount - prev_base) / price
+        quote = np.where(exceeded, np.nan, quote)
+        base = np.where(exceeded, np.nan, base)
+        price = np.where(exceeded, np.nan, price)
+        return quote, base, price
+
+    def within(self, price, better):
+        """ Cumulated ``(quote, base)`` amounts of all levels at
+            ``price`` or better
+
+            :param price: Price (or array of prices)
+            :param bool better: Better prices are higher prices (bids)
+        """
+        price = np.asarray(price, dtype=np.float64)
+        if better:
+            # Prices are descending, search the negated prices
+            i = np.searchsorted(-self.prices, -price, side="right")
+        else:
+            i = np.searchsorted(self.prices, price, side="right")
+        quote = np.concatenate([[0.0], self.cum_quote])[i]
+        base = np.concatenate([[0.0], self.cum_base])[i]
+        return quote, base
+
+
+class MarketDepth(object):
+    """ Depth, VWAP and slippage analytics of an order book (requires
+        ``numpy``)
+
+        :param list bids: Bids as ``(price, quote amount)``, highest price first
+        :param list asks: Asks as ``(price, quote amount)``, lowest price first
+
+        Prices are denoted in ``base``/``quote``. A ``buy`` buys
+        ``quote`` and consumes the asks, a ``sell`` sells ``quote``
+        and consumes the bids. All queries take single amounts as well
+        as arrays of amounts and are answered from the cumulative depth
+        arrays without any loops in Python:
+
+        .. code-block:: python
+
+            from bitshares.market import Market
+            from bitshares.depth import MarketDepth
+            depth = MarketDepth.from_orderbook(Market("USD:BTS").orderbook(50))
+            depth.vwap(100, "buy")                  # buy 100 USD
+            depth.vwap(30000, "sell", asset="base") # receive 30000 BTS
+            depth.slippage([10, 100, 1000], "sell")
+            depth.liquidity_within(0.02)            # within 2% of mid price
+
+        Amounts that exceed the liquidity of the book give ``nan``.
+    """
+    def __init__(self, bids, asks):
+        _require_numpy()
+        self.bids = DepthSide(bids)
+        self.asks = DepthSide(asks)
+
+    @classmethod
+    def from_orderbook(cls, book):
+        """ Create an instance from an order book
+
+            :param book: Either the result of
+                :func:`bitshares.market.Market.orderbook`, the raw result
+                of the ``get_order_book`` API call or an instance of
+                :class:`bitshares.orderbook.OrderBook`
+        """
+        from .orderbook import OrderBook
+        if isinstance(book, OrderBook):
+            book = book.depth()
+
+        def levels(side):
+            return [
+                (float(x["price"]), float(x["quote"])) if isinstance(x, dict)
+                else (x[0], x[1])
+                for x in side
+            ]
+        return cls(levels(book["bids"]), levels(book["asks"]))
+
+    def _side(self, side):
+        if side == "buy":
+            return self.asks
+        elif side == "sell":
+            return self.bids
+        raise ValueError("side has to be 'buy' or 'sell'")
+
+    @property
+    def mid(self):
+        """ Mid price between best bid and best ask
+        """
+        return float((self.bids.best + self.asks.best) / 2)
+
+    @property
+    def spread(self):
+        """ Difference between best ask and best bid
+        """
+        return float(self.asks.best - self.bids.best)
+
+    def cost(self, amount, side="buy", asset="quote"):
+        """ Amount of the other asset that is paid (``buy``) or received
+            (``sell``) when executing ``amount`` immediately
+
+            :param amount: Amount (or array of amounts)
+            :param str side: ``buy`` or ``sell``
+            :param str asset: ``quote`` or ``base``, the asset ``amount``
+                is denoted in
+        """
+        quote, base, _ = self._side(side).fill(amount, asset)
+        return _result(base if asset == "quote" else quote, np.ndim(amount) == 0)
+
+    def vwap(self, amount, side="buy", asset="quote"):
+        """ Volume weighted average price when executing ``amount``
+            immediately
+
+            :param amount: Amount (or array of amounts)
+            :param str side: ``buy`` or ``sell``
+            :param str asset: ``quote`` or ``base``, the asset ``amount``
+                is denoted in
+        """
+        book = self._side(side)
+        quote, base, _ = book.fill(amount, asset)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # The limit of an infinitely small amount is the best price
+            vwap = np.where(quote == 0, book.best, base / quote)
+        return _result(vwap, np.ndim(amount) == 0)
+
+    def slippage(self, amount, side="buy", asset="quote"):
+        """ Relative difference between the VWAP of ``amount`` and the
+            best price. The result is positive for both sides, e.g.
+            ``0.01`` for a VWAP that is one percent worse than the best
+            price.
+
+            :param amount: Amount (or array of amounts)
+            :param str side: ``buy`` or ``sell``
+            :param str asset: ``quote`` or ``base``, the asset ``amount``
+                is denoted in
+        """
+        best = self._side(side).best
+        vwap = self.vwap(amount, side, asset)
+        if side == "buy":
+            return vwap / best - 1
+        return 1 - vwap / best
+
+    def price_impact(self, amount, side="buy", asset="quote"):
+        """ Relative distance of the price of the last level that is
+            touched when executing ``amount`` from the mid price, i.e.
+            where the market moves to
+
+            :param amount: Amount (or array of amounts)
+            :param str side: ``buy`` or ``sell``
+            :param str asset: ``quote`` or ``base``, the asset ``amount``
+                is denoted in
+        """
+        _, _, price = self._side(side).fill(amount, asset)
+        mid = self.mid
+        if side == "buy":
+            impact = price / mid - 1
+        else:
+            impact = 1 - price / mid
+        return _result(impact, np.ndim(amount) == 0)
+
+    def liquidity_within(self, band, side="both", asset="quote"):
+        """ Liquidity within ``band`` around the mid price
+
+            :param band: Relative distance (or array of distances) from
+                the mid price, e.g. ``0.02`` for 2%
+            :param str side: ``buy`` (asks), ``sell`` (bids) or ``both``
+            :param str asset: ``quote`` or ``base``, the asset the
+                liquidity is denoted in
+        """
+        band = np.asarray(band, dtype=np.float64)
+        mid = self.mid
+        index = 0 if asset == "quote" else 1
+        total = 0
+        if side in ["buy", "both"]:
+            total = total + self.asks.within(mid * (1 + band), better=False)[index]
+        if side in ["sell", "both"]:
+            total = total + self.bids.within(mid * (1 - band), better=True)[index]
+        return _result(total, np.ndim(band) == 0)
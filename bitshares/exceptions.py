@@ -76,3 +76,9 @@ class VestingBalanceDoesNotExistsException(Exception):
     """ Vesting Balance does not exist
     """
     pass
+
+
+class TransactionExpiredError(Exception):
+    """ The transaction expired without being included in a block
+    """
+    pass
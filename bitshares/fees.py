@@ -0,0 +1,208 @@
+import threading
+import time
+from bitshares.instance import shared_bitshares_instance
+from bitsharesbase.objects import Asset as AssetObject
+from bitsharesbase.operationids import operations
+
+#: 100% in the basis points of the fee ``scale``
+GRAPHENE_100_PERCENT = 10000
+
+#: Operations that pay ``price_per_kbyte`` for their memo
+MEMO_OPS = [
+    operations["transfer"],
+    operations["asset_issue"],
+    operations["withdraw_permission_claim"],
+    operations["override_transfer"],
+]
+
+#: Operations that pay ``price_per_kbyte`` for their full size
+SIZE_OPS = [
+    operations["account_update"],
+    operations["asset_update"],
+    operations["proposal_create"],
+    operations["proposal_update"],
+]
+
+
+def data_fee(size, price_per_kbyte):
+    """ Fee for ``size`` bytes of data
+    """
+    return size * int(price_per_kbyte) // 1024
+
+
+def is_cheap_name(name):
+    """ Account names with digits, dashes, dots, slashes or without
+        vowels do not pay the premium fee
+    """
+    vowel = False
+    for c in name:
+        if c.isdigit() or c in ".-/":
+            return True
+        if c in "aeiouy":
+            vowel = True
+    return not vowel
+
+
+class FeeSchedule(object):
+    """ Computes the fees of operations locally from the fee schedule of
+        the chain
+
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+        :param int ttl: Seconds after which the schedule is read again
+            (``None`` to keep it until :func:`invalidate`)
+
+        The fee parameters and the ``scale`` of ``current_fees`` are read
+        from the global properties (``2.0.0``) once and then reused, so
+        that fees do not require an API call per transaction. The fees
+        are computed the way the blockchain does, including the
+        ``price_per_kbyte`` of memos and operations that pay for their
+        size and the conversion into other assets with their core
+        exchange rate (rounded up).
+
+        .. code-block:: python
+
+            from bitshares import BitShares
+            bitshares = BitShares(local_fees=True)
+            bitshares.transfer("init1", 1, "BTS", account="init0")
+
+        The schedule is replaced when a notification for ``2.0.0``
+        arrives (see :class:`bitshares.coherence.CacheCoherence`) or
+        :func:`invalidate` is called. Operations whose fees cannot be
+        computed locally raise ``NotImplementedError``.
+    """
+    def __init__(self, bitshares_instance=None, ttl=600):
+        self.bitshares = bitshares_instance or shared_bitshares_instance()
+        self.ttl = ttl
+        self.lock = threading.RLock()
+        self.parameters = None
+        self.scale = None
+        self.loaded = None
+        #: The global properties the schedule has been read from
+        self.properties = None
+
+    def invalidate(self):
+        """ Read the schedule again on next use
+        """
+        with self.lock:
+            self.parameters = None
+
+    def load(self, properties):
+        """ Use the fee schedule of the global properties ``properties``
+        """
+        fees = properties["parameters"]["current_fees"]
+        with self.lock:
+            self.parameters = dict(
+                (int(op_id), params) for op_id, params in fees["parameters"])
+            self.scale = int(fees["scale"])
+            self.properties = properties
+            self.loaded = time.time()
+
+    def refresh(self):
+        """ Read the fee schedule from the API server
+        """
+        self.load(self.bitshares.rpc.get_objects(["2.0.0"])[0])
+
+    def process_object(self, notice):
+        """ Apply a notification of the global properties
+        """
+        if notice.get("id") == "2.0.0" and "parameters" in notice:
+            self.load(notice)
+
+    def global_properties(self):
+        """ The (cached) global properties
+        """
+        self._parameters()
+        return self.properties
+
+    def _parameters(self):
+        with self.lock:
+            if self.parameters is None or (
+                self.ttl is not None and time.time() - self.loaded > self.ttl
+            ):
+                self.refresh()
+            return self.parameters, self.scale
+
+    def base_fee(self, op, op_id):
+        """ Fee of an operation in satoshis of the core asset before
+            scaling
+
+            :param op: Operation (e.g.
+                :class:`bitsharesbase.operations.Transfer`)
+            :param int op_id: Id of the operation
+        """
+        parameters, _ = self._parameters()
+        if op_id not in parameters:
+            raise NotImplementedError(
+                "No fee parameters for operation %d" % op_id)
+        params = parameters[op_id]
+        if op_id in MEMO_OPS:
+            fee = int(params["fee"])
+            memo = op.data.get("memo")
+            if memo is not None and not memo.isempty():
+                fee += data_fee(len(bytes(memo)), params["price_per_kbyte"])
+            return fee
+        if op_id in SIZE_OPS:
+            return int(params["fee"]) + data_fee(
+                len(bytes(op)), params["price_per_kbyte"])
+        if op_id == operations["account_create"]:
+            if is_cheap_name(str(op.data["name"])):
+                fee = int(params["basic_fee"])
+            else:
+                fee = int(params["premium_fee"])
+            return fee + data_fee(len(bytes(op)), params["price_per_kbyte"])
+        if op_id == operations["account_upgrade"]:
+            if bool(op.data["upgrade_to_lifetime_member"].data):
+                return int(params["membership_lifetime_fee"])
+            return int(params["membership_annual_fee"])
+        if list(params.keys()) == ["fee"]:
+            return int(params["fee"])
+        raise NotImplementedError(
+            "The fee of operation %d cannot be computed locally" % op_id)
+
+    def _core_exchange_rate(self, asset_id):
+        from .asset import Asset
+        asset = Asset(asset_id, bitshares_instance=self.bitshares)
+        return asset["options"]["core_exchange_rate"]
+
+    def convert(self, amount, asset_id):
+        """ Convert a fee in the core asset into ``asset_id`` with the
+            core exchange rate of the asset, rounded up
+        """
+        if asset_id == "1.3.0":
+            return amount
+        cer = self._core_exchange_rate(asset_id)
+        if cer["base"]["asset_id"] == asset_id:
+            asset_amount, core_amount = int(cer["base"]["amount"]), int(cer["quote"]["amount"])
+        else:
+            asset_amount, core_amount = int(cer["quote"]["amount"]), int(cer["base"]["amount"])
+        # Smallest amount that is worth at least the fee
+        return -(-amount * asset_amount // core_amount)
+
+    def fee(self, op, asset_id="1.3.0"):
+        """ Fee of an operation in satoshis of ``asset_id``
+
+            :param bitsharesbase.objects.Operation op: The operation
+            :param str asset_id: Asset the fee is paid in
+        """
+        _, scale = self._parameters()
+        base = self.base_fee(op.op, op.opId)
+        return self.convert(base * scale // GRAPHENE_100_PERCENT, asset_id)
+
+    def set_fees(self, ops, asset_id="1.3.0"):
+        """ Set the fees of operations (the same way as
+            :func:`bitsharesbase.transactions.addRequiredFees`, but
+            without calling the API)
+
+            :param list ops: List of :class:`bitsharesbase.objects.Operation`
+            :param str asset_id: Asset the fees are paid in
+        """
+        for op in ops:
+            if op.opId == operations["proposal_create"]:
+                # The proposed operations count into the size
+                for wrapper in op.op.data["proposed_ops"].data:
+                    proposed = wrapper.data["op"]
+                    proposed.op.data["fee"] = AssetObject(
+                        amount=self.fee(proposed, asset_id), asset_id=asset_id)
+            op.op.data["fee"] = AssetObject(
+                amount=self.fee(op, asset_id), asset_id=asset_id)
+        return ops
@@ -1,15 +1,17 @@
 from bitshares.instance import shared_bitshares_instance
 from datetime import datetime, timedelta
 import calendar
-import dateutil.parser
-from .utils import formatTimeFromNow, formatTime, formatTimeString
+import time
+from .utils import formatTimeFromNow, formatTime, formatTimeString, timestamp
 from .asset import Asset
 from .amount import Amount
-from .price import Price, Order, FilledOrder
+from .price import Price, Order, MARKET_SEPARATOR
 from .account import Account
 from .blockchain import Blockchain
 from bitsharesbase import operations
 from bitsharesbase.objects import Operation
+import logging
+log = logging.getLogger(__name__)
 
 
 class Market(dict):
@@ -53,8 +55,7 @@ class Market(dict):
         self.bitshares = bitshares_instance or shared_bitshares_instance()
 
         if len(args) == 1 and isinstance(args[0], str):
-            import re
-            quote_symbol, base_symbol = re.split("[/-:]", args[0])
+            quote_symbol, base_symbol = MARKET_SEPARATOR.split(args[0])
             self.quote = Asset(quote_symbol, bitshares_instance=self.bitshares)
             self.base = Asset(base_symbol, bitshares_instance=self.bitshares)
             super(Market, self).__init__({"base": self.base, "quote": self.quote})
@@ -95,33 +96,55 @@ class Market(dict):
                 }
 
         """
+        bitassets = dict()
+        for id in self._bitasset_ids():
+            bitassets[id] = self.bitshares.rpc.get_object(id)
+        ticker = self.bitshares.rpc.get_ticker(
+            self["base"]["id"],
+            self["quote"]["id"],
+        )
+        return self._ticker(ticker, bitassets)
+
+    def _bitasset_ids(self):
+        """ Ids of the bitasset data that is needed for the settlement
+            price in :func:`ticker`
+        """
+        if "bitasset_data_id" in self["quote"]:
+            return [self["quote"]["bitasset_data_id"]]
+        elif "bitasset_data_id" in self["base"]:
+            return [self["base"]["bitasset_data_id"]]
+        return []
+
+    def _ticker(self, ticker, bitassets):
+        """ Turn the result of ``get_ticker`` and the bitasset data
+            (indexed by id) into the output of :func:`ticker`. If
+            ``bitassets`` also holds the quote asset object, its core
+            exchange rate is used.
+        """
         data = {}
         # Core Exchange rate
-        data["core_exchange_rate"] = float(self["quote"]["options"]["core_exchange_rate"]["base"]["amount"])
+        quote = bitassets.get(self["quote"]["id"], self["quote"])
+        data["core_exchange_rate"] = float(quote["options"]["core_exchange_rate"]["base"]["amount"])
 
         # smartcoin stuff
         if "bitasset_data_id" in self["quote"]:
-            bitasset = self.bitshares.rpc.get_object(self["quote"]["bitasset_data_id"])
+            bitasset = bitassets[self["quote"]["bitasset_data_id"]]
             backing_asset_id = bitasset["options"]["short_backing_asset"]
             if backing_asset_id == self["base"]["id"]:
                 data["quoteSettlement_price"] = float(bitasset["current_feed"]["settlement_price"])
         elif "bitasset_data_id" in self["base"]:
-            bitasset = self.bitshares.rpc.get_object(self["base"]["bitasset_data_id"])
+            bitasset = bitassets[self["base"]["bitasset_data_id"]]
             backing_asset_id = bitasset["options"]["short_backing_asset"]
             if backing_asset_id == self["quote"]["id"]:
                 data["base_settlement_price"] = float(bitasset["current_feed"]["settlement_price"])
 
-        ticker = self.bitshares.rpc.get_ticker(
-            self["base"]["id"],
-            self["quote"]["id"],
-        )
         data["base_volume"] = float(ticker["base_volume"])
         data["quote_volume"] = float(ticker["quote_volume"])
         data["low"] = float(ticker["lowest_ask"])
         data["high"] = float(ticker["highest_bid"])
         data["last"] = float(ticker["latest"])
         data["percent_change"] = round(float(ticker["percent_change"]) * 100, 3)
-        data["base_id"] = self["base"]["id"],
+        data["base_id"] = self["base"]["id"]
         data["base_symbol"] = self["base"]["symbol"]
         data["quote_id"] = self["quote"]["id"]
         data["quote_symbol"] = self["quote"]["symbol"]
@@ -194,14 +217,77 @@ class Market(dict):
         }
         return data
 
-    def trades(self, limit=25, start=None, stop=None):
+    def liveorderbook(self, limit=100):
+        """ Returns a locally maintained order book for this market that
+            is kept up to date with push notifications (see
+            :class:`bitshares.orderbook.OrderBook`)
+
+            :param int limit: Number of orders per side to obtain with
+                a snapshot
+
+            .. code-block:: python
+
+                book = Market("USD:BTS").liveorderbook()
+                book.start()
+                print(book.best_bid, book.best_ask)
+        """
+        from .orderbook import OrderBook
+        return OrderBook(self, limit=limit, bitshares_instance=self.bitshares)
+
+    def candles(self, resolution="1h"):
+        """ Returns the OHLCV candles of this market (see
+            :class:`bitshares.candles.Candles`)
+
+            :param str resolution: ``1m``, ``5m``, ``1h`` or ``1d``
+
+            .. code-block:: python
+
+                data = Market("USD:BTS").candles("5m").fetch()
+                print(data["time"], data["close"])
+        """
+        from .candles import Candles
+        return Candles(self, resolution, bitshares_instance=self.bitshares)
+
+    def tradehistory(self):
+        """ Returns the trade history of this market that is kept on
+            disk (see :class:`bitshares.tradehistory.TradeHistory`)
+
+            .. code-block:: python
+
+                history = Market("USD:BTS").tradehistory()
+                history.sync()
+                print(history.trades(limit=10))
+        """
+        from .tradehistory import TradeHistory
+        return TradeHistory(self, bitshares_instance=self.bitshares)
+
+    def trades(self, limit=25, start=None, stop=None, cached=False):
         """ Returns your trade history for a given market.
 
             :param int limit: Limit the amount of orders (default: 25)
             :param datetime start: start time
             :param datetime stop: stop time
+            :param bool cached: Only obtain the trades that are not
+                stored on disk yet and answer from the disk (see
+                :func:`tradehistory`)
 
         """
+        if cached:
+            history = self.tradehistory()
+            stop = timestamp(stop) if stop else int(time.time())
+            start = timestamp(start) if start else stop - 24 * 60 * 60
+            history.backfill(start, stop)
+            _trades = [
+                {"price": t["price"], "amount": t["amount"], "datetime": t["datetime"]}
+                for t in history.trades(start, stop, limit=limit)
+            ]
+            return {
+                "trades": _trades,
+                "base_id": self["base"]["id"],
+                "base_symbol": self["base"]["symbol"],
+                "quote_id": self["quote"]["id"],
+                "quote_symbol": self["quote"]["symbol"]
+            }
         # FIXME, this call should also return whether it was a buy or
         # sell
         if not stop:
@@ -219,7 +305,7 @@ class Market(dict):
             data = {}
             data["price"] = float(trade["price"])
             data["amount"] = float(trade["amount"])
-            data["datetime"] = calendar.timegm(dateutil.parser.parse(trade["date"]).timetuple())
+            data["datetime"] = calendar.timegm(formatTimeString(trade["date"]).timetuple())
             _trades.append(data)
         data = {
             "trades": _trades,
@@ -245,42 +331,44 @@ class Market(dict):
                 - `amount`: amount of quote
                 - `total`: amount of base at asked price (amount/price)
 
-            .. note:: This call goes through the trade history and
-                      searches for your account, if there are no orders
-                      within ``limit`` trades, this call will return an
-                      empty array.
+            The history of the account is paged until ``limit``
+            trades of this market have been found (see
+            :class:`bitshares.accounttrades.AccountTrades`).
 
         """
+        from itertools import islice
+        from .accounttrades import AccountTrades
         if not account:
             if "default_account" in self.bitshares.config:
                 account = self.bitshares.config["default_account"]
         if not account:
             raise ValueError("You need to provide an account")
         account = Account(account, bitshares_instance=self.bitshares)
+        return list(islice(
+            AccountTrades(account["id"], self, bitshares_instance=self.bitshares),
+            limit))
 
-        filled = self.bitshares.rpc.get_fill_order_history(
-            self["base"]["id"],
-            self["quote"]["id"],
-            2 * limit,
-            api="history"
-        )
-        trades = []
-        for f in filled:
-            if f["op"]["account_id"] == account["id"]:
-                trades.append(
-                    FilledOrder(
-                        f,
-                        base=self["base"],
-                        quote=self["quote"],
-                        bitshares_instance=self.bitshares
-                    ))
-        return trades
-
-    def accountopenorders(self, account=None):
+    def accountopenorders(self, account=None, index=None):
         """ Returns open Orders
 
             :param bitshares.account.Account account: Account name or instance of Account to show orders for in this market
+            :param bitshares.openorders.OpenOrderIndex index: Answer from
+                this index of the account's open orders instead of
+                loading the full account. The orders are those of the
+                index' account, ``account`` (if provided) has to be the
+                same account.
+            :raises ValueError: if ``account`` is not the account of
+                ``index``
         """
+        if index is not None:
+            if account:
+                if not (isinstance(account, str) and account.startswith("1.2.")):
+                    account = Account(account, bitshares_instance=self.bitshares)["id"]
+                if account != index.account_id:
+                    raise ValueError(
+                        "The index holds the orders of %s, not %s" % (
+                            index.account_id, account))
+            return [self._parse_order(order) for order in index.orders(self)]
         if not account:
             if "default_account" in self.bitshares.config:
                 account = self.bitshares.config["default_account"]
@@ -288,40 +376,53 @@ class Market(dict):
             raise ValueError("You need to provide an account")
         account = Account(account, full=True, bitshares_instance=self.bitshares)
 
-        _orders = []
-        orders = account["limit_orders"]
-        for order in orders:
-            if ((
-                order["sell_price"]["base"]["asset_id"] == self["base"]["id"] and
-                order["sell_price"]["quote"]["asset_id"] == self["quote"]["id"]
-            ) or (
-                order["sell_price"]["base"]["asset_id"] == self["quote"]["id"] and
-                order["sell_price"]["quote"]["asset_id"] == self["base"]["id"]
-            )):
-                if order["sell_price"]["base"]["asset_id"] == self["base"]["id"]:
-                    _base_amt = float(order["sell_price"]["base"]["amount"]) / 10 ** self.base.get("precision")
-                    _quote_amt = float(order["sell_price"]["quote"]["amount"]) / 10 ** self.quote.get("precision")
-                    _amount = _quote_amt
-                    _price = _base_amt / _quote_amt
-
-                else:
-                    _base_amt = float(order["sell_price"]["base"]["amount"]) / 10 ** self.quote.get("precision")
-                    _quote_amt = float(order["sell_price"]["quote"]["amount"]) / 10 ** self.base.get("precision")
-                    _amount = _base_amt
-                    _price = _quote_amt / _base_amt
-                data = {}
-                data["type"] = "buy" if order["sell_price"]["base"]["asset_id"] == self["base"]["id"] else "sell"
-                data["price"] = _price
-                data["amount"] = _amount 
-                data["orderid"] = order["id"]
-                data["status"] = "open"
-                data["expiry_datetime"] = calendar.timegm(dateutil.parser.parse(order["expiration"]).timetuple())
-                data["base_id"] = self["base"]["id"]
-                data["base_symbol"] = self["base"]["symbol"]
-                data["quote_id"] = self["quote"]["id"]
-                data["quote_symbol"] = self["quote"]["symbol"]
-                _orders.append(data)
-        return _orders
+        return [
+            self._parse_order(order)
+            for order in account["limit_orders"]
+            if self._in_market(order)
+        ]
+
+    def _in_market(self, order):
+        """ Does the limit order belong to this market?
+        """
+        return ((
+            order["sell_price"]["base"]["asset_id"] == self["base"]["id"] and
+            order["sell_price"]["quote"]["asset_id"] == self["quote"]["id"]
+        ) or (
+            order["sell_price"]["base"]["asset_id"] == self["quote"]["id"] and
+            order["sell_price"]["quote"]["asset_id"] == self["base"]["id"]
+        ))
+
+    def _parse_order(self, order):
+        """ Turn a limit order object into the output of
+            :func:`accountopenorders`
+        """
+        if order["sell_price"]["base"]["asset_id"] == self["base"]["id"]:
+            _base_amt = float(order["sell_price"]["base"]["amount"]) / 10 ** self.base.get("precision")
+            _quote_amt = float(order["sell_price"]["quote"]["amount"]) / 10 ** self.quote.get("precision")
+            _amount = _quote_amt
+            _price = _base_amt / _quote_amt
+            _remaining = float(order.get("for_sale", 0)) / 10 ** self.base.get("precision") / _price
+
+        else:
+            _base_amt = float(order["sell_price"]["base"]["amount"]) / 10 ** self.quote.get("precision")
+            _quote_amt = float(order["sell_price"]["quote"]["amount"]) / 10 ** self.base.get("precision")
+            _amount = _base_amt
+            _price = _quote_amt / _base_amt
+            _remaining = float(order.get("for_sale", 0)) / 10 ** self.quote.get("precision")
+        data = {}
+        data["type"] = "buy" if order["sell_price"]["base"]["asset_id"] == self["base"]["id"] else "sell"
+        data["price"] = _price
+        data["amount"] = _amount
+        data["remaining"] = _remaining
+        data["orderid"] = order["id"]
+        data["status"] = "open"
+        data["expiry_datetime"] = calendar.timegm(formatTimeString(order["expiration"]).timetuple())
+        data["base_id"] = self["base"]["id"]
+        data["base_symbol"] = self["base"]["symbol"]
+        data["quote_id"] = self["quote"]["id"]
+        data["quote_symbol"] = self["quote"]["symbol"]
+        return data
 
     def buy(
         self,
@@ -372,40 +473,8 @@ class Market(dict):
         if not account:
             raise ValueError("You need to provide an account")
         account = Account(account, bitshares_instance=self.bitshares)
-        if isinstance(price, Price):
-            if (
-                price["quote"]["symbol"] == self["quote"]["symbol"] and
-                price["base"]["symbol"] == self["base"]["symbol"]
-            ):
-                pass
-            elif (
-                price["base"]["symbol"] == self["quote"]["symbol"] and
-                price["quote"]["symbol"] == self["base"]["symbol"]
-            ):
-                price = price.invert()
-            else:
-                raise ValueError("The assets in the price do not match the market!")
-
-        if isinstance(amount, Amount):
-            amount = Amount(amount, bitshares_instance=self.bitshares)
-            assert(amount["asset"]["symbol"] == self["quote"]["symbol"])
-        else:
-            amount = Amount(amount, self["quote"]["symbol"], bitshares_instance=self.bitshares)
-
-        order = operations.Limit_order_create(**{
-            "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "seller": account["id"],
-            "amount_to_sell": {
-                "amount": int(float(amount) * float(price) * 10 ** self["base"]["precision"]),
-                "asset_id": self["base"]["id"]
-            },
-            "min_to_receive": {
-                "amount": int(float(amount) * 10 ** self["quote"]["precision"]),
-                "asset_id": self["quote"]["id"]
-            },
-            "expiration": formatTimeFromNow(expiration),
-            "fill_or_kill": killfill,
-        })
+        order = self._limit_order_op(
+            "buy", price, amount, account, expiration, killfill)
         tx = self.bitshares.finalizeOp(order, account["name"], "active")
         if returnOrderId:
             chain = Blockchain(
@@ -453,6 +522,35 @@ class Market(dict):
         if not account:
             raise ValueError("You need to provide an account")
         account = Account(account, bitshares_instance=self.bitshares)
+        order = self._limit_order_op(
+            "sell", price, amount, account, expiration, killfill)
+        tx = self.bitshares.finalizeOp(order, account["name"], "active")
+        if returnOrderId:
+            chain = Blockchain(
+                mode=("head" if returnOrderId == "head" else "irreversible"),
+                bitshares_instance=self.bitshares
+            )
+            tx = chain.awaitTxConfirmation(tx)
+            tx["orderid"] = tx["operation_results"][0][1]
+        return tx
+
+    def _limit_order_op(
+        self,
+        type,
+        price,
+        amount,
+        account,
+        expiration=7 * 24 * 60 * 60,
+        killfill=False
+    ):
+        """ Construct the ``Limit_order_create`` operation of a buy or
+            sell order (see :func:`buy` and :func:`sell`)
+
+            :param str type: ``buy`` or ``sell``
+            :param float price: price denoted in ``base``/``quote``
+            :param number amount: Amount of ``quote`` to buy or sell
+            :param bitshares.account.Account account: The seller
+        """
         if isinstance(price, Price):
             if (
                 price["quote"]["symbol"] == self["quote"]["symbol"] and
@@ -473,29 +571,307 @@ class Market(dict):
         else:
             amount = Amount(amount, self["quote"]["symbol"], bitshares_instance=self.bitshares)
 
-        order = operations.Limit_order_create(**{
+        quote = {
+            "amount": int(float(amount) * 10 ** self["quote"]["precision"]),
+            "asset_id": self["quote"]["id"]
+        }
+        base = {
+            "amount": int(float(amount) * float(price) * 10 ** self["base"]["precision"]),
+            "asset_id": self["base"]["id"]
+        }
+        if type == "buy":
+            amount_to_sell, min_to_receive = base, quote
+        elif type == "sell":
+            amount_to_sell, min_to_receive = quote, base
+        else:
+            raise ValueError("Orders need to be of type 'buy' or 'sell'")
+
+        return operations.Limit_order_create(**{
             "fee": {"amount": 0, "asset_id": "1.3.0"},
             "seller": account["id"],
-            "amount_to_sell": {
-                "amount": int(float(amount) * 10 ** self["quote"]["precision"]),
-                "asset_id": self["quote"]["id"]
-            },
-            "min_to_receive": {
-                "amount": int(float(amount) * float(price) * 10 ** self["base"]["precision"]),
-                "asset_id": self["base"]["id"]
-            },
+            "amount_to_sell": amount_to_sell,
+            "min_to_receive": min_to_receive,
             "expiration": formatTimeFromNow(expiration),
             "fill_or_kill": killfill,
         })
-        tx = self.bitshares.finalizeOp(order, account["name"], "active")
-        if returnOrderId:
-            chain = Blockchain(
-                mode=("head" if returnOrderId == "head" else "irreversible"),
-                bitshares_instance=self.bitshares
-            )
+
+    def _broadcast_ops(self, ops, account, returnOrderIds=False, single=False):
+        """ Broadcast many operations with as few transactions as the
+            maximum transaction size allows
+
+            The fees of all operations and the maximum transaction size
+            are obtained with a single round trip. Returns the broadcast
+            transactions or, with ``returnOrderIds``, the ids of the
+            created orders. With ``single``, all operations go into one
+            transaction so that they are applied atomically.
+        """
+        from .transactionbuilder import TransactionBuilder
+        from bitsharesbase import operationids
+        from bitsharesbase.objects import Asset as AssetObject
+        if (
+            self.bitshares.proposer or
+            self.bitshares.unsigned or
+            self.bitshares.bundle
+        ):
+            # These modes construct a single transaction on their own
+            return [self.bitshares.finalizeOp(ops, account["name"], "active")]
+
+        wrapped = [Operation(op) for op in ops]
+        schedule = getattr(self.bitshares, "fee_schedule", None)
+        if schedule is not None:
+            try:
+                # No API calls at all
+                schedule.set_fees(wrapped)
+                properties = schedule.global_properties()
+            except NotImplementedError:
+                schedule = None
+        if schedule is None:
+            fees, properties = self.bitshares.rpc.batch([
+                ["get_required_fees", [[op.json() for op in wrapped], "1.3.0"]],
+                ["get_global_properties", []],
+            ])
+            for op, fee in zip(ops, fees):
+                op.data["fee"] = AssetObject(
+                    amount=fee["amount"], asset_id=fee["asset_id"])
+
+        # Leave room for the transaction header and the signatures
+        max_size = properties["parameters"]["maximum_transaction_size"] - 256
+        packs = []
+        size = max_size
+        if single:
+            packs.append(ops)
+            wrapped = []
+        for op, wrapped_op in zip(ops, wrapped):
+            op_size = len(bytes(wrapped_op))
+            if size + op_size > max_size:
+                packs.append([])
+                size = 0
+            packs[-1].append(op)
+            size += op_size
+
+        txs = []
+        wifs = None
+        for pack in packs:
+            builder = TransactionBuilder(bitshares_instance=self.bitshares)
+            builder.appendOps(pack)
+            if wifs is None:
+                builder.appendSigner(account["name"], "active")
+                wifs = list(builder.wifs)
+            else:
+                builder.wifs = list(wifs)
+            txs.append(builder.broadcast())
+
+        if not returnOrderIds:
+            return txs
+        chain = Blockchain(
+            mode=("head" if returnOrderIds == "head" else "irreversible"),
+            bitshares_instance=self.bitshares
+        )
+        ids = []
+        for tx in txs:
             tx = chain.awaitTxConfirmation(tx)
-            tx["orderid"] = tx["operation_results"][0][1]
-        return tx
+            for op, result in zip(tx["operations"], tx["operation_results"]):
+                if op[0] == operationids.operations["limit_order_create"]:
+                    ids.append(result[1])
+        return ids
+
+    def place_orders(
+        self,
+        orders,
+        expiration=7 * 24 * 60 * 60,
+        killfill=False,
+        account=None,
+        returnOrderIds=False
+    ):
+        """ Place many buy and sell orders with as few transactions as
+            possible
+
+            :param list orders: Orders as tuples ``(type, price, amount)``
+                or dictionaries with the keys ``type``, ``price`` and
+                ``amount`` with ``type`` being ``buy`` or ``sell`` (see
+                :func:`buy` and :func:`sell`)
+            :param number expiration: (optional) expiration time of the orders in seconds (defaults to 7 days)
+            :param bool killfill: flag that indicates if the orders shall be killed if they are not filled (defaults to False)
+            :param string account: Account name that executes the orders
+            :param string returnOrderIds: If set to "head" or "irreversible" the call will wait for the transactions
+                                          to appear in the head/irreversible block and return the ids of the
+                                          created orders
+
+            The orders are packed into as few transactions as the
+            maximum transaction size of the network allows. The fees of
+            all orders are obtained with a single call.
+
+            .. code-block:: python
+
+                market = Market("USD:BTS")
+                market.place_orders([
+                    ("buy", 300, 10),
+                    ("buy", 290, 10),
+                    {"type": "sell", "price": 320, "amount": 10},
+                ], account="init0")
+        """
+        if not account:
+            if "default_account" in self.bitshares.config:
+                account = self.bitshares.config["default_account"]
+        if not account:
+            raise ValueError("You need to provide an account")
+        account = Account(account, bitshares_instance=self.bitshares)
+        ops = []
+        for order in orders:
+            if isinstance(order, dict):
+                order = (order["type"], order["price"], order["amount"])
+            ops.append(self._limit_order_op(
+                order[0], order[1], order[2], account, expiration, killfill))
+        return self._broadcast_ops(ops, account, returnOrderIds)
+
+    def place_ladder(
+        self,
+        type,
+        price,
+        amount,
+        levels,
+        spacing=0.01,
+        **kwargs
+    ):
+        """ Place a ladder (grid) of orders of the same type
+
+            :param str type: ``buy`` or ``sell``
+            :param float price: Price of the first order in ``base``/``quote``
+            :param number amount: Amount of ``quote`` per order or a list
+                of amounts (one per level)
+            :param int levels: Number of orders
+            :param float spacing: Relative distance between two orders,
+                buy orders go down, sell orders go up from ``price``
+
+            All other parameters are those of :func:`place_orders`.
+
+            .. code-block:: python
+
+                # Ten buy orders of 10 USD each from 300 BTS/USD down in 1% steps
+                market.place_ladder("buy", 300, 10, 10, spacing=0.01)
+        """
+        if not isinstance(amount, list):
+            amount = [amount] * levels
+        factor = 1 - spacing if type == "buy" else 1 + spacing
+        return self.place_orders([
+            (type, float(price) * factor ** i, amount[i])
+            for i in range(levels)
+        ], **kwargs)
+
+    def replace(
+        self,
+        order_ids,
+        new_orders,
+        expiration=7 * 24 * 60 * 60,
+        killfill=False,
+        account=None,
+        returnOrderIds=False,
+        tolerance=0
+    ):
+        """ Atomically cancel and replace orders, e.g. to move the
+            ladder of a market maker
+
+            :param list order_ids: Ids (``1.7.x``) of the orders that may
+                be cancelled or ``None`` for all open orders of the
+                account in this market
+            :param list new_orders: The desired orders in the format of
+                :func:`place_orders`
+            :param number expiration: (optional) expiration time of the new orders in seconds (defaults to 7 days)
+            :param bool killfill: flag that indicates if the new orders shall be killed if they are not filled (defaults to False)
+            :param string account: Account name that executes the orders
+            :param string returnOrderIds: If set to "head" or "irreversible" the call will wait for the transaction
+                                          to appear in the head/irreversible block and return the ids of the
+                                          created orders
+            :param float tolerance: Relative difference of price and
+                amount up to which an existing order is kept in place of
+                a desired one
+
+            The desired orders are compared with the current orders:
+            orders that already exist (same type, price and remaining
+            amount) are left untouched, all other current orders are
+            cancelled and the missing orders are created. All cancels
+            and creates are broadcast in a single transaction, so the
+            book never shows the old and the new ladder at the same time
+            and either all or none of the changes are applied. Returns
+            an empty list if nothing needs to change.
+
+            .. code-block:: python
+
+                market = Market("USD:BTS")
+                # Move the bid ladder one percent down
+                market.replace(None, [
+                    ("buy", 297, 10),
+                    ("buy", 294, 10),
+                ], account="init0")
+        """
+        if not account:
+            if "default_account" in self.bitshares.config:
+                account = self.bitshares.config["default_account"]
+        if not account:
+            raise ValueError("You need to provide an account")
+
+        if order_ids is None:
+            account = Account(account, full=True, bitshares_instance=self.bitshares)
+            current = [o for o in account["limit_orders"] if self._in_market(o)]
+        else:
+            account = Account(account, bitshares_instance=self.bitshares)
+            current = [
+                o for o in self.bitshares.rpc.get_objects(list(order_ids))
+                if o
+            ]
+
+        creates = []
+        for order in new_orders:
+            if isinstance(order, dict):
+                order = (order["type"], order["price"], order["amount"])
+            op = self._limit_order_op(
+                order[0], order[1], order[2], account, expiration, killfill)
+            match = None
+            for i, o in enumerate(current):
+                if self._same_order(o, op.json(), tolerance):
+                    match = i
+                    break
+            if match is None:
+                creates.append(op)
+            else:
+                # The order is in the book already
+                current.pop(match)
+
+        ops = [
+            operations.Limit_order_cancel(**{
+                "fee": {"amount": 0, "asset_id": "1.3.0"},
+                "fee_paying_account": account["id"],
+                "order": o["id"],
+                "extensions": [],
+                "prefix": self.bitshares.rpc.chain_params["prefix"]})
+            for o in current
+        ] + creates
+        if not ops:
+            return []
+        return self._broadcast_ops(ops, account, returnOrderIds, single=True)
+
+    @staticmethod
+    def _same_order(order, op, tolerance=0):
+        """ Does the limit order object ``order`` match the
+            ``Limit_order_create`` operation ``op``?
+
+            Price and remaining amount are compared in satoshis, so
+            that a ``tolerance`` of ``0`` means identical orders.
+        """
+        sell_price = order["sell_price"]
+        to_sell, to_receive = op["amount_to_sell"], op["min_to_receive"]
+        if (
+            sell_price["base"]["asset_id"] != to_sell["asset_id"] or
+            sell_price["quote"]["asset_id"] != to_receive["asset_id"]
+        ):
+            return False
+        # Compare base/quote of both prices without dividing
+        a = int(sell_price["base"]["amount"]) * int(to_receive["amount"])
+        b = int(to_sell["amount"]) * int(sell_price["quote"]["amount"])
+        if abs(a - b) > tolerance * b:
+            return False
+        for_sale = int(order["for_sale"])
+        return abs(for_sale - int(to_sell["amount"])) <= tolerance * int(to_sell["amount"])
 
     def cancel(self, orderNumber, account=None):
         """ Cancels an order you have placed in a given market. Requires
@@ -505,3 +881,148 @@ class Market(dict):
             :param str orderNumber: The Order Object ide of the form ``1.7.xxxx``
         """
         return self.bitshares.cancel(orderNumber, account=account)
+
+
+class Markets(list):
+    """ Tickers of many markets obtained with a single round trip
+
+        :param list markets: Markets as ``QUOTE:BASE`` strings or
+            instances of :class:`Market`
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+        :param int chunk_size: Number of objects to obtain per call
+
+        Instances of this class are lists of :class:`Market` that can
+        additionally be indexed by ``QUOTE:BASE``. The assets of all
+        markets are obtained at once (see
+        :func:`bitshares.asset.Asset.bulk`). :func:`refresh` sends the
+        ``get_ticker`` calls of all markets together with the lookups of
+        the (deduplicated) quote assets and bitasset data that are needed
+        for the core exchange rates and settlement prices in a single
+        batch and returns one table of results in the format of
+        :func:`Market.ticker`. The 24h volumes are part of the tickers.
+
+        .. code-block:: python
+
+            from bitshares.market import Markets
+            markets = Markets(["USD:BTS", "CNY:BTS", "EUR:BTS"])
+            for row in markets.refresh():
+                print(row["quote_symbol"], row["last"], row["quote_volume"])
+
+            # Refresh every 30 seconds in the background
+            markets.start(30, callback=print)
+    """
+    def __init__(self, markets, bitshares_instance=None, chunk_size=100):
+        self.bitshares = bitshares_instance or shared_bitshares_instance()
+        self.chunk_size = chunk_size
+        #: Result of the last :func:`refresh`
+        self.table = []
+        #: Time of the last :func:`refresh`
+        self.updated = None
+        self.thread = None
+        self.stopped = None
+
+        pairs = []
+        for market in markets:
+            if isinstance(market, Market):
+                pairs.append(market)
+            else:
+                pairs.append(MARKET_SEPARATOR.split(market))
+        symbols = sorted(set(
+            s for p in pairs if not isinstance(p, Market) for s in p))
+        assets = dict(zip(symbols, Asset.bulk(
+            symbols, bitshares_instance=self.bitshares, chunk_size=chunk_size)))
+        for pair in pairs:
+            if isinstance(pair, Market):
+                self.append(pair)
+            else:
+                quote, base = pair
+                self.append(Market(
+                    base=assets[base],
+                    quote=assets[quote],
+                    bitshares_instance=self.bitshares))
+
+    def refresh(self):
+        """ Obtain the tickers of all markets
+
+            :returns: List of tickers (see :func:`Market.ticker`) in the
+                order of the markets
+        """
+        # The quote assets for the core exchange rates, as the assets
+        # may only hold the fields of the asset registry
+        ids = sorted(set(
+            id for market in self
+            for id in market._bitasset_ids() + [market["quote"]["id"]]))
+        calls = [
+            ["get_ticker", [market["base"]["id"], market["quote"]["id"]]]
+            for market in self
+        ] + [
+            ["get_objects", [ids[i:i + self.chunk_size]]]
+            for i in range(0, len(ids), self.chunk_size)
+        ]
+        results = self.bitshares.rpc.batch(calls)
+        bitassets = dict()
+        for result in results[len(self):]:
+            for obj in result:
+                bitassets[obj["id"]] = obj
+        self.table = [
+            market._ticker(ticker, bitassets)
+            for market, ticker in zip(self, results[:len(self)])
+        ]
+        self.updated = time.time()
+        return self.table
+
+    def ticker(self, market):
+        """ Return the ticker of ``market`` (``QUOTE:BASE``) from the last
+            :func:`refresh`
+        """
+        return self.table[self.index(self[market])]
+
+    def start(self, interval=60, callback=None):
+        """ Refresh every ``interval`` seconds in a background thread
+
+            :param int interval: Seconds between refreshes
+            :param fnt callback: Called with the table after each refresh
+        """
+        import threading
+        self.stopped = threading.Event()
+
+        def run():
+            while not self.stopped.is_set():
+                try:
+                    table = self.refresh()
+                    if callback:
+                        callback(table)
+                except Exception as e:
+                    log.warning("Could not refresh the markets: %s" % str(e))
+                self.stopped.wait(interval)
+
+        self.thread = threading.Thread(target=run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """ Stop refreshing
+        """
+        if self.stopped:
+            self.stopped.set()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            quote, base = MARKET_SEPARATOR.split(key)
+            for market in self:
+                if (
+                    market["quote"]["symbol"] == quote and
+                    market["base"]["symbol"] == base
+                ):
+                    return market
+            raise KeyError(key)
+        return super(Markets, self).__getitem__(key)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            try:
+                self[key]
+                return True
+            except KeyError:
+                return False
+        return super(Markets, self).__contains__(key)
@@ -0,0 +1,181 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ObjectCache(object):
+    """ A size-bounded cache for blockchain objects with least recently
+        used (LRU) eviction and expiration of entries.
+
+        :param int max_size: Maximum number of objects to keep (defaults to
+            ``1000``)
+        :param int ttl: Seconds after which an entry expires, ``None`` for
+            no expiration (defaults to ``None``)
+
+        Objects are stored under a primary key (usually the object id) and
+        can additionally be looked up by alias keys (e.g. the name of an
+        account or the symbol of an asset):
+
+        .. code-block:: python
+
+            from bitshares.objectcache import ObjectCache
+            cache = ObjectCache(max_size=100, ttl=60)
+            cache.set("1.2.100", {"id": "1.2.100", "name": "init0"}, aliases=["init0"])
+            cache.get("init0")
+            print(cache.stats())
+
+        The cache keeps track of hits, misses, evictions and expirations
+        (see :func:`stats`). All methods are thread-safe.
+
+        Callables in ``listeners`` are called with the key and the object
+        whenever an object is stored (see
+        :class:`bitshares.coherence.CacheCoherence`).
+    """
+    def __init__(self, max_size=1000, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        # key -> [expires, value, aliases]
+        self._entries = OrderedDict()
+        # alias -> key
+        self._aliases = dict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.listeners = []
+
+    def _resolve(self, key):
+        """ Obtain the primary key for a key or alias
+        """
+        if key in self._entries:
+            return key
+        return self._aliases.get(key)
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        for alias in entry[2]:
+            if self._aliases.get(alias) == key:
+                del self._aliases[alias]
+
+    def get(self, key, default=None):
+        """ Return the object stored under ``key`` (or alias ``key``) if
+            it is present and has not expired, else ``default``
+        """
+        with self._lock:
+            key = self._resolve(key)
+            if key is None:
+                self.misses += 1
+                return default
+            entry = self._entries[key]
+            if entry[0] is not None and entry[0] < time.time():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, aliases=[], ttl=None):
+        """ Store ``value`` under ``key``
+
+            :param str key: Primary key, e.g. the object id
+            :param value: The object
+            :param list aliases: Additional keys to look up the object
+            :param int ttl: Overwrite the cache's default expiration (in
+                seconds)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl is not None else None
+        aliases = [a for a in aliases if a is not None and a != key]
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            for alias in aliases:
+                # An alias may have moved to a different object
+                other = self._aliases.get(alias)
+                if other is not None and other in self._entries:
+                    self._entries[other][2].remove(alias)
+                self._aliases[alias] = key
+            self._entries[key] = [expires, value, aliases]
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+        for listener in self.listeners:
+            listener(key, value)
+
+    def peek(self, key, default=None):
+        """ Like :func:`get` but does neither count as hit or miss nor
+            mark the object as recently used
+        """
+        with self._lock:
+            key = self._resolve(key)
+            if key is None:
+                return default
+            return self._entries[key][1]
+
+    def update(self, key, value):
+        """ Replace the object stored under ``key`` (or alias ``key``)
+            while keeping its aliases and expiration.
+
+            :returns: ``True`` if the object was present and has been
+                replaced, ``False`` otherwise
+        """
+        with self._lock:
+            key = self._resolve(key)
+            if key is None:
+                return False
+            self._entries[key][1] = value
+            return True
+
+    def remove(self, key):
+        """ Remove the object stored under ``key`` (or alias ``key``)
+        """
+        with self._lock:
+            key = self._resolve(key)
+            if key is not None:
+                self._drop(key)
+
+    def clear(self):
+        """ Remove all objects from the cache
+        """
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+
+    def keys(self):
+        """ Return the primary keys of all objects in the cache
+        """
+        with self._lock:
+            return list(self._entries.keys())
+
+    def stats(self):
+        """ Returns the cache metrics
+
+            .. code-block:: js
+
+                {'size': 2, 'max_size': 1000, 'hits': 10, 'misses': 2,
+                 'evictions': 0, 'expirations': 0}
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            key = self._resolve(key)
+            if key is None:
+                return False
+            expires = self._entries[key][0]
+            return expires is None or expires >= time.time()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,217 @@
+import logging
+import threading
+from events import Events
+from bitsharesapi.websocket import BitSharesWebsocket
+from bitshares.instance import shared_bitshares_instance
+log = logging.getLogger(__name__)
+
+
+def _market_key(a, b):
+    """ Key of the market of two assets, independent of the orientation
+    """
+    return (a, b) if a < b else (b, a)
+
+
+class OpenOrderIndexWebsocket(BitSharesWebsocket):
+    """ Websocket connection that takes a new snapshot of the open
+        orders once it is (re-)established
+    """
+    def __init__(self, index, *args, **kwargs):
+        self.index = index
+        super(OpenOrderIndexWebsocket, self).__init__(*args, **kwargs)
+
+    def on_open(self, ws):
+        super(OpenOrderIndexWebsocket, self).on_open(ws)
+        # Notifications that were missed while disconnected
+        self.index.refresh()
+
+
+class OpenOrderIndex(Events):
+    """ Open orders of an account in all markets, kept in memory
+
+        :param bitshares.account.Account account: The account (instance,
+            name or id)
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+
+        The index is seeded with the ``limit_orders`` of
+        ``get_full_accounts`` and kept up to date with the notifications
+        of the account's objects: new and changed (partially filled)
+        orders are updated, removed (filled, cancelled or expired)
+        orders are dropped. Orders are indexed by id and by market, so
+        that lookups do not call the API.
+
+        .. code-block:: python
+
+            from bitshares.market import Market
+            from bitshares.openorders import OpenOrderIndex
+            index = OpenOrderIndex("init0")
+            index.start()
+            market = Market("USD:BTS")
+            index.orders(market)
+            market.accountopenorders(index=index)
+
+        Notifications of market subscriptions (e.g. of
+        :class:`bitshares.orderbook.OrderBook`) can be fed in as well:
+
+        .. code-block:: python
+
+            book.websocket.on_market += index.process_market
+    """
+
+    __events__ = [
+        'on_update',
+    ]
+
+    def __init__(self, account, bitshares_instance=None):
+        from .account import Account
+        super(OpenOrderIndex, self).__init__()
+        self.bitshares = bitshares_instance or shared_bitshares_instance()
+        if isinstance(account, str) and account.startswith("1.2."):
+            self.account_id = account
+        else:
+            self.account_id = Account(account, bitshares_instance=self.bitshares)["id"]
+        self.lock = threading.RLock()
+        self.thread = None
+        #: Orders by id
+        self.by_id = dict()
+        #: Orders by market (pair of asset ids in ascending order), then id
+        self.by_market = dict()
+        #: Number of snapshots taken
+        self.snapshots = 0
+
+        self.websocket = OpenOrderIndexWebsocket(
+            self,
+            urls=self.bitshares.rpc.urls,
+            user=self.bitshares.rpc.user,
+            password=self.bitshares.rpc.password,
+            accounts=[self.account_id],
+            objects=["1.7.x"],
+            on_object=self.process_object,
+            on_removed=self.process_removed,
+            # Account subscriptions require a slot
+            on_account=lambda notice: None,
+        )
+
+    def start(self):
+        """ Take a snapshot and keep the index up to date in a
+            background thread
+        """
+        self.thread = threading.Thread(target=self.listen)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def listen(self):
+        """ Keep the index up to date. This call blocks similar to
+            ``run_forever()``.
+        """
+        self.websocket.run_forever()
+
+    def stop(self):
+        """ Stop updating the index
+        """
+        if self.websocket.ws:
+            self.websocket.ws.keep_running = False
+            self.websocket.ws.close()
+
+    def refresh(self):
+        """ Replace the index with a snapshot from the API server
+        """
+        accounts = self.bitshares.rpc.get_full_accounts([self.account_id], False)
+        orders = accounts[0][1]["limit_orders"] if accounts else []
+        with self.lock:
+            self.by_id.clear()
+            self.by_market.clear()
+            for order in orders:
+                self._add(order)
+            self.snapshots += 1
+        self.on_update(self)
+
+    @staticmethod
+    def _key(order):
+        sell_price = order["sell_price"]
+        return _market_key(
+            sell_price["base"]["asset_id"], sell_price["quote"]["asset_id"])
+
+    def _add(self, order):
+        if order.get("seller") != self.account_id:
+            return False
+        key = self._key(order)
+        self.by_id[order["id"]] = order
+        self.by_market.setdefault(key, dict())[order["id"]] = order
+        return True
+
+    def _remove(self, id):
+        order = self.by_id.pop(id, None)
+        if order is None:
+            return False
+        key = self._key(order)
+        market = self.by_market[key]
+        del market[id]
+        if not market:
+            del self.by_market[key]
+        return True
+
+    def process_object(self, notice):
+        """ Apply an object notification (an order)
+        """
+        if notice.get("id", "")[:4] != "1.7.":
+            return
+        with self.lock:
+            changed = self._add(notice)
+        if changed:
+            self.on_update(self)
+
+    def process_removed(self, id):
+        """ Apply the notification that the object ``id`` has been
+            removed
+        """
+        if id[:4] != "1.7.":
+            return
+        with self.lock:
+            changed = self._remove(id)
+        if changed:
+            self.on_update(self)
+
+    def process_market(self, data):
+        """ Apply the notifications of a market subscription
+        """
+        changed = False
+        with self.lock:
+            for notice in data:
+                if isinstance(notice, dict) and notice.get("id", "")[:4] == "1.7.":
+                    changed = self._add(notice) or changed
+                elif isinstance(notice, str) and notice[:4] == "1.7.":
+                    changed = self._remove(notice) or changed
+        if changed:
+            self.on_update(self)
+
+    def get(self, id):
+        """ The order ``id`` or ``None``
+        """
+        return self.by_id.get(id)
+
+    def orders(self, market=None):
+        """ Open orders as obtained from the blockchain (``sell_price``,
+            ``for_sale``, ...)
+
+            :param bitshares.market.Market market: Only the orders of
+                this market (or any dictionary with ``base`` and
+                ``quote`` ids)
+        """
+        with self.lock:
+            if market is None:
+                return list(self.by_id.values())
+            key = _market_key(market["base"]["id"], market["quote"]["id"])
+            return list(self.by_market.get(key, {}).values())
+
+    def markets(self):
+        """ Markets with open orders as pairs of asset ids
+        """
+        with self.lock:
+            return list(self.by_market.keys())
+
+    def __contains__(self, id):
+        return id in self.by_id
+
+    def __len__(self):
+        return len(self.by_id)
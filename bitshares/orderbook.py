@@ -0,0 +1,381 @@
+import logging
+import threading
+from bisect import bisect_left
+from events import Events
+from bitsharesapi.websocket import BitSharesWebsocket
+from bitshares.instance import shared_bitshares_instance
+log = logging.getLogger(__name__)
+
+
+class _Level(object):
+    """ Orders of a price level and their total amounts
+    """
+    __slots__ = ["orders", "quote", "base"]
+
+    def __init__(self):
+        # order id -> (price, quote amount, base amount)
+        self.orders = dict()
+        self.quote = 0
+        self.base = 0
+
+
+class OrderBookSide(object):
+    """ One side (bids or asks) of an :class:`OrderBook` as sorted price
+        levels
+
+        :param bool descending: Best price is the highest price (bids)
+
+        Prices are kept in a sorted list (lookups with ``bisect``) and
+        the orders of each price level in a dictionary together with
+        their total amounts. Adding or removing an order of an existing
+        price level takes ``O(1)``, the best price level (including its
+        totals) is read in ``O(1)``. Only a new price level or the
+        removal of the last order of a level inserts into or deletes
+        from the sorted list, which moves ``O(n)`` references in the
+        worst case (a single ``memmove``, cheap for the some hundred
+        levels of a book).
+    """
+    def __init__(self, descending=False):
+        self.descending = descending
+        self.clear()
+
+    def clear(self):
+        """ Remove all orders
+        """
+        # Sorted keys of the price levels, negated prices for bids
+        self.keys = []
+        # key -> _Level
+        self.levels = dict()
+        # order id -> key
+        self.orders = dict()
+
+    def _key(self, price):
+        return -price if self.descending else price
+
+    def add(self, id, price, quote, base):
+        """ Add or update an order
+        """
+        if id in self.orders:
+            self.remove(id)
+        key = self._key(price)
+        level = self.levels.get(key)
+        if level is None:
+            level = self.levels[key] = _Level()
+            self.keys.insert(bisect_left(self.keys, key), key)
+        level.orders[id] = (price, quote, base)
+        level.quote += quote
+        level.base += base
+        self.orders[id] = key
+
+    def remove(self, id):
+        """ Remove an order
+
+            :returns: ``False`` if the order is unknown
+        """
+        key = self.orders.pop(id, None)
+        if key is None:
+            return False
+        level = self.levels[key]
+        _, quote, base = level.orders.pop(id)
+        if not level.orders:
+            del self.levels[key]
+            del self.keys[bisect_left(self.keys, key)]
+        else:
+            level.quote -= quote
+            level.base -= base
+        return True
+
+    def best(self):
+        """ Best price level as ``(price, quote amount, base amount)``
+            or ``None``
+        """
+        if not self.keys:
+            return None
+        return self._level(self.keys[0])
+
+    def worst(self):
+        """ Price of the worst price level or ``None``
+        """
+        if not self.keys:
+            return None
+        return abs(self.keys[-1])
+
+    def _level(self, key):
+        level = self.levels[key]
+        return abs(key), level.quote, level.base
+
+    def depth(self, limit=None):
+        """ Price levels as list of ``(price, quote amount, base amount)``,
+            best price first
+
+            :param int limit: Number of price levels
+        """
+        return [self._level(key) for key in self.keys[:limit]]
+
+    def beyond(self, price):
+        """ Is ``price`` worse than the worst price level?
+        """
+        return bool(self.keys) and self._key(price) > self.keys[-1]
+
+    def __contains__(self, id):
+        return id in self.orders
+
+    def __len__(self):
+        return len(self.orders)
+
+
+class OrderBookWebsocket(BitSharesWebsocket):
+    """ Websocket connection that takes a new snapshot of the order book
+        once it is (re-)established
+    """
+    def __init__(self, orderbook, *args, **kwargs):
+        self.orderbook = orderbook
+        super(OrderBookWebsocket, self).__init__(*args, **kwargs)
+
+    def on_open(self, ws):
+        super(OrderBookWebsocket, self).on_open(ws)
+        # Notifications that were missed while disconnected
+        self.orderbook.refresh()
+
+
+class OrderBook(Events):
+    """ Locally maintained order book of a market
+
+        :param bitshares.market.Market market: The market
+        :param int limit: Number of orders per side to obtain with a
+            snapshot (see ``get_limit_orders``)
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+
+        The order book is seeded with a snapshot of the limit orders and
+        then kept up to date with the notifications of
+        ``subscribe_to_market``: new and changed orders are added,
+        removed orders are taken off the book. Contrary to
+        :func:`bitshares.market.Market.orderbook`, reading the book does
+        not call the API.
+
+        Prices are denoted in ``base``/``quote`` and amounts in ``quote``
+        (and ``base``) as in :func:`bitshares.market.Market.orderbook`.
+
+        .. code-block:: python
+
+            from bitshares.market import Market
+            from bitshares.orderbook import OrderBook
+            book = OrderBook(Market("USD:BTS"))
+            book.on_update += lambda book: print(book.best_bid, book.best_ask)
+            book.start()
+
+        Market notifications carry no sequence numbers. Instead, a new
+        snapshot is taken (see :func:`OrderBook.refresh`) if the
+        notifications are inconsistent with the book, i.e.
+
+        * an order that is unknown is filled as maker or removed,
+        * the book is crossed (best bid at or above best ask),
+        * a side that was truncated by ``limit`` lost half its orders,
+        * the websocket connection has been re-established.
+
+        Orders worse than the worst price of a truncated side are
+        ignored as there may be orders in between that are unknown.
+    """
+
+    __events__ = [
+        'on_update',
+    ]
+
+    def __init__(self, market, limit=100, bitshares_instance=None):
+        super(OrderBook, self).__init__()
+        self.bitshares = bitshares_instance or shared_bitshares_instance()
+        self.market = market
+        self.limit = limit
+        self.lock = threading.RLock()
+        self.thread = None
+        self.bids = OrderBookSide(descending=True)
+        self.asks = OrderBookSide()
+        # Sides that have more orders than obtained with the snapshot
+        self.truncated = {"bids": False, "asks": False}
+        #: Number of snapshots taken
+        self.snapshots = 0
+
+        self.base_id = market["base"]["id"]
+        self.quote_id = market["quote"]["id"]
+        self.base_precision = 10 ** market["base"]["precision"]
+        self.quote_precision = 10 ** market["quote"]["precision"]
+
+        self.websocket = OrderBookWebsocket(
+            self,
+            urls=self.bitshares.rpc.urls,
+            user=self.bitshares.rpc.user,
+            password=self.bitshares.rpc.password,
+            markets=[[self.base_id, self.quote_id]],
+            on_market=self.process_market,
+        )
+
+    def start(self):
+        """ Take a snapshot and keep the book up to date in a background
+            thread
+        """
+        self.thread = threading.Thread(target=self.listen)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def listen(self):
+        """ Keep the book up to date. This call blocks similar to
+            ``run_forever()``.
+        """
+        self.websocket.run_forever()
+
+    def stop(self):
+        """ Stop updating the book
+        """
+        if self.websocket.ws:
+            self.websocket.ws.keep_running = False
+            self.websocket.ws.close()
+
+    def refresh(self):
+        """ Replace the book with a snapshot from the API server
+        """
+        orders = self.bitshares.rpc.get_limit_orders(
+            self.base_id, self.quote_id, self.limit)
+        with self.lock:
+            self.bids.clear()
+            self.asks.clear()
+            # The snapshot is complete up to its worst prices
+            self.truncated = {"bids": False, "asks": False}
+            for order in orders:
+                self._add(order)
+            self.truncated = {
+                "bids": len(self.bids) >= self.limit,
+                "asks": len(self.asks) >= self.limit,
+            }
+            self.snapshots += 1
+        self.on_update(self)
+
+    def _parse(self, order):
+        """ Side, price, quote and base amount of a limit order
+        """
+        sell_price = order["sell_price"]
+        for_sale = int(order["for_sale"])
+        if sell_price["base"]["asset_id"] == self.base_id:
+            # Selling base for quote
+            price = (
+                (int(sell_price["base"]["amount"]) / self.base_precision) /
+                (int(sell_price["quote"]["amount"]) / self.quote_precision))
+            base = for_sale / self.base_precision
+            return "bids", price, base / price, base
+        else:
+            price = (
+                (int(sell_price["quote"]["amount"]) / self.base_precision) /
+                (int(sell_price["base"]["amount"]) / self.quote_precision))
+            quote = for_sale / self.quote_precision
+            return "asks", price, quote, quote * price
+
+    def _add(self, order):
+        side, price, quote, base = self._parse(order)
+        book = getattr(self, side)
+        if self.truncated[side] and order["id"] not in book and book.beyond(price):
+            return
+        book.add(order["id"], price, quote, base)
+
+    def _remove(self, id):
+        """ Remove an order
+
+            :returns: ``False`` if the order is unknown
+        """
+        return self.bids.remove(id) or self.asks.remove(id)
+
+    def process_market(self, data):
+        """ Apply the notifications of a block to the book
+        """
+        with self.lock:
+            if self._apply(data):
+                consistent = self._consistent()
+            else:
+                consistent = False
+        if not consistent:
+            log.info("Order book of %s:%s is inconsistent, taking a snapshot" % (
+                self.quote_id, self.base_id))
+            self.refresh()
+        else:
+            self.on_update(self)
+
+    def _apply(self, data):
+        """ Apply notifications
+
+            :returns: ``False`` if a notification does not fit the book
+        """
+        added = set()
+        fills = []
+        for notice in data:
+            if isinstance(notice, dict):
+                if notice.get("id", "")[:4] == "1.7.":
+                    self._add(notice)
+                    added.add(notice["id"])
+            elif isinstance(notice, str):
+                if notice[:4] == "1.7." and not self._remove(notice):
+                    if not any(self.truncated.values()):
+                        return False
+            elif notice and isinstance(notice[0], list) and notice[0][0] == 4:
+                # Fill order operations, the orders come separately
+                fills.append(notice[0][1])
+        for fill in fills:
+            id = fill.get("order_id", "")
+            if (
+                fill.get("is_maker", True) and
+                id[:4] == "1.7." and
+                id not in added and
+                id not in self.bids and
+                id not in self.asks
+            ):
+                return False
+        return True
+
+    def _consistent(self):
+        """ Sanity checks of the book
+        """
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid and ask and bid[0] >= ask[0]:
+            return False
+        for side in ["bids", "asks"]:
+            if self.truncated[side] and len(getattr(self, side)) < self.limit // 2:
+                return False
+        return True
+
+    @property
+    def best_bid(self):
+        """ Best bid as ``(price, quote amount, base amount)`` or ``None``
+        """
+        with self.lock:
+            return self.bids.best()
+
+    @property
+    def best_ask(self):
+        """ Best ask as ``(price, quote amount, base amount)`` or ``None``
+        """
+        with self.lock:
+            return self.asks.best()
+
+    @property
+    def spread(self):
+        """ Difference between best ask and best bid or ``None``
+        """
+        bid, ask = self.best_bid, self.best_ask
+        if bid and ask:
+            return ask[0] - bid[0]
+
+    def depth(self, limit=None):
+        """ Price levels of both sides in the format of
+            :func:`bitshares.market.Market.orderbook`, i.e. ``bids`` and
+            ``asks`` are lists of ``(price, quote amount)``
+
+            :param int limit: Number of price levels per side
+        """
+        with self.lock:
+            bids = self.bids.depth(limit)
+            asks = self.asks.depth(limit)
+        return {
+            "asks": [(p, q) for p, q, _ in asks],
+            "bids": [(p, q) for p, q, _ in bids],
+            "base_id": self.base_id,
+            "base_symbol": self.market["base"]["symbol"],
+            "quote_id": self.quote_id,
+            "quote_symbol": self.market["quote"]["symbol"]
+        }
@@ -0,0 +1,397 @@
+import hashlib
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from bitshares.instance import shared_bitshares_instance
+from bitsharesbase import operations
+from bitsharesbase.objects import PointInTime
+from bitsharesbase.signedtransactions import Signed_Transaction
+from .exceptions import TransactionExpiredError
+from .utils import formatTime, timestamp
+log = logging.getLogger(__name__)
+
+
+def transaction_id(tx):
+    """ Id of a transaction (the first 20 bytes of the SHA256 digest of
+        the transaction without signatures)
+
+        :param bitsharesbase.signedtransactions.Signed_Transaction tx: The transaction
+    """
+    signatures = tx.data["signatures"]
+    tx.data["signatures"] = []
+    try:
+        data = bytes(tx)
+    finally:
+        tx.data["signatures"] = signatures
+    return hashlib.sha256(data).hexdigest()[:40]
+
+
+def _trx_id(trx):
+    try:
+        return transaction_id(Signed_Transaction(**trx))
+    except Exception:
+        # Operations we cannot serialize cannot be ours
+        return None
+
+
+class _Job(object):
+    """ A transaction on its way through the pipeline
+    """
+    __slots__ = [
+        "ops", "account", "permission", "future", "tx", "id",
+        "expiration", "error"]
+
+    def __init__(self, ops, account, permission):
+        self.ops = ops
+        self.account = account
+        self.permission = permission
+        self.future = Future()
+        self.tx = None
+        self.id = None
+        self.expiration = None
+        self.error = None
+
+
+class BroadcastPipeline(object):
+    """ Build, sign and broadcast many transactions concurrently
+
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+        :param int workers: Number of threads that sign transactions
+        :param int max_in_flight: Maximum number of transactions that
+            have been submitted but are not done yet. :func:`submit`
+            blocks while the limit is reached.
+        :param int batch_size: Maximum number of transactions that are
+            broadcast with a single round trip
+        :param bool confirm: Resolve the futures once the transactions
+            are included in a block (instead of once the API server
+            accepted them)
+        :param float interval: Seconds between checks for new blocks
+            (with ``confirm``)
+
+        Every call of :func:`submit` returns a
+        :class:`concurrent.futures.Future` right away. The transactions
+        pass three stages:
+
+        1. A transaction is constructed for the operations (see
+           :class:`bitshares.transactionbuilder.TransactionBuilder`).
+           Transactions that would be identical to one that is still
+           valid get a later expiration, since the blockchain would
+           reject them as duplicates.
+        2. The transaction is signed by one of the ``workers``.
+        3. Signed transactions are broadcast in batches with a single
+           round trip (see :func:`bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC.batch`).
+           With ``confirm``, their ids are then looked for in the new
+           blocks.
+
+        The result of a future is a dictionary with the keys ``id``,
+        ``block_num`` and ``trx_num`` (``None`` without ``confirm``)
+        and ``trx`` (the signed transaction). Errors of the API server
+        are set as the exception of the future, transactions that
+        expire before they are included in a block fail with
+        :class:`bitshares.exceptions.TransactionExpiredError`.
+
+        All API calls are made from a single thread, the connection of
+        the instance should not be used otherwise while the pipeline is
+        running. Fees and reference blocks require API calls per
+        transaction unless the instance computes them locally (see
+        ``local_fees`` and ``cached_tapos`` of
+        :class:`bitshares.bitshares.BitShares`).
+
+        .. code-block:: python
+
+            from bitshares import BitShares
+            from bitshares.pipeline import BroadcastPipeline
+            from bitsharesbase import operations
+            bitshares = BitShares(local_fees=True, cached_tapos=True)
+            bitshares.wallet.unlock("wallet-passphrase")
+            with BroadcastPipeline(bitshares_instance=bitshares) as pipeline:
+                futures = [
+                    pipeline.submit(operations.Transfer(**transfer), "init0")
+                    for transfer in transfers
+                ]
+            for future in futures:
+                print(future.result()["id"])
+    """
+    def __init__(
+        self,
+        bitshares_instance=None,
+        workers=4,
+        max_in_flight=100,
+        batch_size=50,
+        confirm=False,
+        interval=1
+    ):
+        self.bitshares = bitshares_instance or shared_bitshares_instance()
+        self.batch_size = batch_size
+        self.confirm = confirm
+        self.interval = interval
+        self.workers = workers
+        self.slots = threading.BoundedSemaphore(max_in_flight)
+        self.inbox = queue.Queue()
+        self.signers = None
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stopping = False
+        self.chain = None
+        #: Jobs that are not done yet
+        self.jobs = set()
+        #: Ids of the broadcast (or about to be broadcast) transactions
+        #: and their expiration
+        self.ids = dict()
+        #: Broadcast transactions that are not in a block yet
+        self.unconfirmed = dict()
+        #: Number of the last block checked for confirmations
+        self.block_num = None
+        self.checked = 0
+        # Keys per account and permission
+        self.wifs = dict()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """ Start the pipeline (:func:`submit` starts it if needed)
+        """
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.stopping = False
+            self.chain = self.bitshares.rpc.chain_params
+            operations.default_prefix = self.chain["prefix"]
+            self.signers = ThreadPoolExecutor(max_workers=self.workers)
+            self.thread = threading.Thread(target=self._run)
+            self.thread.daemon = True
+            self.thread.start()
+
+    def submit(self, ops, account=None, permission="active"):
+        """ Enqueue operations that go into one transaction
+
+            :param ops: Operation or list of operations
+            :param str account: The account that authorizes the
+                operations (defaults to ``default_account``)
+            :param str permission: The required permission
+            :returns: :class:`concurrent.futures.Future`
+        """
+        from .account import Account
+        if not isinstance(ops, (list, tuple)):
+            ops = [ops]
+        if not account:
+            if "default_account" in self.bitshares.config:
+                account = self.bitshares.config["default_account"]
+        if not account:
+            raise ValueError("You need to provide an account")
+        if isinstance(account, Account):
+            account = account["name"]
+        self.start()
+        # Back pressure
+        self.slots.acquire()
+        job = _Job(list(ops), account, permission)
+        with self.lock:
+            self.jobs.add(job)
+        self.inbox.put(("build", job))
+        return job.future
+
+    def flush(self, timeout=None):
+        """ Wait until all submitted transactions are done
+        """
+        from concurrent.futures import wait
+        with self.lock:
+            futures = [job.future for job in self.jobs]
+        wait(futures, timeout=timeout)
+
+    def stop(self, wait=True):
+        """ Stop the pipeline
+
+            :param bool wait: Finish the submitted transactions first
+                (otherwise, they are cancelled)
+        """
+        if self.thread is None:
+            return
+        self.stopping = True
+        if not wait:
+            # The jobs are cancelled by the I/O thread, which owns the
+            # state of the transactions on their way
+            self.inbox.put(("cancel", None))
+        self.inbox.put(("stop", None))
+        self.thread.join()
+        self.thread = None
+        self.signers.shutdown()
+        self.signers = None
+
+    def _done(self, job, result=None, exception=None):
+        """ Resolve the future of a job (in the I/O thread)
+        """
+        with self.lock:
+            if job not in self.jobs:
+                return
+            self.jobs.discard(job)
+        self.unconfirmed.pop(job.id, None)
+        if exception is not None:
+            # The transaction is not on its way, it may be submitted again
+            self.ids.pop(job.id, None)
+            job.future.set_exception(exception)
+        else:
+            job.future.set_result(result)
+        self.slots.release()
+
+    def _result(self, job, block_num=None, trx_num=None):
+        return {
+            "id": job.id,
+            "block_num": block_num,
+            "trx_num": trx_num,
+            "trx": job.tx.json(),
+        }
+
+    def _run(self):
+        while True:
+            timeout = self.interval if self.unconfirmed else None
+            try:
+                items = [self.inbox.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            while len(items) < 2 * self.batch_size:
+                try:
+                    items.append(self.inbox.get_nowait())
+                except queue.Empty:
+                    break
+
+            signed = []
+            for kind, job in items:
+                if kind == "build":
+                    self._build(job)
+                elif kind == "signed":
+                    signed.append(job)
+                elif kind == "failed":
+                    self._done(job, exception=job.error)
+                elif kind == "cancel":
+                    with self.lock:
+                        jobs = list(self.jobs)
+                    for job in jobs:
+                        self._done(job, exception=RuntimeError("The pipeline has been stopped"))
+            for i in range(0, len(signed), self.batch_size):
+                self._broadcast(signed[i:i + self.batch_size])
+            if self.unconfirmed and time.time() - self.checked >= self.interval:
+                self._check()
+
+            with self.lock:
+                idle = not self.jobs
+            if self.stopping and idle:
+                break
+
+    def _build(self, job):
+        """ Construct the transaction (stage 1)
+        """
+        from .transactionbuilder import TransactionBuilder
+        if job.future.done():
+            return
+        try:
+            builder = TransactionBuilder(bitshares_instance=self.bitshares)
+            builder.appendOps(job.ops)
+            key = (job.account, job.permission)
+            if key not in self.wifs:
+                builder.appendSigner(job.account, job.permission)
+                self.wifs[key] = list(builder.wifs)
+            builder.constructTx()
+            job.tx = Signed_Transaction(**builder.json())
+            job.expiration = timestamp(builder["expiration"])
+
+            now = time.time()
+            for id in [id for id, t in self.ids.items() if t < now]:
+                del self.ids[id]
+            job.id = transaction_id(job.tx)
+            while job.id in self.ids:
+                job.expiration += 1
+                job.tx.data["expiration"] = PointInTime(formatTime(float(job.expiration)))
+                job.id = transaction_id(job.tx)
+            self.ids[job.id] = job.expiration
+        except Exception as e:
+            self._done(job, exception=e)
+            return
+        self.signers.submit(self._sign, job, self.wifs[key])
+
+    def _sign(self, job, wifs):
+        """ Sign the transaction (stage 2, in a worker thread)
+        """
+        try:
+            job.tx.sign(wifs, chain=self.chain)
+        except Exception as e:
+            job.error = e
+            self.inbox.put(("failed", job))
+        else:
+            self.inbox.put(("signed", job))
+
+    def _broadcast(self, jobs):
+        """ Broadcast signed transactions with a single round trip
+            (stage 3)
+        """
+        jobs = [job for job in jobs if not job.future.done()]
+        if not jobs:
+            return
+        if self.bitshares.nobroadcast:
+            log.warning("Not broadcasting anything!")
+            for job in jobs:
+                self._done(job, self._result(job))
+            return
+        calls = [
+            ["broadcast_transaction", [job.tx.json()], "network_broadcast"]
+            for job in jobs
+        ]
+        if self.confirm and self.block_num is None:
+            # Transactions can only be in blocks after this one
+            calls.insert(0, ["get_dynamic_global_properties", []])
+        try:
+            results = self.bitshares.rpc.batch(calls, return_exceptions=True)
+        except Exception as e:
+            for job in jobs:
+                self._done(job, exception=e)
+            return
+        if len(calls) > len(jobs):
+            properties = results.pop(0)
+            if not isinstance(properties, Exception):
+                self.block_num = properties["head_block_number"]
+        for job, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                self._done(job, exception=result)
+            elif self.confirm:
+                self.unconfirmed[job.id] = job
+            else:
+                self._done(job, self._result(job))
+
+    def _check(self):
+        """ Look for the unconfirmed transactions in the new blocks
+        """
+        self.checked = time.time()
+        rpc = self.bitshares.rpc
+        try:
+            properties = rpc.get_dynamic_global_properties()
+            head = properties["head_block_number"]
+            if self.block_num is None:
+                self.block_num = head - 1
+            numbers = list(range(self.block_num + 1, head + 1))
+            blocks = rpc.batch([["get_block", [n]] for n in numbers])
+        except Exception as e:
+            log.warning("Could not check for confirmations: %s" % str(e))
+            return
+        for block_num, block in zip(numbers, blocks):
+            if not block:
+                continue
+            ids = block.get("transaction_ids")
+            if ids is None:
+                # Older API servers do not provide the ids
+                ids = [_trx_id(trx) for trx in block.get("transactions", [])]
+            for trx_num, id in enumerate(ids):
+                job = self.unconfirmed.get(id)
+                if job is not None:
+                    self._done(job, self._result(job, block_num, trx_num))
+        self.block_num = head
+
+        head_time = timestamp(properties["time"])
+        for job in list(self.unconfirmed.values()):
+            if job.expiration < head_time:
+                self._done(job, exception=TransactionExpiredError(job.id))
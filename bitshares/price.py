@@ -1,8 +1,29 @@
+import re
 from bitshares.instance import shared_bitshares_instance
 from .amount import Amount
 from .asset import Asset
+from .compactamount import AssetInfo
 from .utils import formatTimeString
 
+#: Separates the symbols in ``USD/BTS``, ``USD:BTS`` and ``USD-BTS``
+MARKET_SEPARATOR = re.compile(r"[:/-]")
+
+
+def _chain_amount(amount, bitshares_instance):
+    """ Create an instance of :class:`bitshares.amount.Amount` from an
+        amount as used on the blockchain without going through
+        :func:`bitshares.amount.Amount.__init__`
+    """
+    info = AssetInfo.get(amount["asset_id"], bitshares_instance)
+    if info.asset is None:
+        info.asset = Asset(info.id, bitshares_instance=bitshares_instance)
+    a = Amount.__new__(Amount)
+    a.bitshares = bitshares_instance
+    dict.__setitem__(a, "asset", info.asset)
+    dict.__setitem__(a, "symbol", info.symbol)
+    dict.__setitem__(a, "amount", int(amount["amount"]) / 10 ** info.precision)
+    return a
+
 
 class Price(dict):
     """ This class deals with all sorts of prices of any pair of assets to
@@ -66,9 +87,8 @@ class Price(dict):
         self.bitshares = bitshares_instance or shared_bitshares_instance()
 
         if (len(args) == 1 and isinstance(args[0], str) and not base and not quote):
-            import re
             price, assets = args[0].split(" ")
-            base_symbol, quote_symbol = re.split("[/-:]", assets)
+            base_symbol, quote_symbol = MARKET_SEPARATOR.split(assets)
             base = Asset(base_symbol, bitshares_instance=self.bitshares)
             quote = Asset(quote_symbol, bitshares_instance=self.bitshares)
             self["quote"] = Amount(amount=1, asset=quote, bitshares_instance=self.bitshares)
@@ -90,7 +110,7 @@ class Price(dict):
         elif len(args) == 1 and isinstance(args[0], dict) and "receives" in args[0]:
             # Filled order
             assert base_asset, "Need a 'base_asset' asset"
-            base_asset = Asset(base_asset)
+            base_asset = Asset(base_asset, bitshares_instance=self.bitshares)
             if args[0]["receives"]["asset_id"] == base_asset["id"]:
                 # If the seller received "base" in a quote_base market, than
                 # it has been a sell order of quote
@@ -129,9 +149,8 @@ class Price(dict):
             self["base"] = base
 
         elif (len(args) == 2 and isinstance(args[0], float) and isinstance(args[1], str)):
-            import re
             price = args[0]
-            base_symbol, quote_symbol = re.split("[/-:]", args[1])
+            base_symbol, quote_symbol = MARKET_SEPARATOR.split(args[1])
             base = Asset(base_symbol, bitshares_instance=self.bitshares)
             quote = Asset(quote_symbol, bitshares_instance=self.bitshares)
             self["quote"] = Amount(amount=1, asset=quote, bitshares_instance=self.bitshares)
@@ -140,6 +159,32 @@ class Price(dict):
         else:
             raise Exception
 
+    @classmethod
+    def from_chain(cls, price, bitshares_instance=None):
+        """ Fast constructor for prices as used on the blockchain, e.g.
+            the ``sell_price`` of a limit order:
+
+            .. code-block:: python
+
+                Price.from_chain({
+                    "base": {"amount": 1, "asset_id": "1.3.0"},
+                    "quote": {"amount": 10, "asset_id": "1.3.106"}})
+
+            Contrary to the regular constructor, no type checks are done
+            and the assets are taken from the known assets (see
+            :class:`bitshares.compactamount.AssetInfo`), i.e. once an
+            asset is known, no API calls are made.
+        """
+        bitshares = bitshares_instance or shared_bitshares_instance()
+        p = cls.__new__(cls)
+        p.bitshares = bitshares
+        base = _chain_amount(price["base"], bitshares)
+        quote = _chain_amount(price["quote"], bitshares)
+        dict.__setitem__(p, "base", base)
+        dict.__setitem__(p, "quote", quote)
+        dict.__setitem__(p, "price", p._safedivide(base["amount"], quote["amount"]))
+        return p
+
     def __setitem__(self, key, value):
         dict.__setitem__(self, key, value)
         if "quote" in self and "base" in self:
@@ -148,9 +193,12 @@ class Price(dict):
                 self["quote"]["amount"]))
 
     def copy(self):
-        return Price(
-            base=self["base"].copy(),
-            quote=self["quote"].copy())
+        p = Price.__new__(Price)
+        p.bitshares = self.bitshares
+        dict.__setitem__(p, "base", self["base"].copy())
+        dict.__setitem__(p, "quote", self["quote"].copy())
+        dict.__setitem__(p, "price", self["price"])
+        return p
 
     def _safedivide(self, a, b):
         if b != 0.0:
@@ -216,6 +264,7 @@ class Price(dict):
             raise ValueError("Division of two prices!?")
         else:
             a["base"] //= other
+        return a
 
     def __ifloordiv__(self, other):
         if isinstance(other, Price):
@@ -224,53 +273,33 @@ class Price(dict):
             self["base"] //= other
         return self
 
-    def __lt__(self, other):
+    def _other_price(self, other):
+        """ Return the price of ``other`` as float. Prices have to be
+            given in the same market.
+        """
         if isinstance(other, Price):
             assert other["base"]["symbol"] == self["base"]["symbol"]
-            assert other["quote"]["symbol"] == self["base"]["symbol"]
-            return self["price"] < other["price"]
-        else:
-            return self["price"] < float(other or 0)
+            assert other["quote"]["symbol"] == self["quote"]["symbol"]
+            return other["price"]
+        return float(other or 0)
+
+    def __lt__(self, other):
+        return self["price"] < self._other_price(other)
 
     def __le__(self, other):
-        if isinstance(other, Price):
-            assert other["base"]["symbol"] == self["base"]["symbol"]
-            assert other["quote"]["symbol"] == self["base"]["symbol"]
-            return self["price"] <= other["price"]
-        else:
-            return self["price"] <= float(other or 0)
+        return self["price"] <= self._other_price(other)
 
     def __eq__(self, other):
-        if isinstance(other, Price):
-            assert other["base"]["symbol"] == self["base"]["symbol"]
-            assert other["quote"]["symbol"] == self["base"]["symbol"]
-            return self["price"] == other["price"]
-        else:
-            return self["price"] == float(other or 0)
+        return self["price"] == self._other_price(other)
 
     def __ne__(self, other):
-        if isinstance(other, Price):
-            assert other["base"]["symbol"] == self["base"]["symbol"]
-            assert other["quote"]["symbol"] == self["base"]["symbol"]
-            return self["price"] != other["price"]
-        else:
-            return self["price"] != float(other or 0)
+        return self["price"] != self._other_price(other)
 
     def __ge__(self, other):
-        if isinstance(other, Price):
-            assert other["base"]["symbol"] == self["base"]["symbol"]
-            assert other["quote"]["symbol"] == self["base"]["symbol"]
-            return self["price"] >= other["price"]
-        else:
-            return self["price"] >= float(other or 0)
+        return self["price"] >= self._other_price(other)
 
     def __gt__(self, other):
-        if isinstance(other, Price):
-            assert other["base"]["symbol"] == self["base"]["symbol"]
-            assert other["quote"]["symbol"] == self["base"]["symbol"]
-            return self["price"] > other["price"]
-        else:
-            return self["price"] > float(other or 0)
+        return self["price"] > self._other_price(other)
 
     __truediv__ = __div__
     __truemul__ = __mul__
@@ -307,14 +336,14 @@ class Order(Price):
             isinstance(args[0], str)
         ):
             order = self.bitshares.rpc.get_objects([args[0]])[0]
-            super(Order, self).__init__(order["sell_price"])
+            super(Order, self).__init__(order["sell_price"], bitshares_instance=self.bitshares)
             self["seller"] = order["seller"]
             self["id"] = order.get("id")
         elif (
             isinstance(args[0], dict) and
             "sell_price" in args[0]
         ):
-            super(Order, self).__init__(args[0]["sell_price"])
+            super(Order, self).__init__(args[0]["sell_price"], bitshares_instance=self.bitshares)
             self["id"] = args[0].get("id")
         elif (
             isinstance(args[0], dict) and
@@ -324,6 +353,7 @@ class Order(Price):
             super(Order, self).__init__(
                 Amount(args[0]["min_to_receive"], bitshares_instance=self.bitshares),
                 Amount(args[0]["amount_to_sell"], bitshares_instance=self.bitshares),
+                bitshares_instance=self.bitshares
             )
             self["id"] = args[0].get("id")
         elif isinstance(args[0], Amount) and isinstance(args[1], Amount):
@@ -332,6 +362,18 @@ class Order(Price):
         else:
             raise ValueError("Unkown format to load Order")
 
+    @classmethod
+    def from_chain(cls, order, bitshares_instance=None):
+        """ Fast constructor for limit orders as obtained from the
+            blockchain (e.g. through ``get_limit_orders``). See
+            :func:`bitshares.price.Price.from_chain`.
+        """
+        o = super(Order, cls).from_chain(order["sell_price"], bitshares_instance)
+        dict.__setitem__(o, "id", order.get("id"))
+        if "seller" in order:
+            dict.__setitem__(o, "seller", order["seller"])
+        return o
+
     def __repr__(self):
         t = ""
         if "time" in self and self["time"]:
@@ -366,6 +408,7 @@ class FilledOrder(Price):
                 order.get("price"),
                 base=kwargs.get("base"),
                 quote=kwargs.get("quote"),
+                bitshares_instance=self.bitshares
             )
             self["time"] = formatTimeString(order["date"])
 
@@ -377,6 +420,7 @@ class FilledOrder(Price):
             super(FilledOrder, self).__init__(
                 order,
                 base_asset=base_asset,
+                bitshares_instance=self.bitshares
             )
             if "time" in order:
                 self["time"] = formatTimeString(order["time"])
@@ -386,6 +430,34 @@ class FilledOrder(Price):
         else:
             raise
 
+    @classmethod
+    def from_chain(cls, order, base_asset, bitshares_instance=None):
+        """ Fast constructor for filled orders (``fill_order``
+            operations) as obtained from the blockchain. See
+            :func:`bitshares.price.Price.from_chain`.
+
+            :param dict order: The operation (or the account history entry)
+            :param str base_asset: Id of the base asset of the market
+        """
+        # The time is part of the history entry, not of the operation
+        time = order.get("time")
+        if "op" in order:
+            order = order["op"]
+        time = order.get("time", time)
+        if order["receives"]["asset_id"] == base_asset:
+            price = {"base": order["receives"], "quote": order["pays"]}
+            type = "sell"
+        else:
+            price = {"base": order["pays"], "quote": order["receives"]}
+            type = "buy"
+        o = super(FilledOrder, cls).from_chain(price, bitshares_instance)
+        dict.__setitem__(o, "type", type)
+        if time:
+            dict.__setitem__(o, "time", formatTimeString(time))
+        if "account_id" in order:
+            dict.__setitem__(o, "account_id", order["account_id"])
+        return o
+
     def __repr__(self):
         t = ""
         if "time" in self and self["time"]:
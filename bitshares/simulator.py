@@ -0,0 +1,564 @@
+from heapq import heapify, heappush, heappop
+
+
+def _match_amounts(taker_for_sale, maker_for_sale, maker_sell, maker_receive):
+    """ Amounts of a match at the price of the maker, rounded the way
+        the blockchain rounds
+
+        :param int taker_for_sale: Satoshis the taker has for sale
+        :param int maker_for_sale: Satoshis the maker has for sale
+        :param int maker_sell: ``sell_price.base`` amount of the maker
+        :param int maker_receive: ``sell_price.quote`` amount of the maker
+        :returns: ``(taker pays, taker receives, taker filled)``. The
+            maker pays what the taker receives and vice versa. If the
+            taker is not filled, the maker is.
+    """
+    # What the maker has for sale, in the asset of the taker
+    maker_for_sale_taker = maker_for_sale * maker_receive // maker_sell
+    if taker_for_sale <= maker_for_sale_taker:
+        receives = taker_for_sale * maker_sell // maker_receive
+        # Round up in favor of the maker
+        pays = -(-receives * maker_receive // maker_sell)
+        return pays, receives, True
+    pays = maker_for_sale_taker
+    receives = -(-pays * maker_sell // maker_receive)
+    return pays, receives, False
+
+
+class SimulatedOrder(object):
+    """ An open order of the :class:`Simulator`
+
+        Amounts are integers (satoshis) as on the blockchain:
+        ``for_sale`` is what is left of ``amount_to_sell``, the price is
+        ``sell`` satoshis of the sold asset for ``receive`` satoshis of
+        the received asset.
+    """
+    __slots__ = [
+        "id", "account", "bid", "for_sale", "sell", "receive", "expiration"]
+
+    def __init__(self, id, account, bid, for_sale, sell, receive, expiration):
+        self.id = id
+        self.account = account
+        #: Sells ``base`` (buy order)
+        self.bid = bid
+        self.for_sale = for_sale
+        self.sell = sell
+        self.receive = receive
+        self.expiration = expiration
+
+
+class Simulator(object):
+    """ Deterministic offline matching engine of a single market
+
+        :param bitshares.market.Market market: The market (any
+            dictionary with ``base`` and ``quote`` assets that carry
+            ``id``, ``symbol`` and ``precision`` will do)
+        :param dict balances: Initial balances of ``account`` as
+            ``{symbol: amount}``. Orders of ``account`` that exceed its
+            balance are rejected. Other accounts are not limited.
+        :param str account: Default account of the strategy
+        :param int time: Time of the simulation (timestamp)
+
+        Orders follow the semantics of ``limit_order_create``: an order
+        sells ``amount_to_sell`` for at least ``min_to_receive``, is
+        matched against the book at the price of the maker, and the
+        amounts are rounded down in favor of the maker (integer
+        satoshis). Orders that are too small to receive anything are
+        cancelled, ``fill_or_kill`` orders that cannot be filled
+        completely are rejected and orders expire at their expiration
+        time. Fees are not simulated.
+
+        Strategies place orders with the signatures of
+        :func:`bitshares.market.Market.buy`,
+        :func:`bitshares.market.Market.sell` and
+        :func:`bitshares.market.Market.cancel`. Recorded market data is
+        replayed as events (see :func:`process`):
+
+        .. code-block:: python
+
+            from bitshares.market import Market
+            from bitshares.simulator import Simulator
+
+            def strategy(sim, event):
+                if not sim.accountopenorders():
+                    sim.buy(sim.best_bid * 0.99, 10)
+                    sim.sell(sim.best_ask * 1.01, 10)
+
+            sim = Simulator(Market("USD:BTS"), balances={"BTS": 10000, "USD": 30})
+            sim.run([
+                (1500000000, "snapshot", {"bids": [(300, 50)], "asks": [(310, 40)]}),
+                (1500000060, "trade", "sell", 297, 20),
+            ], strategy)
+            print(sim.fills, sim.pnl())
+
+        Prices are denoted in ``base``/``quote``, amounts in ``quote``.
+    """
+    def __init__(self, market, balances=None, account="sim", time=0):
+        self.market = market
+        self.account = account
+        self.time = time
+        self.base_id = market["base"]["id"]
+        self.quote_id = market["quote"]["id"]
+        self.base_precision = 10 ** market["base"]["precision"]
+        self.quote_precision = 10 ** market["quote"]["precision"]
+        symbols = {
+            market["base"]["symbol"]: self.base_id,
+            market["quote"]["symbol"]: self.quote_id,
+            self.base_id: self.base_id,
+            self.quote_id: self.quote_id,
+        }
+        precision = {
+            self.base_id: self.base_precision,
+            self.quote_id: self.quote_precision,
+        }
+
+        #: Balances per account as ``{asset id: satoshis}``
+        self.balances = dict()
+        #: Accounts whose balances are checked
+        self.limited = set()
+        if balances is not None:
+            initial = {self.base_id: 0, self.quote_id: 0}
+            for symbol, amount in balances.items():
+                id = symbols[symbol]
+                initial[id] = int(round(amount * precision[id]))
+            self.balances[account] = initial
+            self.limited.add(account)
+        self.initial = {
+            a: dict(b) for a, b in self.balances.items()}
+
+        #: Open orders by number
+        self.orders = dict()
+        # Heaps of (price key, number), stale entries are skipped
+        self.bids = []
+        self.asks = []
+        self.expirations = []
+        self.next_id = 0
+        #: Fills of the accounts (recorded market data is anonymous) in
+        #: the format of the ``fill_order`` operation
+        self.fills = []
+        #: Price of the last match
+        self.last_price = None
+        #: Number of matches
+        self.matches = 0
+
+    # Orders
+
+    def _order_id(self, number):
+        return "1.7.%d" % number
+
+    def _balance(self, account):
+        balance = self.balances.get(account)
+        if balance is None:
+            balance = self.balances[account] = {
+                self.base_id: 0, self.quote_id: 0}
+            self.initial[account] = dict(balance)
+        return balance
+
+    def create(
+        self,
+        bid,
+        amount_to_sell,
+        min_to_receive,
+        expiration=None,
+        killfill=False,
+        account=None,
+        resting=True,
+        max_receive=None
+    ):
+        """ Apply a ``limit_order_create`` in satoshis
+
+            :param bool bid: Sell ``base`` for ``quote`` (otherwise
+                ``quote`` for ``base``)
+            :param int amount_to_sell: Satoshis to sell
+            :param int min_to_receive: Satoshis to receive at least
+            :param int expiration: Expiration time (timestamp)
+            :param bool killfill: Fill or kill
+            :param str account: Owner, ``None`` for recorded market data
+            :param bool resting: Put what is not filled on the book
+            :param int max_receive: Stop matching once this many
+                satoshis have been received
+            :returns: The order number or ``None`` if the order has been
+                rejected
+        """
+        if amount_to_sell <= 0 or min_to_receive <= 0:
+            return None
+        if account is not None:
+            balance = self._balance(account)
+            asset = self.base_id if bid else self.quote_id
+            if account in self.limited and balance[asset] < amount_to_sell:
+                return None
+        self.next_id += 1
+        order = SimulatedOrder(
+            self.next_id, account, bid, amount_to_sell,
+            amount_to_sell, min_to_receive, expiration)
+        if killfill and not self._fillable(order):
+            return None
+        if account is not None:
+            balance[asset] -= amount_to_sell
+        self._match(order, max_receive)
+        if order.for_sale and resting and not killfill:
+            # Orders that cannot receive anything are cancelled
+            if order.for_sale * order.receive // order.sell:
+                self.orders[order.id] = order
+                if order.bid:
+                    heappush(self.bids, (-order.sell / order.receive, order.id))
+                else:
+                    heappush(self.asks, (order.receive / order.sell, order.id))
+                if expiration is not None:
+                    heappush(self.expirations, (expiration, order.id))
+                return order.id
+        self._refund(order)
+        return order.id
+
+    def _refund(self, order):
+        if order.account is not None and order.for_sale:
+            asset = self.base_id if order.bid else self.quote_id
+            self.balances[order.account][asset] += order.for_sale
+        order.for_sale = 0
+
+    def _crosses(self, taker, maker):
+        """ Is the price of the maker good enough for the taker?
+        """
+        return maker.sell * taker.sell >= taker.receive * maker.receive
+
+    def _fillable(self, taker):
+        """ Can ``taker`` be filled completely?
+        """
+        book = self.asks if taker.bid else self.bids
+        remaining = taker.for_sale
+        for _, number in sorted(book):
+            maker = self.orders.get(number)
+            if maker is None:
+                continue
+            if not self._crosses(taker, maker):
+                break
+            pays, receives, filled = _match_amounts(
+                remaining, maker.for_sale, maker.sell, maker.receive)
+            if filled:
+                return receives > 0
+            remaining -= pays
+        return False
+
+    def _match(self, taker, max_receive=None):
+        """ Match ``taker`` against the book until it is filled (or has
+            received ``max_receive``) or the prices do not cross anymore
+        """
+        book = self.asks if taker.bid else self.bids
+        orders = self.orders
+        while taker.for_sale and book:
+            maker = orders.get(book[0][1])
+            if maker is None:
+                heappop(book)
+                continue
+            if not self._crosses(taker, maker):
+                break
+            for_sale = taker.for_sale
+            if max_receive is not None:
+                # What is needed to receive the rest at the maker's price
+                for_sale = min(for_sale, -(-max_receive * maker.receive // maker.sell))
+            pays, receives, filled = _match_amounts(
+                for_sale, maker.for_sale, maker.sell, maker.receive)
+            if receives == 0:
+                if filled:
+                    # Too small to receive anything
+                    break
+                # The maker is too small to fill anything
+                self._remove(maker)
+                continue
+            self._fill(taker, maker, pays, receives)
+            if max_receive is not None:
+                max_receive -= receives
+            if not filled:
+                self._remove(maker)
+                if max_receive is not None and max_receive <= 0:
+                    break
+                continue
+            if not maker.for_sale * maker.receive // maker.sell:
+                # What is left of the maker cannot receive anything
+                self._remove(maker)
+            # The rest of the taker is refunded
+            break
+
+    def _fill(self, taker, maker, pays, receives):
+        taker.for_sale -= pays
+        maker.for_sale -= receives
+        self.matches += 1
+        if taker.bid:
+            base, quote = pays, receives
+        else:
+            base, quote = receives, pays
+        self.last_price = (base / self.base_precision) / (quote / self.quote_precision)
+        if taker.account is not None:
+            self._record(taker, pays, receives, False)
+        if maker.account is not None:
+            self._record(maker, receives, pays, True)
+
+    def _record(self, order, pays, receives, is_maker):
+        if order.bid:
+            pays_asset, receives_asset = self.base_id, self.quote_id
+        else:
+            pays_asset, receives_asset = self.quote_id, self.base_id
+        self.balances[order.account][receives_asset] += receives
+        self.fills.append({
+            "time": self.time,
+            "order_id": self._order_id(order.id),
+            "account_id": order.account,
+            "pays": {"amount": pays, "asset_id": pays_asset},
+            "receives": {"amount": receives, "asset_id": receives_asset},
+            "is_maker": is_maker,
+        })
+
+    def _remove(self, order):
+        """ Take an order off the book and refund what is left
+        """
+        self.orders.pop(order.id, None)
+        self._refund(order)
+
+    def advance(self, time):
+        """ Advance the time of the simulation and let orders expire
+
+            :param int time: Timestamp
+        """
+        self.time = time
+        expirations = self.expirations
+        while expirations and expirations[0][0] <= time:
+            _, number = heappop(expirations)
+            order = self.orders.get(number)
+            if order is not None:
+                self._remove(order)
+
+    # Market data
+
+    def _best(self, book):
+        while book:
+            order = self.orders.get(book[0][1])
+            if order is not None:
+                return order
+            heappop(book)
+
+    @property
+    def best_bid(self):
+        """ Highest bid price or ``None``
+        """
+        order = self._best(self.bids)
+        if order is not None:
+            return (order.sell / self.base_precision) / (order.receive / self.quote_precision)
+
+    @property
+    def best_ask(self):
+        """ Lowest ask price or ``None``
+        """
+        order = self._best(self.asks)
+        if order is not None:
+            return (order.receive / self.base_precision) / (order.sell / self.quote_precision)
+
+    def _satoshis(self, price, amount):
+        """ ``(base, quote)`` satoshis of ``amount`` quote at ``price``
+        """
+        quote = int(float(amount) * self.quote_precision)
+        base = int(float(amount) * float(price) * self.base_precision)
+        return base, quote
+
+    def snapshot(self, book):
+        """ Replace the recorded orders with an order book snapshot.
+            Orders of the accounts stay, snapshot orders that cross them
+            are matched.
+
+            :param dict book: Order book with ``bids`` and ``asks`` as
+                lists of ``(price, quote amount)`` or dictionaries with
+                ``price`` and ``quote`` (e.g. the result of
+                :func:`bitshares.market.Market.orderbook` or
+                :func:`bitshares.orderbook.OrderBook.depth`)
+        """
+        for number in [n for n, o in self.orders.items() if o.account is None]:
+            del self.orders[number]
+        # Drop the stale entries of the heaps
+        self.bids = [e for e in self.bids if e[1] in self.orders]
+        self.asks = [e for e in self.asks if e[1] in self.orders]
+        heapify(self.bids)
+        heapify(self.asks)
+        for bid, side in [(True, book["bids"]), (False, book["asks"])]:
+            for level in side:
+                if isinstance(level, dict):
+                    price, amount = float(level["price"]), float(level["quote"])
+                else:
+                    price, amount = level[0], level[1]
+                base, quote = self._satoshis(price, amount)
+                if bid:
+                    self.create(True, base, quote)
+                else:
+                    self.create(False, quote, base)
+
+    def trade(self, type, price, amount):
+        """ Replay a recorded trade: an order of the market that takes
+            ``amount`` of ``quote`` from the book up to ``price`` and is
+            not kept on the book
+
+            :param str type: ``buy`` or ``sell`` (side of the taker)
+            :param float price: Price in ``base``/``quote``
+            :param float amount: Amount of ``quote``
+        """
+        base, quote = self._satoshis(price, amount)
+        if type == "buy":
+            self.create(True, base, quote, resting=False, max_receive=quote)
+        else:
+            self.create(False, quote, base, resting=False)
+
+    def process(self, event):
+        """ Process an event
+
+            :param tuple event: ``(time, kind, *args)`` with ``kind``
+                being ``snapshot`` (``args`` as in :func:`snapshot`),
+                ``trade`` (as in :func:`trade`), or ``buy``, ``sell``
+                and ``cancel`` (as in :func:`buy`, :func:`sell` and
+                :func:`cancel`)
+        """
+        if event[0] > self.time:
+            self.advance(event[0])
+        kind = event[1]
+        if kind == "trade":
+            self.trade(*event[2:])
+        elif kind == "snapshot":
+            self.snapshot(*event[2:])
+        elif kind in ["buy", "sell", "cancel"]:
+            getattr(self, kind)(*event[2:])
+        else:
+            raise ValueError("Unknown event %s" % kind)
+
+    def run(self, events, strategy=None):
+        """ Process events and call ``strategy(simulator, event)`` after
+            each of them
+
+            :returns: The result of :func:`pnl`
+        """
+        process = self.process
+        if strategy is None:
+            for event in events:
+                process(event)
+        else:
+            for event in events:
+                process(event)
+                strategy(self, event)
+        return self.pnl()
+
+    # Strategy interface
+
+    def _order(self, bid, price, amount, expiration, killfill, account):
+        base, quote = self._satoshis(price, amount)
+        if expiration is not None:
+            expiration = self.time + expiration
+        if bid:
+            number = self.create(True, base, quote, expiration, killfill, account or self.account)
+        else:
+            number = self.create(False, quote, base, expiration, killfill, account or self.account)
+        if number is None:
+            raise ValueError("The order has been rejected")
+        return {"orderid": self._order_id(number)}
+
+    def buy(
+        self,
+        price,
+        amount,
+        expiration=7 * 24 * 60 * 60,
+        killfill=False,
+        account=None,
+        returnOrderId=False
+    ):
+        """ Place a buy order (see :func:`bitshares.market.Market.buy`)
+
+            :returns: A dictionary with the ``orderid``
+            :raises ValueError: if the order is rejected (balance,
+                fill or kill)
+        """
+        return self._order(True, price, amount, expiration, killfill, account)
+
+    def sell(
+        self,
+        price,
+        amount,
+        expiration=7 * 24 * 60 * 60,
+        killfill=False,
+        account=None,
+        returnOrderId=False
+    ):
+        """ Place a sell order (see :func:`bitshares.market.Market.sell`)
+
+            :returns: A dictionary with the ``orderid``
+            :raises ValueError: if the order is rejected (balance,
+                fill or kill)
+        """
+        return self._order(False, price, amount, expiration, killfill, account)
+
+    def cancel(self, orderNumber, account=None):
+        """ Cancel orders (see :func:`bitshares.market.Market.cancel`)
+
+            :param str orderNumber: Order id ``1.7.x`` or list of ids
+        """
+        if isinstance(orderNumber, str):
+            orderNumber = [orderNumber]
+        for id in orderNumber:
+            order = self.orders.get(int(id.split(".")[2]))
+            if order is None:
+                raise ValueError("Order %s does not exist" % id)
+            if order.account != (account or order.account):
+                raise ValueError("Order %s belongs to another account" % id)
+            self._remove(order)
+
+    def accountopenorders(self, account=None):
+        """ Open orders of an account in the format of
+            :func:`bitshares.market.Market.accountopenorders`
+            (``amount`` is the remaining amount of ``quote``)
+        """
+        account = account or self.account
+        orders = []
+        for order in sorted(self.orders.values(), key=lambda o: o.id):
+            if order.account != account:
+                continue
+            if order.bid:
+                price = (order.sell / self.base_precision) / (order.receive / self.quote_precision)
+                amount = order.for_sale / self.base_precision / price
+            else:
+                price = (order.receive / self.base_precision) / (order.sell / self.quote_precision)
+                amount = order.for_sale / self.quote_precision
+            orders.append({
+                "type": "buy" if order.bid else "sell",
+                "price": price,
+                "amount": amount,
+                "orderid": self._order_id(order.id),
+            })
+        return orders
+
+    def pnl(self, account=None, price=None):
+        """ Profit and loss of an account
+
+            :param str account: The account (defaults to the account of
+                the strategy)
+            :param float price: Price to value ``quote`` at (defaults
+                to the price of the last match)
+            :returns: Dictionary with the changes of the ``base`` and
+                ``quote`` balances (including open orders), their
+                ``value`` in ``base``, the number of ``fills`` and the
+                traded ``volume`` of ``quote``
+        """
+        account = account or self.account
+        price = price if price is not None else (self.last_price or 0)
+        balance = dict(self.balances.get(account, {self.base_id: 0, self.quote_id: 0}))
+        initial = self.initial.get(account, {self.base_id: 0, self.quote_id: 0})
+        for order in self.orders.values():
+            if order.account == account:
+                balance[self.base_id if order.bid else self.quote_id] += order.for_sale
+        base = (balance[self.base_id] - initial[self.base_id]) / self.base_precision
+        quote = (balance[self.quote_id] - initial[self.quote_id]) / self.quote_precision
+        fills = [f for f in self.fills if f["account_id"] == account]
+        volume = sum(
+            f["pays"]["amount"] if f["pays"]["asset_id"] == self.quote_id
+            else f["receives"]["amount"]
+            for f in fills) / self.quote_precision
+        return {
+            "base": base,
+            "quote": quote,
+            "value": base + quote * price,
+            "price": price,
+            "fills": len(fills),
+            "volume": volume,
+        }
@@ -1,8 +1,8 @@
 import shutil
 import time
 import os
+import json
 import sqlite3
-from .aes import AESCipher
 from appdirs import user_data_dir
 from datetime import datetime
 import logging
@@ -17,6 +17,37 @@ log.addHandler(logging.StreamHandler())
 timeformat = "%Y%m%d-%H%M%S"
 
 
+def _merge_ranges(ranges):
+    """ Merge overlapping and adjacent time ranges ``(start, stop)``
+    """
+    ranges = sorted(ranges)
+    merged = [list(ranges[0])]
+    for s, e in ranges[1:]:
+        if s <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], e)
+        else:
+            merged.append([s, e])
+    return merged
+
+
+def _missing_ranges(ranges, start, stop):
+    """ Return the parts of ``[start, stop)`` that are not covered by the
+        sorted time ranges ``ranges``
+    """
+    missing = []
+    for s, e in ranges:
+        if e <= start:
+            continue
+        if s >= stop:
+            break
+        if s > start:
+            missing.append((start, s))
+        start = max(start, e)
+    if start < stop:
+        missing.append((start, stop))
+    return missing
+
+
 class DataDir(object):
     """ This class ensures that the user's data is stored in its OS
         preotected user directory:
@@ -36,6 +67,10 @@ class DataDir(object):
 
          Furthermore, it offers an interface to generated backups
          in the `backups/` directory every now and then.
+
+         The directory and the database table of a storage are only
+         created when the storage is accessed for the first time (see
+         :func:`connect`).
     """
     appname = "bitshares"
     appauthor = "Fabian Schuh"
@@ -46,7 +81,20 @@ class DataDir(object):
 
     def __init__(self):
         #: Storage
-        self.mkdir_p()
+        self.initialized = False
+
+    def connect(self):
+        """ Open a connection to the SQLite database. Upon first use, this
+            ensures that the data directory and the storage's table
+            (see ``exists_table`` and ``create_table`` of the derived
+            classes) exist.
+        """
+        if not self.initialized:
+            self.mkdir_p()
+            if not self.exists_table():
+                self.create_table()
+            self.initialized = True
+        return sqlite3.connect(self.sqlDataBaseFile)
 
     def mkdir_p(self):
         """ Ensure that the directory in which the data is stored
@@ -139,7 +187,7 @@ class Key(DataDir):
         """ Returns the public keys stored in the database
         """
         query = ("SELECT pub from %s " % (self.__tablename__))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
+        connection = self.connect()
         cursor = connection.cursor()
         cursor.execute(query)
         results = cursor.fetchall()
@@ -156,7 +204,7 @@ class Key(DataDir):
         query = ("SELECT wif from %s " % (self.__tablename__) +
                  "WHERE pub=?",
                  (pub,))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
+        connection = self.connect()
         cursor = connection.cursor()
         cursor.execute(*query)
         key = cursor.fetchone()
@@ -174,7 +222,7 @@ class Key(DataDir):
         query = ("UPDATE %s " % self.__tablename__ +
                  "SET wif=? WHERE pub=?",
                  (wif, pub))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
+        connection = self.connect()
         cursor = connection.cursor()
         cursor.execute(*query)
         connection.commit()
@@ -191,7 +239,7 @@ class Key(DataDir):
         query = ('INSERT INTO %s (pub, wif) ' % self.__tablename__ +
                  'VALUES (?, ?)',
                  (pub, wif))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
+        connection = self.connect()
         cursor = connection.cursor()
         cursor.execute(*query)
         connection.commit()
@@ -204,7 +252,7 @@ class Key(DataDir):
         query = ("DELETE FROM %s " % (self.__tablename__) +
                  "WHERE pub=?",
                  (pub,))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
+        connection = self.connect()
         cursor = connection.cursor()
         cursor.execute(*query)
         connection.commit()
@@ -275,7 +323,7 @@ class Configuration(DataDir):
                  "WHERE key=?",
                  (key,)
                  )
-        connection = sqlite3.connect(self.sqlDataBaseFile)
+        connection = self.connect()
         cursor = connection.cursor()
         cursor.execute(*query)
         return True if cursor.fetchone() else False
@@ -288,7 +336,7 @@ class Configuration(DataDir):
                  "WHERE key=?",
                  (key,)
                  )
-        connection = sqlite3.connect(self.sqlDataBaseFile)
+        connection = self.connect()
         cursor = connection.cursor()
         cursor.execute(*query)
         result = cursor.fetchone()
@@ -323,7 +371,7 @@ class Configuration(DataDir):
             query = ("INSERT INTO %s " % self.__tablename__ +
                      "(key, value) VALUES (?, ?)",
                      (key, value))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
+        connection = self.connect()
         cursor = connection.cursor()
         cursor.execute(*query)
         connection.commit()
@@ -334,14 +382,14 @@ class Configuration(DataDir):
         query = ("DELETE FROM %s " % (self.__tablename__) +
                  "WHERE key=?",
                  (key,))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
+        connection = self.connect()
         cursor = connection.cursor()
         cursor.execute(*query)
         connection.commit()
 
     def __iter__(self):
         query = ("SELECT key, value from %s " % (self.__tablename__))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
+        connection = self.connect()
         cursor = connection.cursor()
         cursor.execute(query)
         r = {}
@@ -351,12 +399,479 @@ class Configuration(DataDir):
 
     def __len__(self):
         query = ("SELECT id from %s " % (self.__tablename__))
-        connection = sqlite3.connect(self.sqlDataBaseFile)
+        connection = self.connect()
         cursor = connection.cursor()
         cursor.execute(query)
         return len(cursor.fetchall())
 
 
+class AssetRegistry(DataDir):
+    """ This is a persistent registry of asset metadata that stores the
+        fields of the assets of each network that never change (id,
+        symbol, precision and the ids of the bitasset and dynamic data,
+        see :attr:`fields`) in the `assets` table of the SQLite3
+        database. It allows to resolve assets without a round trip to the
+        API server (see :class:`bitshares.asset.Asset`). Fields that can
+        change (e.g. the ``options`` with the core exchange rate and
+        flags) are never stored.
+
+        The assets of a network are loaded into memory upon first use.
+        Since nodes are identified by their URLs only, we remember the
+        last chain id seen for each node in the configuration.
+    """
+    __tablename__ = "assets"
+
+    #: Fields of the asset objects that are stored
+    fields = [
+        "id", "symbol", "precision", "bitasset_data_id",
+        "dynamic_asset_data_id"]
+
+    def __init__(self):
+        super(AssetRegistry, self).__init__()
+        #: Assets per chain id, indexed by id and symbol
+        self.assets = dict()
+        #: Chain id per node
+        self.chains = dict()
+
+    def exists_table(self):
+        """ Check if the database table exists
+        """
+        query = ("SELECT name FROM sqlite_master " +
+                 "WHERE type='table' AND name=?",
+                 (self.__tablename__, ))
+        connection = sqlite3.connect(self.sqlDataBaseFile)
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        return True if cursor.fetchone() else False
+
+    def create_table(self):
+        """ Create the new table in the SQLite database
+        """
+        query = ('CREATE TABLE %s (' % self.__tablename__ +
+                 'chain_id STRING(64),' +
+                 'id STRING(32),' +
+                 'symbol STRING(16),' +
+                 'precision INTEGER,' +
+                 'bitasset_data_id STRING(32),' +
+                 'dynamic_asset_data_id STRING(32),' +
+                 'data TEXT,' +
+                 'PRIMARY KEY (chain_id, id)' +
+                 ')')
+        connection = sqlite3.connect(self.sqlDataBaseFile)
+        cursor = connection.cursor()
+        cursor.execute(query)
+        connection.commit()
+
+    def getChainId(self, rpc, connect=False):
+        """ Return the chain id of the network the ``rpc`` instance talks
+            to. Unless ``connect`` is ``True``, we do not ask the node but
+            take the last chain id seen for the node.
+
+            :param bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC rpc: RPC instance
+            :param bool connect: Ask the node if needed
+            :returns: chain id or ``None`` if unknown
+        """
+        if rpc is None:
+            # Offline instance
+            return None
+        node = rpc.nodes[0]
+        if rpc._chain_params or connect:
+            chain_id = rpc.chain_params["chain_id"]
+            if self.chains.get(node) != chain_id:
+                self.chains[node] = chain_id
+                configStorage["chain_id:" + node] = chain_id
+        elif node not in self.chains:
+            self.chains[node] = configStorage["chain_id:" + node]
+        return self.chains[node]
+
+    def load(self, chain_id):
+        """ Return the assets known for chain ``chain_id`` indexed by id
+            and symbol
+        """
+        if chain_id not in self.assets:
+            query = ("SELECT data FROM %s " % self.__tablename__ +
+                     "WHERE chain_id=?",
+                     (chain_id, ))
+            connection = self.connect()
+            cursor = connection.cursor()
+            cursor.execute(*query)
+            assets = dict()
+            for data, in cursor.fetchall():
+                asset = self._immutable(json.loads(data))
+                assets[asset["id"]] = asset
+                assets[asset["symbol"]] = asset
+            self.assets[chain_id] = assets
+        return self.assets[chain_id]
+
+    def _immutable(self, asset):
+        """ The fields of ``asset`` that are stored
+        """
+        return dict((k, asset[k]) for k in self.fields if k in asset)
+
+    def get(self, rpc, key):
+        """ Return the asset object for id or symbol ``key`` or ``None``
+            if the asset is unknown
+
+            :param bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC rpc: RPC instance
+            :param str key: Asset id or symbol
+        """
+        chain_id = self.getChainId(rpc)
+        if not chain_id:
+            return None
+        return self.load(chain_id).get(key)
+
+    def add(self, rpc, assets):
+        """ Add (or update) asset objects
+
+            :param bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC rpc: RPC instance
+            :param list assets: Asset objects as returned by the API
+        """
+        chain_id = self.getChainId(rpc, connect=True)
+        known = self.load(chain_id)
+        rows = []
+        for asset in assets:
+            asset = self._immutable(asset)
+            known[asset["id"]] = asset
+            known[asset["symbol"]] = asset
+            rows.append((
+                chain_id,
+                asset["id"],
+                asset["symbol"],
+                asset["precision"],
+                asset.get("bitasset_data_id"),
+                asset["dynamic_asset_data_id"],
+                json.dumps(asset),
+            ))
+        query = ('INSERT OR REPLACE INTO %s ' % self.__tablename__ +
+                 '(chain_id, id, symbol, precision, bitasset_data_id, ' +
+                 'dynamic_asset_data_id, data) ' +
+                 'VALUES (?, ?, ?, ?, ?, ?, ?)')
+        connection = self.connect()
+        cursor = connection.cursor()
+        cursor.executemany(query, rows)
+        connection.commit()
+
+    def sync(self, rpc, full=False, chunk_size=100):
+        """ Obtain the assets that have been created since the last
+            sync from the API server
+
+            :param bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC rpc: RPC instance
+            :param bool full: Obtain all assets again
+            :param int chunk_size: Number of assets to obtain per call
+            :returns: Number of assets obtained
+        """
+        chain_id = self.getChainId(rpc, connect=True)
+        start = 0
+        if not full:
+            ids = [int(k.split(".")[2])
+                   for k in self.load(chain_id) if k[:4] == "1.3."]
+            start = max(ids) + 1 if ids else 0
+        num = 0
+        while True:
+            assets = rpc.get_objects(
+                ["1.3.%d" % i for i in range(start, start + chunk_size)])
+            # Asset ids are assigned sequentially
+            assets = [a for a in assets if a]
+            if assets:
+                self.add(rpc, assets)
+            num += len(assets)
+            if len(assets) < chunk_size:
+                return num
+            start += chunk_size
+
+    def delete(self, chain_id):
+        """ Delete all assets of chain ``chain_id``
+        """
+        query = ("DELETE FROM %s " % (self.__tablename__) +
+                 "WHERE chain_id=?",
+                 (chain_id,))
+        connection = self.connect()
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        connection.commit()
+        self.assets.pop(chain_id, None)
+
+
+class CandleStore(DataDir):
+    """ This is a persistent cache of completed OHLCV buckets (see
+        :class:`bitshares.candles.Candles`) in the `candles` table of the
+        SQLite3 database.
+
+        Since markets do not have buckets for periods without trades, the
+        time ranges that have been obtained from the API server are
+        stored in the `candle_ranges` table. Only ranges that are not
+        covered need to be obtained again.
+    """
+    __tablename__ = "candles"
+    __rangestablename__ = "candle_ranges"
+
+    def exists_table(self):
+        """ Check if the database table exists
+        """
+        query = ("SELECT name FROM sqlite_master " +
+                 "WHERE type='table' AND name=?",
+                 (self.__tablename__, ))
+        connection = sqlite3.connect(self.sqlDataBaseFile)
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        return True if cursor.fetchone() else False
+
+    def create_table(self):
+        """ Create the new tables in the SQLite database
+        """
+        key = ('chain_id STRING(64),' +
+               'base STRING(32),' +
+               'quote STRING(32),' +
+               'seconds INTEGER,')
+        connection = sqlite3.connect(self.sqlDataBaseFile)
+        cursor = connection.cursor()
+        cursor.execute(
+            'CREATE TABLE %s (' % self.__tablename__ + key +
+            'open INTEGER,' +
+            'open_price REAL,' +
+            'high REAL,' +
+            'low REAL,' +
+            'close REAL,' +
+            'base_volume REAL,' +
+            'quote_volume REAL,' +
+            'PRIMARY KEY (chain_id, base, quote, seconds, open)' +
+            ')')
+        cursor.execute(
+            'CREATE TABLE IF NOT EXISTS %s (' % self.__rangestablename__ + key +
+            'start INTEGER,' +
+            'stop INTEGER' +
+            ')')
+        connection.commit()
+
+    def get(self, market, start, stop):
+        """ Return the buckets that open within ``[start, stop)`` as
+            tuples ``(open, open price, high, low, close, base volume,
+            quote volume)``
+
+            :param tuple market: ``(chain_id, base id, quote id, seconds)``
+            :param int start: Timestamp
+            :param int stop: Timestamp
+        """
+        query = ("SELECT open, open_price, high, low, close, " +
+                 "base_volume, quote_volume FROM %s " % self.__tablename__ +
+                 "WHERE chain_id=? AND base=? AND quote=? AND seconds=? " +
+                 "AND open>=? AND open<? ORDER BY open",
+                 tuple(market) + (start, stop))
+        connection = self.connect()
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        return cursor.fetchall()
+
+    def ranges(self, market):
+        """ Return the time ranges ``(start, stop)`` that are covered
+
+            :param tuple market: ``(chain_id, base id, quote id, seconds)``
+        """
+        query = ("SELECT start, stop FROM %s " % self.__rangestablename__ +
+                 "WHERE chain_id=? AND base=? AND quote=? AND seconds=? " +
+                 "ORDER BY start",
+                 tuple(market))
+        connection = self.connect()
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        return cursor.fetchall()
+
+    def missing(self, market, start, stop):
+        """ Return the time ranges within ``[start, stop)`` that are not
+            covered yet
+        """
+        return _missing_ranges(self.ranges(market), start, stop)
+
+    def add(self, market, buckets, start, stop):
+        """ Store completed buckets and mark ``[start, stop)`` as covered
+
+            :param tuple market: ``(chain_id, base id, quote id, seconds)``
+            :param list buckets: Tuples as returned by :func:`get`
+            :param int start: Timestamp
+            :param int stop: Timestamp
+        """
+        market = tuple(market)
+        merged = _merge_ranges(self.ranges(market) + [(start, stop)])
+
+        connection = self.connect()
+        cursor = connection.cursor()
+        cursor.executemany(
+            'INSERT OR REPLACE INTO %s ' % self.__tablename__ +
+            '(chain_id, base, quote, seconds, open, open_price, high, low, ' +
+            'close, base_volume, quote_volume) ' +
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [market + tuple(b) for b in buckets])
+        cursor.execute(
+            'DELETE FROM %s ' % self.__rangestablename__ +
+            'WHERE chain_id=? AND base=? AND quote=? AND seconds=?',
+            market)
+        cursor.executemany(
+            'INSERT INTO %s ' % self.__rangestablename__ +
+            '(chain_id, base, quote, seconds, start, stop) ' +
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [market + tuple(r) for r in merged])
+        connection.commit()
+
+    def delete(self, chain_id):
+        """ Delete all buckets of chain ``chain_id``
+        """
+        connection = self.connect()
+        cursor = connection.cursor()
+        for table in [self.__tablename__, self.__rangestablename__]:
+            cursor.execute(
+                "DELETE FROM %s WHERE chain_id=?" % table, (chain_id,))
+        connection.commit()
+
+
+class TradeStore(DataDir):
+    """ This is a persistent store of the trades of markets (see
+        :class:`bitshares.tradehistory.TradeHistory`) in the `trades`
+        table of the SQLite3 database.
+
+        Trades are identified by their sequence number within the market,
+        so that storing a trade twice keeps a single copy. The time ranges
+        that have been obtained completely are stored in the
+        `trade_ranges` table, everything else is a gap (see
+        :func:`missing`). Queries by time and by account use indexes.
+    """
+    __tablename__ = "trades"
+    __rangestablename__ = "trade_ranges"
+
+    def exists_table(self):
+        """ Check if the database table exists
+        """
+        query = ("SELECT name FROM sqlite_master " +
+                 "WHERE type='table' AND name=?",
+                 (self.__tablename__, ))
+        connection = sqlite3.connect(self.sqlDataBaseFile)
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        return True if cursor.fetchone() else False
+
+    def create_table(self):
+        """ Create the new tables and indexes in the SQLite database
+        """
+        key = ('chain_id STRING(64),' +
+               'base STRING(32),' +
+               'quote STRING(32),')
+        connection = sqlite3.connect(self.sqlDataBaseFile)
+        cursor = connection.cursor()
+        cursor.execute(
+            'CREATE TABLE %s (' % self.__tablename__ + key +
+            'id STRING(64),' +
+            'time INTEGER,' +
+            'price REAL,' +
+            'amount REAL,' +
+            'value REAL,' +
+            'type STRING(4),' +
+            'account1 STRING(32),' +
+            'account2 STRING(32),' +
+            'PRIMARY KEY (chain_id, base, quote, id)' +
+            ')')
+        cursor.execute(
+            'CREATE INDEX %s_time ON %s ' % ((self.__tablename__,) * 2) +
+            '(chain_id, base, quote, time)')
+        for column in ["account1", "account2"]:
+            cursor.execute(
+                'CREATE INDEX %s_%s ON %s ' % (
+                    self.__tablename__, column, self.__tablename__) +
+                '(%s, time)' % column)
+        cursor.execute(
+            'CREATE TABLE IF NOT EXISTS %s (' % self.__rangestablename__ + key +
+            'start INTEGER,' +
+            'stop INTEGER' +
+            ')')
+        connection.commit()
+
+    def get(self, market, start, stop, account=None, limit=None):
+        """ Return the trades within ``[start, stop)`` as tuples ``(id,
+            time, price, amount, value, type, account1, account2)``,
+            newest first
+
+            :param tuple market: ``(chain_id, base id, quote id)``
+            :param int start: Timestamp
+            :param int stop: Timestamp
+            :param str account: Only trades of this account id
+            :param int limit: Maximum number of trades
+        """
+        sql = ("SELECT id, time, price, amount, value, type, account1, " +
+               "account2 FROM %s " % self.__tablename__ +
+               "WHERE chain_id=? AND base=? AND quote=? " +
+               "AND time>=? AND time<?")
+        args = tuple(market) + (start, stop)
+        if account:
+            sql += " AND (account1=? OR account2=?)"
+            args += (account, account)
+        sql += " ORDER BY time DESC, id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            args += (limit,)
+        connection = self.connect()
+        cursor = connection.cursor()
+        cursor.execute(sql, args)
+        return cursor.fetchall()
+
+    def ranges(self, market):
+        """ Return the time ranges ``(start, stop)`` that are covered
+
+            :param tuple market: ``(chain_id, base id, quote id)``
+        """
+        query = ("SELECT start, stop FROM %s " % self.__rangestablename__ +
+                 "WHERE chain_id=? AND base=? AND quote=? " +
+                 "ORDER BY start",
+                 tuple(market))
+        connection = self.connect()
+        cursor = connection.cursor()
+        cursor.execute(*query)
+        return cursor.fetchall()
+
+    def missing(self, market, start, stop):
+        """ Return the time ranges within ``[start, stop)`` that are not
+            covered yet (the gaps)
+        """
+        return _missing_ranges(self.ranges(market), start, stop)
+
+    def add(self, market, trades, start=None, stop=None):
+        """ Store trades and mark ``[start, stop)`` as covered
+
+            :param tuple market: ``(chain_id, base id, quote id)``
+            :param list trades: Tuples as returned by :func:`get`
+            :param int start: Timestamp (optional)
+            :param int stop: Timestamp (optional)
+        """
+        market = tuple(market)
+        connection = self.connect()
+        cursor = connection.cursor()
+        cursor.executemany(
+            'INSERT OR REPLACE INTO %s ' % self.__tablename__ +
+            '(chain_id, base, quote, id, time, price, amount, value, type, ' +
+            'account1, account2) ' +
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [market + tuple(t) for t in trades])
+        if start is not None and start < stop:
+            merged = _merge_ranges(self.ranges(market) + [(start, stop)])
+            cursor.execute(
+                'DELETE FROM %s ' % self.__rangestablename__ +
+                'WHERE chain_id=? AND base=? AND quote=?',
+                market)
+            cursor.executemany(
+                'INSERT INTO %s ' % self.__rangestablename__ +
+                '(chain_id, base, quote, start, stop) ' +
+                'VALUES (?, ?, ?, ?, ?)',
+                [market + tuple(r) for r in merged])
+        connection.commit()
+
+    def delete(self, chain_id):
+        """ Delete all trades of chain ``chain_id``
+        """
+        connection = self.connect()
+        cursor = connection.cursor()
+        for table in [self.__tablename__, self.__rangestablename__]:
+            cursor.execute(
+                "DELETE FROM %s WHERE chain_id=?" % table, (chain_id,))
+        connection.commit()
+
+
 class MasterPassword(object):
     """ The keys are encrypted with a Masterpassword that is stored in
         the configurationStore. It has a checksum to verify correctness
@@ -393,6 +908,7 @@ class MasterPassword(object):
     def decryptEncryptedMaster(self):
         """ Decrypt the encrypted masterpassword
         """
+        from .aes import AESCipher
         aes = AESCipher(self.password)
         checksum, encrypted_master = configStorage[self.config_key].split("$")
         try:
@@ -429,6 +945,7 @@ class MasterPassword(object):
         """
         if not self.decrypted_master:
             raise Exception("master not decrypted")
+        from .aes import AESCipher
         aes = AESCipher(self.password)
         return "{}${}".format(self.deriveChecksum(self.decrypted_master),
                               aes.encrypt(self.decrypted_master))
@@ -448,12 +965,6 @@ class MasterPassword(object):
 # Create keyStorage
 keyStorage = Key()
 configStorage = Configuration()
-
-# Create Tables if database is brand new
-if not configStorage.exists_table():
-    configStorage.create_table()
-
-newKeyStorage = False
-if not keyStorage.exists_table():
-    newKeyStorage = True
-    keyStorage.create_table()
+assetRegistry = AssetRegistry()
+candleStore = CandleStore()
+tradeStore = TradeStore()
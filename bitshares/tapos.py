@@ -0,0 +1,133 @@
+import struct
+import threading
+import time
+from binascii import unhexlify
+from bitsharesapi.websocket import BitSharesWebsocket
+from bitshares.instance import shared_bitshares_instance
+
+
+def block_params(block_num, block_id):
+    """ ``ref_block_num`` and ``ref_block_prefix`` of a block
+
+        :param int block_num: Number of the block
+        :param str block_id: Id of the block (hex)
+    """
+    ref_block_num = block_num & 0xFFFF
+    ref_block_prefix = struct.unpack_from("<I", unhexlify(block_id), 4)[0]
+    return ref_block_num, ref_block_prefix
+
+
+class TaposWebsocket(BitSharesWebsocket):
+    """ Websocket connection that reads the head block once it is
+        (re-)established
+    """
+    def __init__(self, provider, *args, **kwargs):
+        self.provider = provider
+        super(TaposWebsocket, self).__init__(*args, **kwargs)
+
+    def on_open(self, ws):
+        super(TaposWebsocket, self).on_open(ws)
+        self.provider.process_object(self.get_dynamic_global_properties())
+
+
+class TaposProvider(object):
+    """ Cached reference block (TaPoS) parameters for transactions
+
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+        :param int max_age: Seconds after which the reference block is
+            read again from the API server when a transaction is
+            constructed
+
+        Every transaction references a recent block by
+        ``ref_block_num`` and ``ref_block_prefix``. Instead of calling
+        ``get_dynamic_global_properties`` for every transaction, the
+        head block is cached and updated by notifications: either of
+        new blocks (:func:`start`) or of the dynamic global properties
+        ``2.1.0`` (see :class:`bitshares.coherence.CacheCoherence`).
+        The reference block merely has to be one of the last 65535
+        blocks, hence a few seconds old block is as good as the head
+        block. Only if no notification arrived for ``max_age`` seconds,
+        the API server is asked synchronously.
+
+        .. code-block:: python
+
+            from bitshares import BitShares
+            bitshares = BitShares(local_fees=True, cached_tapos=True)
+            bitshares.tapos.start()
+            # Neither fees nor the reference block require an API call
+            bitshares.transfer("init1", 1, "BTS", account="init0")
+    """
+    def __init__(self, bitshares_instance=None, max_age=60):
+        self.bitshares = bitshares_instance or shared_bitshares_instance()
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.thread = None
+        self.websocket = None
+        #: Number of the cached block
+        self.block_num = None
+        #: Time the cached block has been seen
+        self.updated = None
+        self.params = None
+
+    def update(self, block_num, block_id):
+        """ Use the block ``block_num`` with the id ``block_id``
+        """
+        params = block_params(block_num, block_id)
+        with self.lock:
+            # Notifications may arrive out of order
+            if self.block_num is not None and block_num < self.block_num:
+                return
+            self.block_num = block_num
+            self.params = params
+            self.updated = time.time()
+
+    def process_object(self, notice):
+        """ Apply a notification of the dynamic global properties
+            (``2.1.0``)
+        """
+        if "head_block_id" in notice:
+            self.update(int(notice["head_block_number"]), notice["head_block_id"])
+
+    def process_block(self, block_id):
+        """ Apply a notification of a new block (its id)
+        """
+        # The id of a block starts with its number
+        self.update(int(block_id[:8], 16), block_id)
+
+    def refresh(self):
+        """ Read the head block from the API server
+        """
+        self.process_object(self.bitshares.rpc.get_dynamic_global_properties())
+
+    def block_params(self):
+        """ ``ref_block_num`` and ``ref_block_prefix`` for a new
+            transaction
+        """
+        with self.lock:
+            fresh = (
+                self.params is not None and
+                time.time() - self.updated <= self.max_age)
+        if not fresh:
+            self.refresh()
+        return self.params
+
+    def start(self):
+        """ Follow new blocks in a background thread
+        """
+        self.websocket = TaposWebsocket(
+            self,
+            urls=self.bitshares.rpc.urls,
+            user=self.bitshares.rpc.user,
+            password=self.bitshares.rpc.password,
+            on_block=self.process_block,
+        )
+        self.thread = threading.Thread(target=self.websocket.run_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """ Stop following new blocks
+        """
+        if self.websocket and self.websocket.ws:
+            self.websocket.ws.keep_running = False
+            self.websocket.ws.close()
@@ -0,0 +1,210 @@
+import logging
+import time
+from bitshares.instance import shared_bitshares_instance
+from .utils import formatTime, timestamp
+log = logging.getLogger(__name__)
+
+
+def fetch_trades(rpc, base_id, quote_id, start, stop, limit=100):
+    """ Obtain all trades of a market within ``[start, stop)`` with paged
+        calls to ``get_trade_history``
+
+        :param rpc: RPC connection
+        :param str base_id: Id of the base asset
+        :param str quote_id: Id of the quote asset
+        :param int start: Timestamp
+        :param int stop: Timestamp
+        :param int limit: Trades per call (at most 100)
+        :returns: The trades as returned by the API, newest first
+    """
+    return _fetch_trades(rpc, base_id, quote_id, start, stop, limit)[0]
+
+
+def _fetch_trades(rpc, base_id, quote_id, start, stop, limit=100):
+    """ Same as :func:`fetch_trades`, but also returns the timestamp
+        down to which all trades have been obtained (``start`` unless
+        the API server does not number the trades and more than
+        ``limit`` trades share a second)
+    """
+    newest = int(stop)
+    seen = set()
+    trades = []
+    page = rpc.get_trade_history(
+        base_id, quote_id,
+        formatTime(float(newest)), formatTime(float(start)), limit)
+    while True:
+        for trade in page:
+            key = trade.get("sequence") or (
+                trade["date"], trade["price"], trade["amount"])
+            if key in seen:
+                continue
+            seen.add(key)
+            if start <= timestamp(trade["date"]) < stop:
+                trades.append(trade)
+        if len(page) < limit:
+            return trades, start
+        oldest = timestamp(page[-1]["date"])
+        if oldest < start:
+            return trades, start
+        sequences = [int(t["sequence"]) for t in page if t.get("sequence")]
+        if sequences:
+            # Continue right below the oldest trade, even if more trades
+            # share its second
+            page = rpc.get_trade_history_by_sequence(
+                base_id, quote_id, min(sequences) - 1,
+                formatTime(float(start)), limit)
+        elif oldest < newest:
+            # Trades of the oldest second are obtained again and
+            # deduplicated above
+            newest = oldest
+            page = rpc.get_trade_history(
+                base_id, quote_id,
+                formatTime(float(newest)), formatTime(float(start)), limit)
+        else:
+            log.warning(
+                "More than %d trades at %s cannot be obtained without "
+                "sequence numbers" % (limit, formatTime(float(oldest))))
+            return trades, oldest + 1
+
+
+class TradeHistory(object):
+    """ Trade history of a market that is kept on disk
+
+        :param bitshares.market.Market market: The market
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+        :param int margin: Seconds before now that are not considered
+            complete yet (trades of blocks that are not applied by the
+            API server yet)
+
+        Trades are obtained with ``get_trade_history`` and stored in the
+        SQLite database (see :class:`bitshares.storage.TradeStore`).
+        Every synchronization only obtains the periods that are not
+        covered yet, i.e. the time since the last synchronization and
+        any gaps in between. Queries are answered from the database.
+
+        Prices are denoted in ``base``/``quote``, ``amount`` in
+        ``quote`` and ``value`` in ``base``.
+
+        .. code-block:: python
+
+            from datetime import datetime, timedelta
+            from bitshares.market import Market
+            history = Market("USD:BTS").tradehistory()
+            history.backfill(datetime.utcnow() - timedelta(days=7))
+            history.sync()
+            trades = history.trades(account="1.2.100")
+    """
+    def __init__(self, market, bitshares_instance=None, margin=10):
+        self.bitshares = bitshares_instance or shared_bitshares_instance()
+        self.market = market
+        self.margin = margin
+        self.base_id = market["base"]["id"]
+        self.quote_id = market["quote"]["id"]
+
+    def _key(self):
+        return (
+            self.bitshares.rpc.chain_params["chain_id"],
+            self.base_id, self.quote_id)
+
+    @staticmethod
+    def _row(trade):
+        """ Turn a trade of ``get_trade_history`` into a row of
+            :class:`bitshares.storage.TradeStore`
+        """
+        if trade.get("sequence"):
+            id = str(trade["sequence"])
+        else:
+            # Old API servers do not number the trades
+            id = "%s/%s/%s" % (trade["date"], trade["price"], trade["amount"])
+        return (
+            id,
+            timestamp(trade["date"]),
+            float(trade["price"]),
+            float(trade["amount"]),
+            float(trade["value"]),
+            trade.get("type"),
+            trade.get("side1_account_id"),
+            trade.get("side2_account_id"),
+        )
+
+    def fetch(self, start, stop):
+        """ Obtain and store the trades of ``[start, stop)``
+
+            :param int start: Timestamp
+            :param int stop: Timestamp
+            :returns: Number of trades obtained
+        """
+        from .storage import tradeStore
+        trades, oldest = _fetch_trades(
+            self.bitshares.rpc, self.base_id, self.quote_id, start, stop)
+        complete = min(stop, int(time.time()) - self.margin)
+        # Only the range that has been obtained completely is covered
+        tradeStore.add(
+            self._key(), [self._row(t) for t in trades], oldest, complete)
+        return len(trades)
+
+    def gaps(self, start, stop=None):
+        """ Time ranges within ``[start, stop)`` that have not been
+            obtained yet
+
+            :param start: Start as ``datetime`` (UTC) or timestamp
+            :param stop: Stop as ``datetime`` (UTC) or timestamp
+                (defaults to now)
+        """
+        from .storage import tradeStore
+        stop = timestamp(stop) if stop is not None else int(time.time())
+        return tradeStore.missing(self._key(), timestamp(start), stop)
+
+    def backfill(self, start, stop=None):
+        """ Obtain all trades of ``[start, stop)`` that are not stored yet
+
+            :param start: Start as ``datetime`` (UTC) or timestamp
+            :param stop: Stop as ``datetime`` (UTC) or timestamp
+                (defaults to now)
+            :returns: Number of trades obtained
+        """
+        return sum(self.fetch(s, e) for s, e in self.gaps(start, stop))
+
+    def sync(self, start=None):
+        """ Obtain the trades since the last synchronization (and fill
+            any gaps before)
+
+            :param start: Start of the history as ``datetime`` (UTC) or
+                timestamp if nothing is stored yet (defaults to 24
+                hours ago)
+            :returns: Number of trades obtained
+        """
+        from .storage import tradeStore
+        ranges = tradeStore.ranges(self._key())
+        if ranges:
+            start = ranges[0][0]
+        elif start is None:
+            start = int(time.time()) - 24 * 60 * 60
+        return self.backfill(start)
+
+    def trades(self, start=None, stop=None, account=None, limit=None):
+        """ Stored trades within ``[start, stop)``, newest first
+
+            :param start: Start as ``datetime`` (UTC) or timestamp
+            :param stop: Stop as ``datetime`` (UTC) or timestamp
+            :param str account: Only trades of this account (id or name)
+            :param int limit: Maximum number of trades
+
+            Each trade is a dictionary with the keys ``id``,
+            ``datetime`` (timestamp), ``price``, ``amount``, ``value``,
+            ``type`` and the account ids of both sides ``account1`` and
+            ``account2`` (if the API server provides them).
+        """
+        from .storage import tradeStore
+        from .account import Account
+        start = timestamp(start) if start is not None else 0
+        stop = timestamp(stop) if stop is not None else 2 ** 62
+        if account and not str(account).startswith("1.2."):
+            account = Account(account, bitshares_instance=self.bitshares)["id"]
+        keys = [
+            "id", "datetime", "price", "amount", "value", "type",
+            "account1", "account2"]
+        return [
+            dict(zip(keys, row))
+            for row in tradeStore.get(self._key(), start, stop, account, limit)
+        ]
@@ -95,9 +95,16 @@ class TransactionBuilder(dict):
         else:
             ops = [Operation(o) for o in list(self.ops)]
 
-        ops = transactions.addRequiredFees(self.bitshares.rpc, ops)
+        # Fees may have been obtained already (e.g. for many operations
+        # at once)
+        if not all(self._has_fee(op) for op in ops):
+            ops = self._add_fees(ops)
         expiration = transactions.formatTimeFromNow(self.bitshares.expiration)
-        ref_block_num, ref_block_prefix = transactions.getBlockParams(self.bitshares.rpc)
+        tapos = getattr(self.bitshares, "tapos", None)
+        if tapos is not None:
+            ref_block_num, ref_block_prefix = tapos.block_params()
+        else:
+            ref_block_num, ref_block_prefix = transactions.getBlockParams(self.bitshares.rpc)
         tx = Signed_Transaction(
             ref_block_num=ref_block_num,
             ref_block_prefix=ref_block_prefix,
@@ -106,6 +113,24 @@ class TransactionBuilder(dict):
         )
         super(TransactionBuilder, self).__init__(tx.json())
 
+    def _add_fees(self, ops):
+        """ Set the fees of the operations, locally if the instance has
+            a fee schedule (see :class:`bitshares.fees.FeeSchedule`)
+        """
+        schedule = getattr(self.bitshares, "fee_schedule", None)
+        if schedule is not None:
+            try:
+                return schedule.set_fees(ops)
+            except NotImplementedError as e:
+                log.debug("Obtaining fees from the API server: %s" % str(e))
+        return transactions.addRequiredFees(self.bitshares.rpc, ops)
+
+    def _has_fee(self, op):
+        """ Is the fee of the operation set already?
+        """
+        fee = op.op.data.get("fee")
+        return fee is not None and int(fee.data["amount"].data) > 0
+
     def sign(self):
         """ Sign a provided transaction witht he provided key(s)
 
@@ -169,9 +194,11 @@ class TransactionBuilder(dict):
         except Exception as e:
             raise e
 
+        # Return the signed transaction and start from scratch
+        tx = TransactionBuilder(self.json(), bitshares_instance=self.bitshares)
         self.clear()
 
-        return self
+        return tx
 
     def clear(self):
         """ Clear the transaction builder and start from scratch
@@ -1,3 +1,4 @@
+import calendar
 import time
 from datetime import datetime
 
@@ -35,3 +36,14 @@ def parse_time(block_time):
     """Take a string representation of time from the blockchain, and parse it into datetime object.
     """
     return datetime.strptime(block_time, timeFormat)
+
+
+def timestamp(t):
+    """ Seconds since epoch for a datetime (UTC), a timestamp or a time
+        string as used on the blockchain
+    """
+    if isinstance(t, datetime):
+        return calendar.timegm(t.utctimetuple())
+    if isinstance(t, str):
+        return calendar.timegm(time.strptime(t, timeFormat))
+    return int(t)
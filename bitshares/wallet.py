@@ -1,9 +1,6 @@
 import logging
 import os
 
-from graphenebase import bip38
-from bitsharesbase.account import PrivateKey, GPHPrivateKey
-
 from .account import Account
 from .exceptions import (
     InvalidWifError,
@@ -60,13 +57,6 @@ class Wallet():
         # RPC
         Wallet.rpc = rpc
 
-        # Prefix?
-        if Wallet.rpc:
-            self.prefix = Wallet.rpc.chain_params["prefix"]
-        else:
-            # If not connected, load prefix from config
-            self.prefix = self.configStorage["prefix"]
-
         # Compatibility after name change from wif->keys
         if "wif" in kwargs and "keys" not in kwargs:
             kwargs["keys"] = kwargs["wif"]
@@ -82,10 +72,21 @@ class Wallet():
             self.MasterPassword = MasterPassword
             self.keyStorage = keyStorage
 
+    @property
+    def prefix(self):
+        """ The prefix of public keys on the network we are connected to
+        """
+        if Wallet.rpc:
+            return Wallet.rpc.chain_params["prefix"]
+        else:
+            # If not connected, load prefix from config
+            return self.configStorage["prefix"]
+
     def setKeys(self, loadkeys):
         """ This method is strictly only for in memory keys that are
             passed to Wallet/BitShares with the ``keys`` argument
         """
+        from bitsharesbase.account import PrivateKey
         log.debug("Force setting of private keys. Not using the wallet database!")
         if isinstance(loadkeys, dict):
             Wallet.keyMap = loadkeys
@@ -164,12 +165,16 @@ class Wallet():
     def encrypt_wif(self, wif):
         """ Encrypt a wif key
         """
+        from graphenebase import bip38
+        from bitsharesbase.account import PrivateKey
         assert not self.locked()
         return format(bip38.encrypt(PrivateKey(wif), self.masterpassword), "encwif")
 
     def decrypt_wif(self, encwif):
         """ decrypt a wif key
         """
+        from graphenebase import bip38
+        from bitsharesbase.account import PrivateKey
         try:
             # Try to decode as wif
             PrivateKey(encwif)
@@ -182,6 +187,7 @@ class Wallet():
     def addPrivateKey(self, wif):
         """ Add a private key to the wallet database
         """
+        from bitsharesbase.account import PrivateKey, GPHPrivateKey
         # it could be either graphenebase or bitsharesbase so we can't check the type directly
         if isinstance(wif, PrivateKey) or isinstance(wif, GPHPrivateKey):
             wif = str(wif)
@@ -280,6 +286,7 @@ class Wallet():
     def getAccountFromPrivateKey(self, wif):
         """ Obtain account name from private key
         """
+        from bitsharesbase.account import PrivateKey
         pub = format(PrivateKey(wif).pubkey, self.prefix)
         return self.getAccountFromPublicKey(pub)
 
@@ -1,5 +1,7 @@
+import re
 from bitshares.instance import shared_bitshares_instance
 from .account import Account
+from .objectcache import ObjectCache
 from .exceptions import WitnessDoesNotExistsException
 
 
@@ -10,7 +12,15 @@ class Witness(dict):
         :param bitshares bitshares_instance: BitShares() instance to use when accesing a RPC
         :param bool lazy: Use lazy loading
 
+        .. note:: Witnesses are cached by witness id, account id and
+                  account name in ``Witness.cache`` (see
+                  :class:`bitshares.objectcache.ObjectCache`) for a
+                  minute.
+
     """
+
+    cache = ObjectCache(max_size=1000, ttl=60)
+
     def __init__(
         self,
         witness,
@@ -22,16 +32,29 @@ class Witness(dict):
 
         self.bitshares = bitshares_instance or shared_bitshares_instance()
 
-        if not lazy:
+        cached = Witness.cache.get(self.witness)
+        if cached:
+            super(Witness, self).__init__(cached)
+            self.cached = True
+        elif not lazy:
             self.refresh()
 
     def refresh(self):
-        account = Account(self.witness)
-        witness = self.bitshares.rpc.get_witness_by_account(account["id"])
-        if not witness:
-            raise WitnessDoesNotExistsException
+        if re.match(r"^1\.6\.[0-9]*$", self.witness):
+            witness = self.bitshares.rpc.get_objects([self.witness])[0]
+            if not witness:
+                raise WitnessDoesNotExistsException
+            account = Account(witness["witness_account"])
+        else:
+            account = Account(self.witness)
+            witness = self.bitshares.rpc.get_witness_by_account(account["id"])
+            if not witness:
+                raise WitnessDoesNotExistsException
         super(Witness, self).__init__(witness)
         self.cached = True
+        Witness.cache.set(
+            witness["id"], witness,
+            aliases=[witness["witness_account"], account["name"]])
 
     def __getitem__(self, key):
         if not self.cached:
@@ -45,4 +68,124 @@ class Witness(dict):
 
     @property
     def account(self):
-        return Account(self.witness)
+        return Account(self["witness_account"])
+
+
+class Witnesses(list):
+    """ Obtain **all** witnesses of the chain with a few batched calls
+        (``lookup_witness_accounts`` and chunked ``get_witnesses``)
+
+        :param bitshares.bitshares.BitShares bitshares_instance: BitShares instance
+        :param int chunk_size: Number of objects to obtain per call
+
+        Instances of this class are lists of
+        :class:`bitshares.witness.Witness` that can additionally be
+        indexed by witness id, account id and account name:
+
+        .. code-block:: python
+
+            from bitshares.witness import Witnesses
+            witnesses = Witnesses()
+            witnesses["init0"]["total_missed"]
+            ranking = sorted(witnesses, key=lambda w: -int(w["total_votes"]))
+
+        Calling :func:`refresh` obtains the current votes, missed blocks,
+        etc. of all witnesses in a single round trip and updates the
+        instances in place. Changes pushed by the node (e.g. through
+        :class:`bitshares.notify.Notify` with ``objects=["1.6.x"]``) can
+        be applied with :func:`process_notice`.
+    """
+    #: Calls and fields that differ between witnesses and committee members
+    lookup_method = "lookup_witness_accounts"
+    objects_method = "get_witnesses"
+    account_field = "witness_account"
+    object_class = Witness
+
+    def __init__(self, bitshares_instance=None, chunk_size=100):
+        self.bitshares = bitshares_instance or shared_bitshares_instance()
+        self.chunk_size = chunk_size
+        # key -> instance for ids, account ids and account names
+        self.index = dict()
+        # object id -> account name
+        self.names = dict()
+        self.refresh()
+
+    def _lookup(self, results=None):
+        """ Obtain all account names and object ids. ``results`` is the
+            first page if it has already been obtained.
+        """
+        names = dict()
+        limit = 1000
+        lower = ""
+        while True:
+            if results is None:
+                results = getattr(self.bitshares.rpc, self.lookup_method)(lower, limit)
+            for name, id in results:
+                names[id] = name
+            if len(results) < limit:
+                return names
+            lower = results[-1][0]
+            results = None
+
+    def _fetch(self, ids):
+        """ Chunked calls to obtain the objects for ``ids``
+        """
+        return [
+            [self.objects_method, [ids[i:i + self.chunk_size]]]
+            for i in range(0, len(ids), self.chunk_size)
+        ]
+
+    def refresh(self):
+        """ Obtain the current state of all objects. Known objects are
+            obtained along with the list of names in the same round trip;
+            new objects take another one.
+        """
+        known = list(self.names.keys())
+        results = self.bitshares.rpc.batch(
+            [[self.lookup_method, ["", 1000]]] + self._fetch(known))
+        self.names = self._lookup(results[0])
+        objects = [o for r in results[1:] for o in r]
+
+        new = [id for id in self.names if id not in self.index]
+        for r in self.bitshares.rpc.batch(self._fetch(new)):
+            objects.extend(r)
+
+        for obj in objects:
+            if obj and obj["id"] in self.names:
+                self.process_notice(obj)
+
+        # Remove objects that are gone
+        for obj in [o for o in self if o["id"] not in self.names]:
+            self.remove(obj)
+            for key in [k for k, v in self.index.items() if v is obj]:
+                del self.index[key]
+
+    def process_notice(self, notice):
+        """ Update (or add) an object as pushed by the node
+        """
+        id = notice["id"]
+        if id in self.index:
+            obj = self.index[id]
+            obj.update(notice)
+        else:
+            obj = self.object_class(
+                id, lazy=True, bitshares_instance=self.bitshares)
+            dict.__init__(obj, notice)
+            obj.cached = True
+            self.append(obj)
+        name = self.names.get(id)
+        aliases = [notice[self.account_field], name]
+        self.object_class.cache.set(id, dict(obj), aliases=aliases)
+        for key in [id] + aliases:
+            if key:
+                self.index[key] = obj
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.index[key]
+        return super(Witnesses, self).__getitem__(key)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return key in self.index
+        return super(Witnesses, self).__contains__(key)
@@ -1,5 +1,7 @@
 __all__ = [
     "bitsharesnoderpc",
+    "codec",
+    "httprpc",
     "exceptions",
     "websocket",
 ]
@@ -6,9 +6,10 @@ import ssl
 import json
 import time
 from itertools import cycle
-from grapheneapi.graphenewsrpc import GrapheneWebsocketRPC
+from grapheneapi.graphenewsrpc import GrapheneWebsocketRPC, RPCError
 from bitsharesbase.chains import known_chains
 from . import exceptions
+from . import codec
 import logging
 log = logging.getLogger(__name__)
 
@@ -17,30 +18,170 @@ class NumRetriesReached(Exception):
     pass
 
 
+class ApiIds(dict):
+    """ Mapping of API names to the API ids obtained from the node.
+
+        Registering to an API requires a round trip. Instead of
+        registering to all APIs upon connection, we register to an API
+        the first time it is used.
+
+        :param BitSharesNodeRPC rpc: RPC connection
+        :param list apis: Names of the APIs that can be registered to
+    """
+    def __init__(self, rpc, apis):
+        super(ApiIds, self).__init__()
+        self.rpc = rpc
+        self.apis = apis
+
+    def __contains__(self, name):
+        return name in self.apis or super(ApiIds, self).__contains__(name)
+
+    def __missing__(self, name):
+        if name not in self.apis:
+            raise KeyError(name)
+        api_id = getattr(self.rpc, name)(api_id=1)
+        self[name] = api_id
+        return api_id
+
+
 class BitSharesNodeRPC(GrapheneWebsocketRPC):
+    """ This class allows to call API methods exposed by the witness node
 
-    def __init__(self, *args, **kwargs):
-        super(BitSharesNodeRPC, self).__init__(*args, **kwargs)
-        self.chain_params = self.get_network()
+        :param str urls: Either a single Websocket URL, or a list of URLs
+        :param str user: Username for Authentication
+        :param str password: Password for Authentication
+        :param bool autoconnect: Connect to the node right away. If
+            ``False``, the connection is established with the first call
+            (defaults to ``True``)
+        :param int num_retries: Try x times to num_retries to a node on
+            disconnect, -1 for indefinitely
+    """
+
+    #: APIs that we register to (upon first use)
+    apis = ["database", "history", "network_broadcast"]
+
+    def __init__(self, urls, user="", password="", autoconnect=True, **kwargs):
+        self.api_id = ApiIds(self, self.apis)
+        self._request_id = 0
+        if isinstance(urls, list):
+            self.nodes = urls
+        else:
+            self.nodes = [urls]
+        self.urls = cycle(self.nodes)
+        self.user = user
+        self.password = password
+        self.num_retries = kwargs.get("num_retries", -1)
+        self.ws = None
+        self._chain_params = None
+
+        if autoconnect:
+            self.connect()
+            self._chain_params = self.get_network()
+
+    def connect(self):
+        """ Connect to the node and log in
+        """
+        self.wsconnect()
+        self.register_apis()
+
+    def is_connected(self):
+        """ Has a connection to the node been established?
+        """
+        return self.ws is not None
+
+    @property
+    def chain_params(self):
+        """ Parameters of the network we are connected to (see
+            :func:`get_network`)
+        """
+        if not self._chain_params:
+            self._chain_params = self.get_network()
+        return self._chain_params
 
     def register_apis(self):
-        self.api_id["database"] = self.database(api_id=1)
-        self.api_id["history"] = self.history(api_id=1)
-        self.api_id["network_broadcast"] = self.network_broadcast(api_id=1)
+        """ Reset the API ids. We register again upon first use of an
+            API.
+        """
+        self.api_id = ApiIds(self, self.apis)
 
     def rpcexec(self, payload):
         """ Execute a call by sending the payload.
-            It makes use of the GrapheneRPC library.
             In here, we mostly deal with BitShares specific error handling
 
             :param json payload: Payload data
             :raises ValueError: if the server does not respond in proper JSON format
             :raises RPCError: if the server returns an error
         """
-        try:
-            # Forward call to GrapheneWebsocketRPC and catch+evaluate errors
-            return super(BitSharesNodeRPC, self).rpcexec(payload)
-        except exceptions.RPCError as e:
+        if not self.is_connected():
+            self.connect()
+        reply = self._transmit([payload])[0]
+        return self._result(reply)
+
+    def batch(self, calls, return_exceptions=False):
+        """ Execute many calls with a single round trip. Over websockets,
+            all requests are sent before the first reply is read, over
+            HTTP they are sent as a single JSON-RPC batch array.
+
+            :param list calls: List of calls, each being a list
+                ``[method, args]`` or ``[method, args, api]``
+            :param bool return_exceptions: Return the errors of calls
+                as exceptions in the list of results instead of raising
+                the first one
+            :returns: List of the results in the order of ``calls``
+            :raises RPCError: if the server returns an error for any of
+                the calls
+
+            .. code-block:: python
+
+                rpc.batch([
+                    ["get_block", [1]],
+                    ["get_objects", [["1.3.0", "2.0.0"]]],
+                    ["get_account_history", ["1.2.0", "1.11.0", 10, "1.11.0"], "history"],
+                ])
+        """
+        if not calls:
+            return []
+        if not self.is_connected():
+            self.connect()
+        payloads = [self._payload(*call) for call in calls]
+        replies = self._transmit(payloads)
+        if not return_exceptions:
+            return [self._result(reply) for reply in replies]
+        results = []
+        for reply in replies:
+            try:
+                results.append(self._result(reply))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _payload(self, name, args=[], api=None):
+        """ Construct the JSON-RPC request for calling ``name``
+        """
+        if api:
+            if api in self.api_id and self.api_id[api]:
+                api_id = self.api_id[api]
+            else:
+                raise ValueError(
+                    "Unknown API! "
+                    "Verify that you have registered to %s" % api
+                )
+        else:
+            api_id = 0
+        return {"method": "call",
+                "params": [api_id, name, list(args)],
+                "jsonrpc": "2.0",
+                "id": self.get_request_id()}
+
+    def _result(self, reply):
+        """ Obtain the result from a reply or raise the error the
+            server returned
+        """
+        if 'error' in reply:
+            if 'detail' in reply['error']:
+                e = RPCError(reply['error']['detail'])
+            else:
+                e = RPCError(reply['error']['message'])
             msg = exceptions.decodeRPCErrorMsg(e).strip()
             if msg == "missing required active authority":
                 raise exceptions.MissingRequiredActiveAuthority
@@ -50,8 +191,72 @@ class BitSharesNodeRPC(GrapheneWebsocketRPC):
                 raise exceptions.UnhandledRPCError(msg)
             else:
                 raise e
-        except Exception as e:
-            raise e
+        else:
+            return reply["result"]
+
+    def _sort_replies(self, payloads, replies):
+        """ Bring the replies into the order of the requests
+        """
+        if len(replies) != len(payloads):
+            raise ValueError("Expected %d replies, got %d" % (
+                len(payloads), len(replies)))
+        if len(replies) > 1:
+            replies_by_id = {r.get("id"): r for r in replies}
+            replies = [replies_by_id[p["id"]] for p in payloads]
+        return replies
+
+    def _transmit(self, payloads):
+        """ Send the payloads through the websocket and return the
+            decoded replies. Encoding and decoding is done through
+            :mod:`bitsharesapi.codec`.
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            for payload in payloads:
+                log.debug(json.dumps(payload))
+        data = [codec.dumps(payload) for payload in payloads]
+        cnt = 0
+        while True:
+            cnt += 1
+
+            try:
+                for d in data:
+                    self.ws.send(d)
+                replies = [self.ws.recv() for d in data]
+                break
+            except KeyboardInterrupt:
+                raise
+            except:
+                if (self.num_retries > -1 and
+                        cnt > self.num_retries):
+                    raise NumRetriesReached()
+                sleeptime = (cnt - 1) * 2 if cnt < 10 else 10
+                if sleeptime:
+                    log.warning(
+                        "Lost connection to node during rpcexec(): %s (%d/%d) "
+                        % (self.url, cnt, self.num_retries) +
+                        "Retrying in %d seconds" % sleeptime
+                    )
+                    time.sleep(sleeptime)
+
+                # retry
+                try:
+                    self.ws.close()
+                    time.sleep(sleeptime)
+                    self.wsconnect()
+                    self.register_apis()
+                except:
+                    pass
+
+        if log.isEnabledFor(logging.DEBUG):
+            for reply in replies:
+                log.debug(reply)
+
+        try:
+            replies = [codec.loads(reply) for reply in replies]
+        except ValueError:
+            raise ValueError("Client returned invalid format. Expected JSON!")
+
+        return self._sort_replies(payloads, replies)
 
     def get_account(self, name, **kwargs):
         """ Get full account details from account name or id
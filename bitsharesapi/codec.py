@@ -0,0 +1,108 @@
+""" JSON encoding and decoding for the RPC and websocket layers.
+
+    The fastest JSON library that is installed is used for encoding
+    requests and decoding replies. The standard library ``json`` module
+    is always available as a fallback. The backend can be changed at
+    runtime with :func:`use`:
+
+    .. code-block:: python
+
+        from bitsharesapi import codec
+        codec.use("json")
+        print(codec.backend)
+"""
+import json
+import logging
+log = logging.getLogger(__name__)
+
+#: Order in which the optional backends are tried
+preferred_backends = ["orjson", "ujson", "json"]
+
+#: Name of the backend currently in use
+backend = None
+
+_dumps = None
+_loads = None
+
+
+def _json_dumps(payload):
+    return json.dumps(payload, ensure_ascii=False).encode("utf8")
+
+
+def _json_loads(data):
+    return json.loads(data, strict=False)
+
+
+def _load_backend(name):
+    """ Return a ``(dumps, loads)`` pair for the backend ``name``
+
+        :raises ImportError: if the backend is not installed
+        :raises ValueError: if the backend is unknown
+    """
+    if name == "json":
+        return _json_dumps, _json_loads
+    elif name == "orjson":
+        import orjson
+        return orjson.dumps, orjson.loads
+    elif name == "ujson":
+        import ujson
+
+        def dumps(payload):
+            return ujson.dumps(payload, ensure_ascii=False).encode("utf8")
+        return dumps, ujson.loads
+    raise ValueError("Unknown JSON backend '%s'" % name)
+
+
+def use(name=None):
+    """ Select the JSON backend
+
+        :param str name: One of ``orjson``, ``ujson`` or ``json``. If not
+            provided, the first installed backend from
+            ``preferred_backends`` is used.
+        :raises ImportError: if the requested backend is not installed
+    """
+    global backend, _dumps, _loads
+    if name:
+        _dumps, _loads = _load_backend(name)
+        backend = name
+        return backend
+    for candidate in preferred_backends:
+        try:
+            _dumps, _loads = _load_backend(candidate)
+        except ImportError:
+            continue
+        backend = candidate
+        break
+    log.debug("Using JSON backend %s" % backend)
+    return backend
+
+
+def dumps(payload):
+    """ Serialize ``payload`` into UTF-8 encoded JSON
+
+        :param payload: Data to encode
+        :rtype: bytes
+    """
+    return _dumps(payload)
+
+
+def loads(data):
+    """ Deserialize JSON into Python objects
+
+        Replies from the nodes may contain unescaped control characters in
+        strings (e.g. in memos or asset descriptions). The fast backends
+        reject those, so we fall back to the (non-strict) standard library
+        decoder in this case.
+
+        :param data: JSON document as ``str`` or ``bytes``
+        :raises ValueError: if ``data`` is not valid JSON
+    """
+    try:
+        return _loads(data)
+    except ValueError:
+        if backend == "json":
+            raise
+        return _json_loads(data)
+
+
+use()
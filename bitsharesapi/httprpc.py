@@ -0,0 +1,161 @@
+import json
+import time
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from .bitsharesnoderpc import BitSharesNodeRPC, NumRetriesReached
+from . import codec
+log = logging.getLogger(__name__)
+
+
+class BitSharesHttpRPC(BitSharesNodeRPC):
+    """ This class allows to call API methods exposed by the witness node
+        through HTTP(S). It is a drop-in replacement for
+        :class:`bitsharesapi.bitsharesnoderpc.BitSharesNodeRPC` for nodes
+        that are only reachable through HTTP, e.g. behind a load
+        balancer.
+
+        :param str urls: Either a single HTTP(S) URL, or a list of URLs
+        :param str user: Username for HTTP Basic Authentication
+        :param str password: Password for HTTP Basic Authentication
+        :param bool autoconnect: Set up the connection pool right away
+            (defaults to ``True``)
+        :param int num_retries: Try x times to num_retries to a node on
+            disconnect or server errors (HTTP 5xx and 429), -1 for
+            indefinitely
+        :param int pool_size: Number of keep-alive connections to keep
+            open (defaults to ``10``)
+        :param int max_batch_size: Maximum number of calls to send in a
+            single POST request with :func:`batch` (defaults to ``50``)
+        :param int timeout: Timeout in seconds for each POST request
+            (defaults to ``60``)
+
+        Connections are kept alive and reused for consecutive calls.
+        Multiple calls can be sent as a JSON-RPC batch array in a single
+        POST request:
+
+        .. code-block:: python
+
+            from bitsharesapi.httprpc import BitSharesHttpRPC
+            rpc = BitSharesHttpRPC("https://node.bitshares.eu")
+            blocks = rpc.batch([["get_block", [i]] for i in range(1, 100)])
+
+        .. note:: HTTP is stateless. Hence, APIs are addressed by name
+                  instead of by the ids obtained from registering and
+                  subscriptions (see :mod:`bitsharesapi.websocket`) are
+                  not available.
+    """
+
+    def __init__(self, urls, user="", password="", autoconnect=True, **kwargs):
+        self.session = None
+        self.pool_size = kwargs.get("pool_size", 10)
+        self.max_batch_size = kwargs.get("max_batch_size", 50)
+        self.timeout = kwargs.get("timeout", 60)
+        super(BitSharesHttpRPC, self).__init__(
+            urls, user, password, autoconnect=autoconnect, **kwargs)
+
+    def connect(self):
+        """ Set up the pool of keep-alive connections to the node
+        """
+        self.url = next(self.urls)
+        log.debug("Using node %s" % self.url)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"content-type": "application/json"})
+        if self.user:
+            self.session.auth = (self.user, self.password)
+        self.register_apis()
+
+    def is_connected(self):
+        """ Has the connection pool been set up?
+        """
+        return self.session is not None
+
+    def register_apis(self):
+        """ Over HTTP, APIs are addressed by their name
+        """
+        self.api_id = {api: api for api in self.apis}
+
+    def _post(self, body):
+        """ Send ``body`` in a POST request and return the decoded
+            reply. In case of connection errors and server errors (HTTP
+            5xx and 429 without a JSON-RPC reply), we retry with the next
+            node. Other HTTP errors without a JSON-RPC reply are raised
+            as :class:`requests.exceptions.HTTPError`.
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(json.dumps(body))
+        data = codec.dumps(body)
+        cnt = 0
+        while True:
+            cnt += 1
+            try:
+                reply = self.session.post(
+                    self.url, data=data, timeout=self.timeout)
+                decoded = self._decode(reply)
+                if decoded is None and (
+                    reply.status_code >= 500 or reply.status_code == 429
+                ):
+                    # The node (or a proxy in front of it) failed
+                    reply.raise_for_status()
+                break
+            except KeyboardInterrupt:
+                raise
+            except requests.exceptions.RequestException as e:
+                if (self.num_retries > -1 and
+                        cnt > self.num_retries):
+                    raise NumRetriesReached()
+                sleeptime = (cnt - 1) * 2 if cnt < 10 else 10
+                if sleeptime:
+                    log.warning(
+                        "Error from node during rpcexec(): %s (%d/%d) %s. "
+                        % (self.url, cnt, self.num_retries, str(e)) +
+                        "Retrying in %d seconds" % sleeptime
+                    )
+                    time.sleep(sleeptime)
+                self.url = next(self.urls)
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(reply.text)
+
+        if decoded is None:
+            reply.raise_for_status()
+            raise ValueError("Client returned invalid format. Expected JSON!")
+        return decoded
+
+    def _decode(self, reply):
+        """ The decoded reply or ``None`` if it is not JSON or, for HTTP
+            errors, not a JSON-RPC reply
+        """
+        try:
+            decoded = codec.loads(reply.content)
+        except ValueError:
+            return None
+        if reply.ok or isinstance(decoded, list) or (
+            isinstance(decoded, dict) and
+            ("result" in decoded or "error" in decoded)
+        ):
+            return decoded
+        return None
+
+    def _transmit(self, payloads):
+        """ Send the payloads and return the decoded replies. Multiple
+            payloads are sent as JSON-RPC batch arrays of at most
+            ``max_batch_size`` calls.
+        """
+        if len(payloads) == 1:
+            return [self._post(payloads[0])]
+        replies = []
+        for i in range(0, len(payloads), self.max_batch_size):
+            reply = self._post(payloads[i:i + self.max_batch_size])
+            if not isinstance(reply, list):
+                # The server rejected the batch as a whole
+                self._result(reply)
+                raise ValueError("Server did not answer with a batch array")
+            replies.extend(reply)
+        return self._sort_replies(payloads, replies)
@@ -6,6 +6,7 @@ import logging
 from itertools import cycle
 from threading import Thread
 from .exceptions import NumRetriesReached
+from . import codec
 from events import Events
 import websocket
 
@@ -31,6 +32,7 @@ class BitSharesWebsocket(Events):
         * ``on_block``
         * ``on_account``
         * ``on_market``
+        * ``on_removed``
 
         which will be called accordingly with the notification
         message received from the BitShares node:
@@ -87,6 +89,14 @@ class BitSharesWebsocket(Events):
 
                 ['1.7.68612']
 
+        * ``on_removed`` (the id of a removed object that would have been
+          passed to ``on_object`` or ``on_account``, only if a slot is
+          registered):
+
+            .. code-block:: js
+
+                '1.7.68612'
+
     """
     __events__ = [
         'on_tx',
@@ -94,6 +104,7 @@ class BitSharesWebsocket(Events):
         'on_block',
         'on_account',
         'on_market',
+        'on_removed',
     ]
 
     def __init__(
@@ -110,6 +121,7 @@ class BitSharesWebsocket(Events):
         on_block=None,
         on_account=None,
         on_market=None,
+        on_removed=None,
         keep_alive=25,
         num_retries=-1,
         **kwargs
@@ -148,6 +160,8 @@ class BitSharesWebsocket(Events):
             self.on_account += on_account
         if on_market:
             self.on_market += on_market
+        if on_removed:
+            self.on_removed += on_removed
 
     def on_open(self, ws):
         """ This method will be called once the websocket connection is
@@ -220,6 +234,20 @@ class BitSharesWebsocket(Events):
             # Treat account updates separately
             self.on_account(notice)
 
+    def process_removed(self, id):
+        """ This method is called with the ids of removed objects. Here,
+            we call the ``on_removed`` slots for the objects that we
+            are subscribed to.
+        """
+        _a, _b, _ = id.split(".")
+
+        if (
+            id in self.subscription_objects or
+            ".".join([_a, _b, "x"]) in self.subscription_objects or
+            id[:4] == "2.6."
+        ):
+            self.on_removed(id)
+
     def on_message(self, ws, reply, *args):
         """ This method is called by the websocket connection on every
             message that is received. If we receive a ``notice``, we
@@ -228,7 +256,7 @@ class BitSharesWebsocket(Events):
         """
         data = {}
         try:
-            data = json.loads(reply, strict=False)
+            data = codec.loads(reply)
         except ValueError:
             raise ValueError("Client returned invalid format. Expected JSON!")
 
@@ -249,7 +277,11 @@ class BitSharesWebsocket(Events):
                         self.process_notice(notice)
                     else:
                         for obj in notice:
-                            if "id" in obj:
+                            if isinstance(obj, str):
+                                # The object has been removed
+                                if len(self.on_removed):
+                                    self.process_removed(obj)
+                            elif "id" in obj:
                                 self.process_notice(obj)
             else:
                 callbackname = self.__events__[id]
@@ -319,8 +351,9 @@ class BitSharesWebsocket(Events):
             :raises ValueError: if the server does not respond in proper JSON format
             :raises RPCError: if the server returns an error
         """
-        log.debug(json.dumps(payload))
-        self.ws.send(json.dumps(payload, ensure_ascii=False).encode('utf8'))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(json.dumps(payload))
+        self.ws.send(codec.dumps(payload))
 
     def __getattr__(self, name):
         """ Map all methods to RPC calls and pass through the arguments
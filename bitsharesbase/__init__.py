@@ -8,5 +8,6 @@ __all__ = [
     'operationids',
     'operations',
     'signedtransactions',
+    'signers',
     'transactions',
 ]
@@ -1,4 +1,6 @@
 from graphenebase.signedtransactions import Signed_Transaction as GrapheneSigned_Transaction
+from graphenebase.types import Array, Signature
+from . import signers
 from .operations import Operation
 from .chains import known_chains
 import logging
@@ -18,7 +20,27 @@ class Signed_Transaction(GrapheneSigned_Transaction):
         super(Signed_Transaction, self).__init__(*args, **kwargs)
 
     def sign(self, wifkeys, chain="BTS"):
-        return super(Signed_Transaction, self).sign(wifkeys, chain)
+        """ Sign the transaction with the provided private keys (see
+            :mod:`bitsharesbase.signers` for the backends)
+
+            :param array wifkeys: Array of wif keys
+            :param str chain: identifier for the chain
+        """
+        if signers.backend == "graphene":
+            return super(Signed_Transaction, self).sign(wifkeys, chain)
+        if not chain:
+            raise Exception("Chain needs to be provided!")
+        self.deriveDigest(chain)
+
+        # Get Unique private keys
+        self.privkeys = []
+        [self.privkeys.append(item) for item in wifkeys if item not in self.privkeys]
+
+        self.data["signatures"] = Array([
+            Signature(signers.sign_digest(self.digest, signers.decode_wif(wif)))
+            for wif in self.privkeys
+        ])
+        return self
 
     def verify(self, pubkeys=[], chain="BTS"):
         return super(Signed_Transaction, self).verify(pubkeys, chain)
@@ -0,0 +1,259 @@
+""" ECDSA signing of transaction digests.
+
+    Signatures are deterministic (RFC6979 nonces as in libsecp256k1),
+    have a low ``s`` and are *canonical* as required by Graphene. If the
+    first nonce results in a signature that is not canonical, the
+    attempt number is passed to the nonce function as extra data (32
+    bytes, little endian) until one is. Hence, all backends produce
+    the same signatures:
+
+    * ``coincurve``: libsecp256k1 through the `coincurve` package
+    * ``secp256k1``: libsecp256k1 through the `secp256k1` package
+    * ``python``: pure Python, always available
+    * ``graphene``: the (randomized) implementation of `graphenelib`
+
+    The first installed backend of ``preferred_backends`` is used. The
+    backend can be changed at runtime with :func:`use`:
+
+    .. code-block:: python
+
+        from bitsharesbase import signers
+        signers.use("python")
+        print(signers.backend)
+"""
+import hashlib
+import hmac
+import logging
+import struct
+from graphenebase.base58 import Base58
+log = logging.getLogger(__name__)
+
+#: Order in which the backends are tried
+preferred_backends = ["coincurve", "secp256k1", "python"]
+
+#: Name of the backend currently in use
+backend = None
+
+_sign = None
+
+# secp256k1
+P = 2 ** 256 - 2 ** 32 - 977
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+G = (
+    0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+    0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+)
+
+# Multiples j * 16^i * G for the fixed base multiplication
+_table = None
+
+
+def _double(X1, Y1, Z1):
+    if not Y1:
+        return 0, 1, 0
+    YY = Y1 * Y1 % P
+    S = 4 * X1 * YY % P
+    M = 3 * X1 * X1 % P
+    X3 = (M * M - 2 * S) % P
+    Y3 = (M * (S - X3) - 8 * YY * YY) % P
+    Z3 = 2 * Y1 * Z1 % P
+    return X3, Y3, Z3
+
+
+def _add(X1, Y1, Z1, x2, y2):
+    """ Add the affine point ``(x2, y2)`` to a point in Jacobian
+        coordinates
+    """
+    if not Z1:
+        return x2, y2, 1
+    Z1Z1 = Z1 * Z1 % P
+    H = (x2 * Z1Z1 - X1) % P
+    r = (y2 * Z1 * Z1Z1 - Y1) % P
+    if not H:
+        if not r:
+            return _double(X1, Y1, Z1)
+        return 0, 1, 0
+    HH = H * H % P
+    HHH = H * HH % P
+    V = X1 * HH % P
+    X3 = (r * r - HHH - 2 * V) % P
+    Y3 = (r * (V - X3) - Y1 * HHH) % P
+    Z3 = Z1 * H % P
+    return X3, Y3, Z3
+
+
+def _affine(X, Y, Z):
+    zinv = pow(Z, P - 2, P)
+    zinv2 = zinv * zinv % P
+    return X * zinv2 % P, Y * zinv2 * zinv % P
+
+
+def _multiply_g(k):
+    """ ``k * G`` in affine coordinates
+    """
+    global _table
+    if _table is None:
+        table = []
+        base = G
+        for i in range(64):
+            row = [None]
+            point = (0, 1, 0)
+            for j in range(1, 16):
+                point = _add(*(point + base))
+                row.append(_affine(*point))
+            table.append(row)
+            base = _affine(*_add(*(point + base)))
+        _table = table
+    point = (0, 1, 0)
+    for row in _table:
+        digit = k & 15
+        if digit:
+            point = _add(*(point + row[digit]))
+        k >>= 4
+    return _affine(*point)
+
+
+def _nonces(secret, digest, ndata=None):
+    """ RFC6979 nonce candidates (HMAC-SHA256 DRBG as in libsecp256k1)
+    """
+    def mac(key, data):
+        return hmac.new(key, data, hashlib.sha256).digest()
+    msg = (int.from_bytes(digest, "big") % N).to_bytes(32, "big")
+    data = secret + msg + (ndata or b"")
+    V = b"\x01" * 32
+    K = mac(b"\x00" * 32, V + b"\x00" + data)
+    V = mac(K, V)
+    K = mac(K, V + b"\x01" + data)
+    V = mac(K, V)
+    while True:
+        V = mac(K, V)
+        yield V
+        K = mac(K, V + b"\x00")
+        V = mac(K, V)
+
+
+def _python_sign(digest, secret, ndata=None):
+    d = int.from_bytes(secret, "big")
+    if not 0 < d < N:
+        raise ValueError("Invalid private key")
+    e = int.from_bytes(digest, "big") % N
+    for nonce in _nonces(secret, digest, ndata):
+        k = int.from_bytes(nonce, "big")
+        if not 0 < k < N:
+            continue
+        x, y = _multiply_g(k)
+        r = x % N
+        if not r:
+            continue
+        s = pow(k, N - 2, N) * (e + r * d) % N
+        if not s:
+            continue
+        recid = (y & 1) | (2 if x >= N else 0)
+        if s > N // 2:
+            s = N - s
+            recid ^= 1
+        return r.to_bytes(32, "big") + s.to_bytes(32, "big"), recid
+
+
+def _libsecp256k1_sign(ffi, lib, ctx):
+    """ Signing through the ``cffi`` bindings of libsecp256k1
+    """
+    def sign(digest, secret, ndata=None):
+        sig = ffi.new("secp256k1_ecdsa_recoverable_signature *")
+        if not lib.secp256k1_ecdsa_sign_recoverable(
+            ctx, sig, digest, secret, ffi.NULL,
+            ffi.new("unsigned char[32]", ndata) if ndata else ffi.NULL
+        ):
+            raise ValueError("Invalid private key")
+        output = ffi.new("unsigned char[64]")
+        recid = ffi.new("int *")
+        lib.secp256k1_ecdsa_recoverable_signature_serialize_compact(
+            ctx, output, recid, sig)
+        return bytes(ffi.buffer(output, 64)), recid[0]
+    return sign
+
+
+def _load_backend(name):
+    """ Return the function that signs a digest with the backend
+        ``name`` (``None`` for ``graphene``)
+
+        :raises ImportError: if the backend is not installed
+        :raises ValueError: if the backend is unknown
+    """
+    if name == "python":
+        return _python_sign
+    elif name == "coincurve":
+        from coincurve._libsecp256k1 import ffi, lib
+        from coincurve.context import GLOBAL_CONTEXT
+        return _libsecp256k1_sign(ffi, lib, GLOBAL_CONTEXT.ctx)
+    elif name == "secp256k1":
+        import secp256k1
+        ctx = secp256k1.lib.secp256k1_context_create(secp256k1.ALL_FLAGS)
+        return _libsecp256k1_sign(secp256k1.ffi, secp256k1.lib, ctx)
+    elif name == "graphene":
+        return None
+    raise ValueError("Unknown signing backend '%s'" % name)
+
+
+def use(name=None):
+    """ Select the signing backend
+
+        :param str name: One of ``coincurve``, ``secp256k1``,
+            ``python`` or ``graphene``. If not provided, the first
+            installed backend from ``preferred_backends`` is used.
+        :raises ImportError: if the requested backend is not installed
+    """
+    global backend, _sign
+    if name:
+        _sign = _load_backend(name)
+        backend = name
+        return backend
+    for candidate in preferred_backends:
+        try:
+            _sign = _load_backend(candidate)
+        except ImportError:
+            continue
+        backend = candidate
+        break
+    log.debug("Using signing backend %s" % backend)
+    return backend
+
+
+def is_canonical(sig):
+    """ Is the signature ``r || s`` canonical, i.e. are ``r`` and ``s``
+        32 bytes long in DER encoding?
+    """
+    return (not (sig[0] & 0x80) and
+            not (sig[0] == 0 and not (sig[1] & 0x80)) and
+            not (sig[32] & 0x80) and
+            not (sig[32] == 0 and not (sig[33] & 0x80)))
+
+
+def decode_wif(wif):
+    """ The raw private key of ``wif``
+
+        Unlike :class:`bitsharesbase.account.PrivateKey`, the public key
+        is not derived.
+    """
+    return bytes(Base58(wif))
+
+
+def sign_digest(digest, secret):
+    """ Canonical compact signature of a digest
+
+        :param bytes digest: SHA256 digest (32 bytes)
+        :param bytes secret: Raw private key (32 bytes)
+        :returns: 65 bytes, the recovery parameter (plus 31) followed
+            by ``r`` and ``s``
+    """
+    attempt = 0
+    while True:
+        ndata = struct.pack("<I", attempt) + b"\x00" * 28 if attempt else None
+        sig, recid = _sign(digest, secret, ndata)
+        if is_canonical(sig):
+            # compressed (4) and compact (27)
+            return struct.pack("<B", recid + 4 + 27) + sig
+        attempt += 1
+
+
+use()
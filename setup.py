@@ -43,6 +43,7 @@ setup(
     install_requires=[
         "graphenelib==0.5.0",
         "websockets==2.0",
+        "requests",
         "appdirs",
         "Events==0.2.2",
     ],
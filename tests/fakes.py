@@ -0,0 +1,160 @@
+""" Fakes of :class:`bitshares.bitshares.BitShares` and its API
+    connection that are shared by the tests
+"""
+from bitsharesbase import operations
+from bitsharesbase.account import PrivateKey
+
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+pub = format(PrivateKey(wif).pubkey, "BTS")
+chain_id = "4018d7844c78f6a6c41c6a552b898022310fc5dec06da467ee7905a8dad512c8"
+block_id = "000003e8b1c7a9a5ab8ed2b3a1f6f1d2e1b2c3d4"
+
+
+def asset(i, symbol, precision=5, bitasset=False):
+    """ An asset object as returned by the API server
+    """
+    a = {
+        "id": "1.3.%d" % i,
+        "symbol": symbol,
+        "precision": precision,
+        "issuer": "1.2.0",
+        "options": {
+            "flags": 0, "issuer_permissions": 0, "description": "",
+            "core_exchange_rate": {
+                "base": {"amount": 1, "asset_id": "1.3.%d" % i},
+                "quote": {"amount": 1, "asset_id": "1.3.0"}}},
+        "dynamic_asset_data_id": "2.3.%d" % i,
+    }
+    if bitasset:
+        a["bitasset_data_id"] = "2.4.%d" % i
+    return a
+
+
+def global_properties(scale=10000, transfer_fee=20000, maximum_transaction_size=2048):
+    """ The global properties (``2.0.0``) with a fee schedule
+    """
+    return {
+        "id": "2.0.0",
+        "parameters": {
+            "maximum_transaction_size": maximum_transaction_size,
+            "current_fees": {
+                "scale": scale,
+                "parameters": [
+                    [0, {"fee": transfer_fee, "price_per_kbyte": 102400}],
+                    [1, {"fee": 500}],
+                    [5, {"basic_fee": 5000, "premium_fee": 200000, "price_per_kbyte": 1024}],
+                    [22, {"fee": 2000, "price_per_kbyte": 10240}],
+                ],
+            },
+        },
+    }
+
+
+def transfer(amount=1, message=None):
+    """ A transfer from ``1.2.100`` to ``1.2.101``
+    """
+    data = {
+        "fee": {"amount": 0, "asset_id": "1.3.0"},
+        "from": "1.2.100",
+        "to": "1.2.101",
+        "amount": {"amount": amount, "asset_id": "1.3.0"},
+        "prefix": "BTS",
+    }
+    if message:
+        data["memo"] = {"from": pub, "to": pub, "nonce": 1, "message": message}
+    return operations.Transfer(**data)
+
+
+class FakeRPC(object):
+    """ API connection without any API methods, the tests add the
+        methods they need
+
+        ``calls`` is for the tests to record the calls they are
+        interested in, ``batches`` holds the methods of every batch
+        (i.e. round trip).
+    """
+    urls = ["wss://localhost"]
+    user = ""
+    password = ""
+    chain_params = {"chain_id": chain_id, "prefix": "BTS", "core_symbol": "BTS"}
+
+    def __init__(self):
+        self.calls = []
+        self.batches = []
+
+    @property
+    def round_trips(self):
+        return len(self.batches)
+
+    def batch(self, calls, return_exceptions=False):
+        if not calls:
+            return []
+        self.batches.append([call[0] for call in calls])
+        results = []
+        for call in calls:
+            try:
+                results.append(getattr(self, call[0])(*call[1]))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+
+class NodeRPC(FakeRPC):
+    """ Knows the fees and the head block and keeps the broadcast
+        transactions
+    """
+    def __init__(self, maximum_transaction_size=2048):
+        super(NodeRPC, self).__init__()
+        self.properties = global_properties(
+            maximum_transaction_size=maximum_transaction_size)
+        self.broadcast = []
+
+    def batch(self, calls, return_exceptions=False):
+        self.calls.append("batch")
+        return super(NodeRPC, self).batch(calls, return_exceptions)
+
+    def get_objects(self, ids):
+        self.calls.append("get_objects")
+        return [self.properties]
+
+    def get_global_properties(self):
+        return self.properties
+
+    def get_required_fees(self, ops, asset_id):
+        self.calls.append("get_required_fees")
+        return [{"amount": 500, "asset_id": asset_id} for op in ops]
+
+    def get_dynamic_global_properties(self):
+        self.calls.append("get_dynamic_global_properties")
+        return {
+            "head_block_number": 1000,
+            "head_block_id": block_id,
+            "time": "2000-01-01T00:00:00"}
+
+    def broadcast_transaction(self, tx, api=None):
+        self.broadcast.append(tx)
+
+
+class FakeWallet(object):
+    def getPrivateKeyForPublicKey(self, pub):
+        return wif
+
+
+class FakeBitShares(object):
+    """ Just enough of :class:`bitshares.bitshares.BitShares`
+
+        :param FakeRPC rpc: API connection (defaults to a
+            :class:`FakeRPC`)
+    """
+    proposer = None
+    unsigned = False
+    bundle = False
+    nobroadcast = False
+    expiration = 30
+
+    def __init__(self, rpc=None):
+        self.rpc = rpc if rpc is not None else FakeRPC()
+        self.wallet = FakeWallet()
+        self.config = {}
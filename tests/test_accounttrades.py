@@ -0,0 +1,136 @@
+import unittest
+from datetime import datetime
+from bitshares.asset import Asset
+from bitshares.accounttrades import AccountTrades, scan
+from bitsharesapi.exceptions import NoMethodWithName
+from fakes import FakeBitShares, FakeRPC, asset
+
+market = {
+    "base": {"id": "1.3.0", "symbol": "BTS", "precision": 5},
+    "quote": {"id": "1.3.121", "symbol": "USD", "precision": 4},
+}
+
+
+def entry(number, op_id=4, quote="1.3.121"):
+    if op_id != 4:
+        return {"id": "1.11.%d" % number, "op": [op_id, {}], "block_num": number}
+    return {
+        "id": "1.11.%d" % number,
+        "block_num": number,
+        "op": [4, {
+            "order_id": "1.7.1",
+            "account_id": "1.2.100",
+            "pays": {"amount": 30000000, "asset_id": "1.3.0"},
+            "receives": {"amount": 10000, "asset_id": quote},
+        }],
+    }
+
+
+class HistoryRPC(FakeRPC):
+    """ An account history with a fill of the market every third entry
+    """
+    def __init__(self, operations_api=True):
+        super(HistoryRPC, self).__init__()
+        self.operations_api = operations_api
+        self.history = []
+        for i in range(1000, 0, -1):
+            if i % 3 == 0:
+                self.history.append(entry(i, quote="1.3.121" if i % 2 else "1.3.1"))
+            else:
+                self.history.append(entry(i, op_id=0))
+
+    def _page(self, start, stop, limit, only=None):
+        start = int(start.split(".")[2]) or 2 ** 62
+        stop = int(stop.split(".")[2])
+        return [
+            e for e in self.history
+            if stop < int(e["id"].split(".")[2]) <= start and
+            (only is None or e["op"][0] == only)
+        ][:limit]
+
+    def batch(self, calls, return_exceptions=False):
+        if not self.operations_api and calls[0][0] == "get_account_history_operations":
+            self.batches.append([c[0] for c in calls])
+            raise NoMethodWithName("no method with name 'get_account_history_operations'")
+        return super(HistoryRPC, self).batch(calls, return_exceptions)
+
+    def get_account_history_operations(self, account, op, start, stop, limit):
+        return self._page(start, stop, limit, only=op)
+
+    def get_account_history(self, account, stop, limit, start):
+        return self._page(start, stop, limit)
+
+    def get_block_header(self, block_num):
+        # Three seconds per block
+        return {"timestamp": "2018-01-01T00:%02d:%02d" % divmod(3 * block_num, 60)}
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        Asset.use_registry = False
+        for i, symbol, precision in [(0, "BTS", 5), (121, "USD", 4), (1, "CNY", 4)]:
+            Asset.cache.set(
+                "1.3.%d" % i, asset(i, symbol, precision), aliases=[symbol])
+
+    def tearDown(self):
+        Asset.cache.clear()
+        Asset.use_registry = True
+
+    def test_pages(self):
+        bitshares = FakeBitShares(HistoryRPC())
+        trades = list(AccountTrades("1.2.100", market, bitshares_instance=bitshares))
+        # Fills of 1.3.121 on odd multiples of three
+        self.assertEqual(len(trades), 167)
+        self.assertEqual(trades[0]["block_num"], 999)
+        self.assertEqual(trades[0]["type"], "buy")
+        self.assertEqual(trades[0]["price"], 300.0)
+        self.assertEqual(trades[0]["time"], datetime(2018, 1, 1, 0, 49, 57))
+        # 334 fills in pages of 100, the block times of each page in
+        # another round trip
+        self.assertEqual(len(bitshares.rpc.batches), 8)
+        self.assertEqual(set(bitshares.rpc.batches[1]), set(["get_block_header"]))
+        self.assertEqual(len(bitshares.rpc.batches[1]), 50)
+
+    def test_resume(self):
+        bitshares = FakeBitShares(HistoryRPC())
+        scanner = AccountTrades("1.2.100", market, bitshares_instance=bitshares)
+        first = scanner.next_page()
+        self.assertFalse(scanner.done)
+        rest = list(AccountTrades(
+            "1.2.100", market, bitshares_instance=bitshares, cursor=scanner.cursor))
+        self.assertEqual(len(first) + len(rest), 167)
+
+        # Only the entries since the newest one
+        bitshares.rpc.history.insert(0, entry(1005))
+        new = list(AccountTrades(
+            "1.2.100", market, bitshares_instance=bitshares, stop=scanner.newest))
+        self.assertEqual([t["block_num"] for t in new], [1005])
+
+    def test_fallback(self):
+        bitshares = FakeBitShares(HistoryRPC(operations_api=False))
+        trades = list(AccountTrades(
+            "1.2.100", market, bitshares_instance=bitshares, page_size=100))
+        self.assertEqual(len(trades), 167)
+        self.assertEqual(bitshares.rpc.batches[0], ["get_account_history_operations"])
+        self.assertEqual(set(bitshares.rpc.batches[1]), set(["get_account_history"]))
+
+    def test_scan(self):
+        bitshares = FakeBitShares(HistoryRPC())
+        scanners = [
+            AccountTrades("1.2.100", market, bitshares_instance=bitshares),
+            AccountTrades("1.2.100", {
+                "base": market["base"], "quote": {"id": "1.3.1"}}, bitshares_instance=bitshares),
+        ]
+        trades = dict((s, []) for s in scanners)
+        while not all(s.done for s in scanners):
+            for s, page in scan(scanners).items():
+                trades[s].extend(page)
+        self.assertEqual([len(trades[s]) for s in scanners], [167, 166])
+        self.assertEqual(len(bitshares.rpc.batches), 8)
+        self.assertEqual(len(bitshares.rpc.batches[0]), 2)
+        self.assertTrue(all("time" in t for s in scanners for t in trades[s]))
+
+
+if __name__ == '__main__':
+    unittest.main()
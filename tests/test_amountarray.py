@@ -0,0 +1,95 @@
+import unittest
+from bitshares.asset import Asset
+from bitshares.compactamount import AssetInfo
+from bitshares.amountarray import AmountArray, PriceArray, np
+from fakes import FakeBitShares, FakeRPC, asset
+
+# No node is needed
+bitshares = object()
+
+
+class AssetRPC(FakeRPC):
+    def get_asset(self, key):
+        return asset(113, "CNY", 4)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.bts = AssetInfo.from_asset(
+            {"id": "1.3.0", "symbol": "BTS", "precision": 5})
+        self.usd = AssetInfo.from_asset(
+            {"id": "1.3.121", "symbol": "USD", "precision": 4})
+
+    def test_balances(self):
+        balances = AmountArray.from_balances([
+            {"amount": 100000, "asset_id": "1.3.0"},
+            {"amount": "20000", "asset_id": "1.3.121"},
+            {"amount": 300000, "asset_id": "1.3.0"},
+        ], bitshares_instance=bitshares)
+        self.assertEqual(len(balances), 3)
+        self.assertEqual(balances[1].amount, 20000)
+        self.assertIs(balances[1].asset, self.usd)
+        totals = balances.aggregate()
+        self.assertEqual([(a.amount, a.symbol) for a in totals],
+                         [(400000, "BTS"), (20000, "USD")])
+        self.assertEqual(balances.filter(balances.asset_mask("BTS")).total().amount, 400000)
+        self.assertEqual([a.amount for a in balances.sort(descending=True)],
+                         [300000, 20000, 100000])
+        # 1 BTS = 0.25 USD
+        converted = balances.convert({"BTS": 0.25}, "USD")
+        self.assertEqual(converted.total().amount, 2500 + 20000 + 7500)
+        self.assertEqual(str(balances.to_amounts()[0]), "1.00000 BTS")
+
+    def test_full_account_balances(self):
+        balances = AmountArray.from_balances([
+            {"owner": "1.2.100", "balance": 5, "asset_type": "1.3.0"}])
+        self.assertEqual(balances[0].amount, 5)
+
+    def test_orders(self):
+        orders = [{
+            "id": "1.7.%d" % i,
+            "for_sale": 1000 * (i + 1),
+            "sell_price": {
+                "base": {"amount": 1000 * (i + 1), "asset_id": "1.3.121"},
+                "quote": {"amount": 400000, "asset_id": "1.3.0"}}
+        } for i in range(3)]
+        amounts = AmountArray.from_orders(orders)
+        self.assertEqual(amounts.total().amount, 6000)
+        prices = PriceArray.from_orders(orders, bitshares_instance=bitshares)
+        np.testing.assert_allclose(prices.values, [0.025, 0.05, 0.075])
+        np.testing.assert_allclose(prices.invert().values, [40, 20, 40 / 3.])
+        self.assertEqual(len(prices.filter(prices.values > 0.03)), 2)
+        self.assertEqual(len(prices.market_mask("USD", "BTS").nonzero()[0]), 3)
+        price = prices.sort(descending=True)[0]
+        self.assertAlmostEqual(price["price"], 0.075)
+        self.assertEqual(price["base"]["symbol"], "USD")
+
+    def test_order_book(self):
+        book = {
+            "base": "USD", "quote": "BTS",
+            "bids": [{"price": "0.25", "quote": "10.5", "base": "2.625"}],
+            "asks": [{"price": "0.3", "quote": "1", "base": "0.3"}],
+        }
+        self.assertEqual(AmountArray.from_order_book(book)[0].amount, 1050000)
+        asks = PriceArray.from_order_book(book, side="asks")
+        self.assertEqual(asks.base_amounts.tolist(), [3000])
+        np.testing.assert_allclose(asks.values, [0.3])
+
+    def test_unknown_asset(self):
+        Asset.use_registry = False
+        try:
+            balances = AmountArray.from_balances(
+                [{"amount": 1, "asset_id": "1.3.0"}],
+                bitshares_instance=FakeBitShares(AssetRPC()))
+            # Resolved through the instance of the array
+            self.assertFalse(balances.asset_mask("CNY").any())
+            self.assertEqual(balances.convert({}, "CNY").total().symbol, "CNY")
+        finally:
+            Asset.cache.clear()
+            Asset.use_registry = True
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+from bitshares import storage
+from bitshares.storage import AssetRegistry
+from bitshares.asset import Asset
+from fakes import FakeBitShares, FakeRPC, asset, chain_id
+
+
+class AssetsRPC(FakeRPC):
+    """ Knows three assets and records the API calls
+    """
+    nodes = ["wss://localhost"]
+
+    def __init__(self, connected=True):
+        super(AssetsRPC, self).__init__()
+        self._chain_params = {"chain_id": chain_id} if connected else None
+        self.assets = [asset(0, "BTS"), asset(1, "USD"), asset(2, "CNY")]
+
+    @property
+    def chain_params(self):
+        self.calls.append("chain_params")
+        return {"chain_id": chain_id}
+
+    def get_objects(self, ids):
+        self.calls.append("get_objects")
+        r = []
+        for i in ids:
+            n = int(i.split(".")[2])
+            r.append(self.assets[n] if n < len(self.assets) else None)
+        return r
+
+    def get_asset(self, key):
+        self.calls.append("get_asset")
+        for a in self.assets:
+            if key in (a["id"], a["symbol"]):
+                return a
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.registry = self.new_registry()
+        self.config = storage.configStorage
+        storage.configStorage = self.registry.config
+        self.assetRegistry = storage.assetRegistry
+        storage.assetRegistry = self.registry
+        Asset.cache.clear()
+
+    def tearDown(self):
+        storage.configStorage = self.config
+        storage.assetRegistry = self.assetRegistry
+        Asset.cache.clear()
+        shutil.rmtree(self.data_dir)
+
+    def new_registry(self):
+        registry = AssetRegistry()
+        registry.data_dir = self.data_dir
+        registry.sqlDataBaseFile = os.path.join(self.data_dir, "test.sqlite")
+        registry.config = storage.Configuration()
+        registry.config.data_dir = registry.data_dir
+        registry.config.sqlDataBaseFile = registry.sqlDataBaseFile
+        return registry
+
+    def test_sync(self):
+        rpc = AssetsRPC()
+        rpc.assets = rpc.assets[:1]
+        self.assertEqual(self.registry.sync(rpc, chunk_size=2), 1)
+        rpc.assets = AssetsRPC().assets
+        self.assertEqual(self.registry.sync(rpc, chunk_size=2), 2)
+        self.assertEqual(self.registry.get(rpc, "CNY")["id"], "1.3.2")
+
+    def test_offline(self):
+        self.registry.sync(AssetsRPC())
+        # A new process on a lazy connection
+        storage.assetRegistry = self.new_registry()
+        rpc = AssetsRPC(connected=False)
+        bts = FakeBitShares(rpc)
+        self.assertEqual(Asset("USD", bitshares_instance=bts)["precision"], 5)
+        self.assertEqual(Asset("1.3.2", bitshares_instance=bts)["symbol"], "CNY")
+        self.assertEqual(rpc.calls, [])
+
+    def test_options(self):
+        rpc = AssetsRPC()
+        self.registry.sync(rpc)
+        self.assertNotIn("options", self.registry.get(rpc, "USD"))
+        # The options change after the asset has been stored
+        rpc.assets[1]["options"] = dict(rpc.assets[1]["options"], flags=128)
+        storage.assetRegistry = self.new_registry()
+        usd = Asset("USD", bitshares_instance=FakeBitShares(AssetsRPC(connected=False)))
+        usd.bitshares = FakeBitShares(rpc)
+        del rpc.calls[:]
+        self.assertEqual(usd["precision"], 5)
+        self.assertEqual(rpc.calls, [])
+        # Obtained from the API server, not the registry
+        self.assertEqual(usd["options"]["flags"], 128)
+
+    def test_offline_lazy(self):
+        self.registry.sync(AssetsRPC())
+        bts = FakeBitShares()
+        bts.rpc = None
+        usd = Asset("USD", lazy=True, bitshares_instance=bts)
+        self.assertFalse(usd.cached)
+        self.assertEqual(len(dict(usd)), 0)
+        self.assertIsNone(self.registry.getChainId(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from bitshares.account import Account
+from bitshares.asset import Asset
+from bitshares.exceptions import AccountDoesNotExistsException
+from fakes import FakeBitShares, FakeRPC, asset
+
+
+def account(i):
+    return {"id": "1.2.%d" % i, "name": "account%d" % i}
+
+
+class AccountsRPC(FakeRPC):
+    """ Knows 500 accounts and two assets
+    """
+    def __init__(self):
+        super(AccountsRPC, self).__init__()
+        self.assets = {"USD": asset(1, "USD"), "1.3.0": asset(0, "BTS")}
+
+    def get_objects(self, ids):
+        r = []
+        for i in ids:
+            space, n = i[:4], int(i.split(".")[2])
+            if space == "1.2.":
+                r.append(account(n) if n < 500 else None)
+            elif space == "2.3.":
+                r.append({"id": i, "current_supply": n})
+            else:
+                r.append(self.assets.get(i))
+        return r
+
+    def lookup_account_names(self, names):
+        return [
+            account(int(n[7:])) if int(n[7:]) < 500 else None
+            for n in names
+        ]
+
+    def lookup_asset_symbols(self, symbols):
+        return [self.assets.get(s) for s in symbols]
+
+    def get_full_accounts(self, names, subscribe):
+        return [
+            [n, {"account": account(int(n[7:])), "balances": []}]
+            for n in names
+        ]
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        Account.cache.clear()
+        Asset.cache.clear()
+        Asset.use_registry = False
+        self.bts = FakeBitShares(AccountsRPC())
+
+    def tearDown(self):
+        Account.cache.clear()
+        Asset.cache.clear()
+        Asset.use_registry = True
+
+    def test_accounts(self):
+        names = ["account%d" % i for i in range(400)] + ["1.2.499", "account0"]
+        accounts = Account.bulk(names, bitshares_instance=self.bts)
+        self.assertEqual(self.bts.rpc.round_trips, 1)
+        self.assertEqual(accounts[5]["id"], "1.2.5")
+        self.assertEqual(accounts[400]["name"], "account499")
+        self.assertEqual(accounts[-1]["id"], "1.2.0")
+        # Everything is cached now
+        Account.bulk(["account5", "1.2.499"], bitshares_instance=self.bts)
+        self.assertEqual(self.bts.rpc.round_trips, 1)
+
+    def test_full_accounts(self):
+        accounts = Account.bulk(
+            ["account1", "account2"], full=True, bitshares_instance=self.bts)
+        self.assertEqual(accounts[1]["balances"], [])
+        self.assertEqual(accounts[1]["id"], "1.2.2")
+        Account("account1", full=True, bitshares_instance=self.bts)
+        self.assertEqual(self.bts.rpc.round_trips, 1)
+
+    def test_unknown_account(self):
+        with self.assertRaises(AccountDoesNotExistsException):
+            Account.bulk(["account1", "account900"], bitshares_instance=self.bts)
+
+    def test_assets(self):
+        usd, bts = Asset.bulk(["USD", "1.3.0"], full=True, bitshares_instance=self.bts)
+        self.assertEqual(self.bts.rpc.round_trips, 2)
+        self.assertEqual(usd["dynamic_asset_data"]["current_supply"], 1)
+        self.assertEqual(bts["symbol"], "BTS")
+        self.assertIn("flags", bts)
+        Asset.bulk(["BTS"], bitshares_instance=self.bts)
+        self.assertEqual(self.bts.rpc.round_trips, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from bitshares import storage
+from bitshares.storage import CandleStore
+from bitshares.candles import Candles, np
+from bitshares.utils import formatTime
+from fakes import FakeBitShares, FakeRPC
+
+market = {
+    "base": {"id": "1.3.0", "symbol": "BTS", "precision": 5},
+    "quote": {"id": "1.3.121", "symbol": "USD", "precision": 4},
+}
+
+
+def bucket(open, price, volume):
+    """ Bucket as stored by the node, with ``1.3.0`` being the base
+    """
+    base = int(price * 10 ** 5)
+    return {
+        "key": {"base": "1.3.0", "quote": "1.3.121", "seconds": 3600,
+                "open": formatTime(float(open))},
+        "open_base": base, "open_quote": 10 ** 4,
+        "high_base": base * 2, "high_quote": 10 ** 4,
+        "low_base": base, "low_quote": 2 * 10 ** 4,
+        "close_base": base, "close_quote": 10 ** 4,
+        "base_volume": volume * 10 ** 5, "quote_volume": volume * 10 ** 4,
+    }
+
+
+class HistoryRPC(FakeRPC):
+    """ Knows a bucket every other hour
+    """
+    def __init__(self):
+        super(HistoryRPC, self).__init__()
+        self.trades = []
+
+    def get_market_history(self, base, quote, seconds, start, stop):
+        start, stop = [int(time.mktime(time.strptime(t, "%Y-%m-%dT%H:%M:%S"))) - time.timezone
+                       for t in (start, stop)]
+        return [
+            bucket(t, 300.0, 1) for t in range(start, stop + 1, seconds)
+            if t // seconds % 2 == 0
+        ][:200]
+
+    def get_trade_history(self, base, quote, start, stop, limit):
+        return self.trades[:limit]
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        store = CandleStore()
+        store.data_dir = self.data_dir
+        store.sqlDataBaseFile = os.path.join(self.data_dir, "test.sqlite")
+        self.candleStore = storage.candleStore
+        storage.candleStore = store
+        self.bitshares = FakeBitShares(HistoryRPC())
+        self.candles = Candles(market, "1h", bitshares_instance=self.bitshares)
+
+    def tearDown(self):
+        storage.candleStore = self.candleStore
+        shutil.rmtree(self.data_dir)
+
+    def test_store(self):
+        store = storage.candleStore
+        key = ("0" * 64, "1.3.0", "1.3.121", 60)
+        store.add(key, [(60, 1, 1, 1, 1, 1, 1)], 0, 120)
+        store.add(key, [], 300, 600)
+        self.assertEqual(store.missing(key, 0, 900), [(120, 300), (600, 900)])
+        store.add(key, [], 120, 300)
+        self.assertEqual(store.ranges(key), [(0, 600)])
+        self.assertEqual(store.get(key, 0, 600), [(60, 1, 1, 1, 1, 1, 1)])
+
+    def test_history(self):
+        stop = 1500000000 // 3600 * 3600
+        start = stop - 500 * 3600
+        data = self.candles.fetch(start, stop)
+        self.assertEqual(len(data["time"]), 250)
+        self.assertEqual(data["time"][0], start)
+        self.assertEqual(data["open"][0], 300.0)
+        self.assertEqual(data["high"][0], 600.0)
+        self.assertEqual(data["low"][0], 150.0)
+        self.assertEqual(data["base_volume"][0], 1.0)
+        # Three slices of 200 buckets in a single round trip
+        self.assertEqual([len(b) for b in self.bitshares.rpc.batches], [3])
+
+        # Completed buckets come from disk
+        candles = Candles(market, "1h", bitshares_instance=self.bitshares)
+        data = candles.fetch(start + 3600, stop + 3600 * 10, fill=True)
+        self.assertEqual([len(b) for b in self.bitshares.rpc.batches], [3, 1])
+        self.assertEqual(len(data["time"]), 507)
+        self.assertEqual(data["close"][0], data["close"][1])
+        self.assertEqual(data["quote_volume"][1], 0)
+
+    def test_open_bucket(self):
+        now = time.time()
+        self.bitshares.rpc.trades = [
+            {"date": formatTime(float(now)), "price": "310", "amount": "2", "value": "620", "sequence": 2},
+            {"date": formatTime(float(now)), "price": "300", "amount": "1", "value": "300", "sequence": 1},
+        ]
+        data = self.candles.fetch(now - 3600)
+        self.assertEqual(data["close"][-1], 310.0)
+        self.assertEqual(data["quote_volume"][-1], 3.0)
+        self.candles.process_market([
+            [[4, {"pays": {"amount": 10 ** 4, "asset_id": "1.3.121"},
+                  "receives": {"amount": 320 * 10 ** 5, "asset_id": "1.3.0"},
+                  "is_maker": True}], [0]],
+            [[4, {"pays": {"amount": 320 * 10 ** 5, "asset_id": "1.3.0"},
+                  "receives": {"amount": 10 ** 4, "asset_id": "1.3.121"},
+                  "is_maker": False}], [0]],
+        ])
+        data = self.candles.arrays()
+        self.assertEqual(data["close"][-1], 320.0)
+        self.assertEqual(data["high"][-1], 320.0)
+        self.assertEqual(data["low"][-1], 300.0)
+        self.assertEqual(data["quote_volume"][-1], 4.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
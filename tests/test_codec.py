@@ -0,0 +1,55 @@
+import unittest
+from bitsharesapi import codec
+
+
+class Testcases(unittest.TestCase):
+
+    def tearDown(self):
+        codec.use()
+
+    def test_roundtrip(self):
+        payload = {"method": "call",
+                   "params": [0, "get_objects", [["1.3.0", "2.0.0"]]],
+                   "jsonrpc": "2.0",
+                   "id": 1}
+        for backend in codec.preferred_backends:
+            try:
+                codec.use(backend)
+            except ImportError:
+                continue
+            data = codec.dumps(payload)
+            self.assertIsInstance(data, bytes)
+            self.assertEqual(codec.loads(data), payload)
+            self.assertEqual(codec.loads(data.decode("utf8")), payload)
+
+    def test_unicode(self):
+        payload = {"memo": "Grüße ✓"}
+        for backend in codec.preferred_backends:
+            try:
+                codec.use(backend)
+            except ImportError:
+                continue
+            self.assertIn("Grüße".encode("utf8"), codec.dumps(payload))
+            self.assertEqual(codec.loads(codec.dumps(payload)), payload)
+
+    def test_control_characters(self):
+        # Nodes may send unescaped control characters in strings
+        reply = '{"id": 1, "result": "line1\nline2\ttab"}'
+        for backend in codec.preferred_backends:
+            try:
+                codec.use(backend)
+            except ImportError:
+                continue
+            self.assertEqual(codec.loads(reply)["result"], "line1\nline2\ttab")
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            codec.loads("{not json")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            codec.use("foobar")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import unittest
+from bitshares.coherence import CacheCoherence
+from bitshares.account import Account
+from bitshares.asset import Asset
+from fakes import FakeBitShares
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        Account.cache.clear()
+        Asset.cache.clear()
+        Asset.use_registry = False
+        self.coherence = CacheCoherence(bitshares_instance=FakeBitShares())
+        Asset.cache.set("1.3.0", {
+            "id": "1.3.0", "symbol": "BTS",
+            "dynamic_asset_data_id": "2.3.0",
+            "dynamic_asset_data": {"id": "2.3.0", "current_supply": 1}
+        }, aliases=["BTS"])
+        Account.cache.set("1.2.100", {
+            "id": "1.2.100", "name": "init0",
+            "balances": [{"id": "2.5.1", "owner": "1.2.100", "balance": 1}],
+            "limit_orders": [{"id": "1.7.1", "seller": "1.2.100"}],
+            "statistics": {"id": "2.6.100", "total_ops": 1},
+        }, aliases=["init0"])
+
+    def tearDown(self):
+        self.coherence.stop()
+        Account.cache.clear()
+        Asset.cache.clear()
+        Asset.use_registry = True
+
+    def test_asset(self):
+        self.coherence.process_object({"id": "2.3.0", "current_supply": 2})
+        self.assertEqual(
+            Asset.cache.get("BTS")["dynamic_asset_data"]["current_supply"], 2)
+        self.coherence.process_object({"id": "1.3.0", "symbol": "BTS"})
+        self.assertNotIn("BTS", Asset.cache)
+
+    def test_account(self):
+        process = self.coherence.process_object
+        process({"id": "2.5.1", "owner": "1.2.100", "balance": 5})
+        process({"id": "2.5.2", "owner": "1.2.100", "balance": 7})
+        process({"id": "2.6.100", "total_ops": 2})
+        process({"id": "1.7.2", "seller": "1.2.100"})
+        self.coherence.process_removed("1.7.1")
+        process({"id": "1.2.100", "name": "init0", "referrer": "1.2.1"})
+        account = Account.cache.get("init0")
+        self.assertEqual(
+            sorted((b["id"], b["balance"]) for b in account["balances"]),
+            [("2.5.1", 5), ("2.5.2", 7)])
+        self.assertEqual(account["statistics"]["total_ops"], 2)
+        self.assertEqual([o["id"] for o in account["limit_orders"]], ["1.7.2"])
+        self.assertEqual(account["referrer"], "1.2.1")
+
+    def test_removed_notice(self):
+        ws = self.coherence.websocket
+        ws.on_message(None, json.dumps({
+            "method": "notice",
+            "params": [ws.__events__.index("on_object"), [["1.7.1"]]]}))
+        account = Account.cache.get("init0")
+        self.assertEqual(account["limit_orders"], [])
+
+    def test_removed_opt_in(self):
+        from bitsharesapi.websocket import BitSharesWebsocket
+        objects, removed = [], []
+        ws = BitSharesWebsocket(
+            "wss://localhost", objects=["1.7.x"], on_object=objects.append)
+        notice = json.dumps({
+            "method": "notice",
+            "params": [ws.__events__.index("on_object"), [["1.7.1"]]]})
+        # Removals are not passed to on_object
+        ws.on_message(None, notice)
+        self.assertEqual(objects, [])
+        ws.on_removed += removed.append
+        ws.on_message(None, notice)
+        self.assertEqual(removed, ["1.7.1"])
+        self.assertEqual(objects, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from fractions import Fraction
+from bitshares.amount import Amount
+from bitshares.compactamount import AssetInfo, CompactAmount
+
+asset = {
+    "id": "1.3.0",
+    "symbol": "BTS",
+    "precision": 5,
+}
+# No node is needed
+bitshares = object()
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.bts = AssetInfo.from_asset(asset)
+
+    def test_interned(self):
+        self.assertIs(AssetInfo("1.3.0", "BTS", 5), self.bts)
+        self.assertIs(AssetInfo.get("BTS"), self.bts)
+        a = CompactAmount.from_chain({"amount": "100", "asset_id": "1.3.0"})
+        self.assertIs(a.asset, self.bts)
+        self.assertEqual(a.amount, 100)
+
+    def test_arithmetic(self):
+        a = CompactAmount(29, self.bts)
+        self.assertEqual((a + a).amount, 58)
+        self.assertEqual((a - 30).amount, -1)
+        self.assertEqual((CompactAmount(100, self.bts) * 0.29).amount, 29)
+        self.assertEqual((a * 3).amount, 87)
+        self.assertEqual((a // 2).amount, 14)
+        self.assertEqual((a / 0.5).amount, 58)
+        self.assertEqual(a / CompactAmount(58, self.bts), Fraction(1, 2))
+        self.assertEqual(sum([a, a, a]).amount, 87)
+        self.assertTrue(a < a * 2)
+        self.assertEqual(a, CompactAmount(29, self.bts))
+        other = AssetInfo("1.3.121", "USD", 4)
+        self.assertNotEqual(a, CompactAmount(29, other))
+        with self.assertRaises(AssertionError):
+            a + CompactAmount(1, other)
+
+    def test_format(self):
+        self.assertEqual(str(CompactAmount(123456789, self.bts)), "1,234.56789 BTS")
+        self.assertEqual(str(CompactAmount(-5, self.bts)), "-0.00005 BTS")
+        self.assertEqual(
+            CompactAmount(5, self.bts).json(),
+            {"amount": 5, "asset_id": "1.3.0"})
+
+    def test_amount(self):
+        amount = Amount(amount=0.29, asset=asset, bitshares_instance=bitshares)
+        a = CompactAmount.from_amount(amount)
+        self.assertEqual(a.amount, 29000)
+        back = a.to_amount(bitshares_instance=bitshares)
+        self.assertEqual(back["amount"], 0.29)
+        self.assertEqual(back["symbol"], "BTS")
+        self.assertEqual(str(back), "0.29000 BTS")
+
+
+if __name__ == '__main__':
+    unittest.main()
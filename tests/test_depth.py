@@ -0,0 +1,56 @@
+import unittest
+from bitshares.depth import MarketDepth, np
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.depth = MarketDepth.from_orderbook({
+            "bids": [(99.0, 1.0), (98.0, 2.0), (95.0, 5.0)],
+            "asks": [
+                {"price": "101", "quote": "1", "base": "101"},
+                {"price": "102", "quote": "2", "base": "204"},
+                {"price": "110", "quote": "5", "base": "550"},
+            ],
+        })
+
+    def test_mid(self):
+        self.assertEqual(self.depth.mid, 100.0)
+        self.assertEqual(self.depth.spread, 2.0)
+
+    def test_vwap(self):
+        self.assertEqual(self.depth.vwap(0), 101.0)
+        self.assertEqual(self.depth.vwap(1), 101.0)
+        self.assertEqual(self.depth.vwap(2), (101 + 102) / 2)
+        self.assertEqual(self.depth.cost(4), 101 + 204 + 110)
+        self.assertEqual(self.depth.vwap(3, "sell"), (99 + 196) / 3)
+        self.assertEqual(self.depth.vwap(99 + 98, "sell", asset="base"), (99 + 98) / 2)
+        self.assertEqual(self.depth.cost(305, asset="base"), 3.0)
+        self.assertTrue(np.isnan(self.depth.vwap(9)))
+        vwaps = self.depth.vwap([1, 3, 8, 9])
+        self.assertEqual(vwaps.shape, (4,))
+        np.testing.assert_allclose(
+            vwaps[:3], [101, 305 / 3, (305 + 550) / 8])
+
+    def test_slippage(self):
+        self.assertEqual(self.depth.slippage(1), 0)
+        self.assertAlmostEqual(self.depth.slippage(3, "sell"), 1 - (295 / 3) / 99)
+        self.assertAlmostEqual(self.depth.price_impact(3), 0.02)
+        self.assertAlmostEqual(self.depth.price_impact(4, "sell"), 0.05)
+
+    def test_liquidity(self):
+        self.assertEqual(self.depth.liquidity_within(0.01), 2.0)
+        self.assertEqual(self.depth.liquidity_within(0.02, "buy"), 3.0)
+        self.assertEqual(self.depth.liquidity_within(0.02, "sell", asset="base"), 99 + 196)
+        np.testing.assert_allclose(
+            self.depth.liquidity_within([0, 0.01, 0.1]), [0, 2, 16])
+
+    def test_empty(self):
+        depth = MarketDepth([], [(1.0, 1.0)])
+        self.assertTrue(np.isnan(depth.vwap(1, "sell")))
+        self.assertEqual(depth.vwap(1, "buy"), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import unittest
+from bitshares.asset import Asset
+from bitshares.fees import FeeSchedule, is_cheap_name
+from bitshares.transactionbuilder import TransactionBuilder
+from bitsharesbase import operations
+from bitsharesbase.objects import Operation
+from fakes import FakeBitShares, NodeRPC, global_properties, transfer
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        Asset.use_registry = False
+        Asset.cache.set("1.3.121", {
+            "id": "1.3.121", "symbol": "USD", "precision": 4,
+            "options": {"core_exchange_rate": {
+                "base": {"amount": 3, "asset_id": "1.3.121"},
+                "quote": {"amount": 1000, "asset_id": "1.3.0"},
+            }},
+        }, aliases=["USD"])
+        self.bitshares = FakeBitShares(NodeRPC())
+        self.bitshares.fee_schedule = FeeSchedule(bitshares_instance=self.bitshares)
+        self.fees = self.bitshares.fee_schedule
+
+    def tearDown(self):
+        Asset.cache.clear()
+        Asset.use_registry = True
+
+    def test_fees(self):
+        self.assertEqual(self.fees.fee(Operation(transfer())), 20000)
+        # 1 + 33 + 33 + 8 + 1 + 100 bytes of memo at 100 per byte
+        self.assertEqual(self.fees.fee(Operation(transfer(message="aa" * 100))), 20000 + 17600)
+        order = operations.Limit_order_create(**{
+            "fee": {"amount": 0, "asset_id": "1.3.0"},
+            "seller": "1.2.100",
+            "amount_to_sell": {"amount": 1, "asset_id": "1.3.0"},
+            "min_to_receive": {"amount": 1, "asset_id": "1.3.121"},
+            "expiration": "2030-01-01T00:00:00",
+            "fill_or_kill": False,
+        })
+        # 500 * 3 / 1000 rounded up
+        self.assertEqual(self.fees.fee(Operation(order), "1.3.121"), 2)
+        # The schedule is read once
+        self.assertEqual(self.bitshares.rpc.calls, ["get_objects"])
+
+    def test_scale_and_invalidation(self):
+        self.fees.process_object(global_properties(scale=5000, transfer_fee=30000))
+        self.assertEqual(self.fees.fee(Operation(transfer())), 15000)
+        self.fees.invalidate()
+        self.assertEqual(self.fees.fee(Operation(transfer())), 20000)
+        self.assertEqual(self.bitshares.rpc.calls, ["get_objects"])
+
+    def test_names(self):
+        self.assertTrue(is_cheap_name("init0"))
+        self.assertTrue(is_cheap_name("xyz.abc"))
+        self.assertTrue(is_cheap_name("bcdfg"))
+        self.assertFalse(is_cheap_name("alice"))
+
+    def test_proposal(self):
+        proposal = Operation(operations.Proposal_create(**{
+            "fee": {"amount": 0, "asset_id": "1.3.0"},
+            "fee_paying_account": "1.2.100",
+            "expiration_time": "2030-01-01T00:00:00",
+            "proposed_ops": [{"op": Operation(transfer()).json()}],
+            "extensions": [],
+        }))
+        self.fees.set_fees([proposal])
+        inner = proposal.op.data["proposed_ops"].data[0].data["op"].op
+        self.assertEqual(int(inner.data["fee"].data["amount"].data), 20000)
+        size = len(bytes(proposal.op))
+        self.assertEqual(
+            int(proposal.op.data["fee"].data["amount"].data), 2000 + size * 10)
+
+    def test_transactionbuilder(self):
+        builder = TransactionBuilder(bitshares_instance=self.bitshares)
+        builder.appendOps(transfer())
+        builder.constructTx()
+        self.assertEqual(builder["operations"][0][1]["fee"]["amount"], 20000)
+        self.assertNotIn("get_required_fees", self.bitshares.rpc.calls)
+
+        # Operations without local fee computation
+        withdraw = operations.Vesting_balance_withdraw(**{
+            "fee": {"amount": 0, "asset_id": "1.3.0"},
+            "vesting_balance": "1.13.0",
+            "owner": "1.2.100",
+            "amount": {"amount": 1, "asset_id": "1.3.0"},
+        })
+        builder = TransactionBuilder(bitshares_instance=self.bitshares)
+        builder.appendOps(withdraw)
+        builder.constructTx()
+        self.assertIn("get_required_fees", self.bitshares.rpc.calls)
+
+
+@unittest.skipUnless(
+    os.environ.get("BITSHARES_NODE"),
+    "Set BITSHARES_NODE to compare the fees with an API server")
+class NodeTestcases(unittest.TestCase):
+
+    def test_compare(self):
+        from bitshares import BitShares
+        bitshares = BitShares(os.environ["BITSHARES_NODE"], local_fees=True)
+        ops = [Operation(transfer()), Operation(transfer(message="ab" * 300))]
+        for asset_id in ["1.3.0", "1.3.121"]:
+            node = bitshares.rpc.get_required_fees([op.json() for op in ops], asset_id)
+            local = [bitshares.fee_schedule.fee(op, asset_id) for op in ops]
+            self.assertEqual(local, [int(f["amount"]) for f in node])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import requests
+from bitsharesapi.httprpc import BitSharesHttpRPC
+from bitsharesapi.bitsharesnoderpc import NumRetriesReached
+from bitsharesapi import exceptions
+
+
+class Handler(BaseHTTPRequestHandler):
+    """ Minimal JSON-RPC node that echoes the calls it receives
+    """
+    protocol_version = "HTTP/1.1"
+    posts = []
+    #: Status codes to answer with before answering the calls
+    errors = []
+
+    def answer(self, request):
+        api, method, args = request["params"]
+        if method == "get_chain_properties":
+            result = {"chain_id": "4018d7844c78f6a6c41c6a552b898022310fc5dec06da467ee7905a8dad512c8"}
+        elif method == "fail":
+            return {"id": request["id"], "jsonrpc": "2.0",
+                    "error": {"message": "no method with name 'fail'"}}
+        else:
+            result = [api, method, args]
+        return {"id": request["id"], "jsonrpc": "2.0", "result": result}
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        Handler.posts.append(self.client_address)
+        if Handler.errors:
+            status = Handler.errors.pop(0)
+            data = b"<html>Error</html>"
+        elif isinstance(body, list):
+            # answer in reversed order
+            status = 200
+            data = json.dumps([self.answer(r) for r in reversed(body)]).encode("utf8")
+        else:
+            reply = self.answer(body)
+            status = 500 if "error" in reply else 200
+            data = json.dumps(reply).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class Testcases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.url = "http://127.0.0.1:%d" % cls.server.server_address[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.posts = []
+        Handler.errors = []
+
+    def test_call(self):
+        rpc = BitSharesHttpRPC(self.url, max_batch_size=3)
+        self.assertEqual(rpc.chain_params["prefix"], "BTS")
+        self.assertEqual(
+            rpc.get_objects(["2.0.0"]),
+            [0, "get_objects", [["2.0.0"]]])
+        self.assertEqual(
+            rpc.get_account_history("1.2.0", api="history"),
+            ["history", "get_account_history", ["1.2.0"]])
+
+    def test_lazy(self):
+        rpc = BitSharesHttpRPC(self.url, autoconnect=False)
+        self.assertFalse(rpc.is_connected())
+        self.assertEqual(Handler.posts, [])
+        rpc.get_block(1)
+        self.assertTrue(rpc.is_connected())
+
+    def test_keep_alive(self):
+        rpc = BitSharesHttpRPC(self.url, autoconnect=False)
+        for i in range(5):
+            rpc.get_block(i)
+        # All requests came through the same connection
+        self.assertEqual(len(set(Handler.posts)), 1)
+
+    def test_batch(self):
+        rpc = BitSharesHttpRPC(self.url, autoconnect=False, max_batch_size=3)
+        results = rpc.batch(
+            [["get_block", [i]] for i in range(7)] +
+            [["get_relative_account_history", ["1.2.0", 0, 10, 0], "history"]])
+        self.assertEqual(len(Handler.posts), 3)
+        self.assertEqual(
+            results[:7], [[0, "get_block", [i]] for i in range(7)])
+        self.assertEqual(results[7][0], "history")
+        self.assertEqual(rpc.batch([]), [])
+
+    def test_errors(self):
+        rpc = BitSharesHttpRPC(self.url, autoconnect=False)
+        # HTTP 500 with a JSON-RPC error is not retried
+        with self.assertRaises(exceptions.NoMethodWithName):
+            rpc.fail()
+        with self.assertRaises(exceptions.NoMethodWithName):
+            rpc.batch([["get_block", [1]], ["fail", []]])
+
+    def test_server_errors(self):
+        rpc = BitSharesHttpRPC(self.url, autoconnect=False)
+        # Retried with the next node
+        Handler.errors = [503]
+        self.assertEqual(rpc.get_block(1), [0, "get_block", [1]])
+        self.assertEqual(len(Handler.posts), 2)
+        rpc = BitSharesHttpRPC(self.url, autoconnect=False, num_retries=0)
+        Handler.errors = [502]
+        with self.assertRaises(NumRetriesReached):
+            rpc.get_block(1)
+        # Not retried
+        Handler.errors = [404]
+        with self.assertRaises(requests.exceptions.HTTPError):
+            rpc.get_block(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
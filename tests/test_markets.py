@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from bitshares import storage
+from bitshares.asset import Asset
+from bitshares.market import Market, Markets
+from bitshares.price import MARKET_SEPARATOR
+from fakes import FakeBitShares, FakeRPC, asset
+
+symbols = ["BTS", "USD", "CNY", "EUR", "GOLD"]
+
+
+def bitasset(i, symbol):
+    return asset(i, symbol, bitasset=i > 0)
+
+
+class TickerRPC(FakeRPC):
+    """ Knows some bitassets backed by BTS
+    """
+    nodes = FakeRPC.urls
+    _chain_params = FakeRPC.chain_params
+
+    def __init__(self):
+        super(TickerRPC, self).__init__()
+        self.refreshed = threading.Event()
+
+    def batch(self, calls, return_exceptions=False):
+        results = super(TickerRPC, self).batch(calls, return_exceptions)
+        if calls:
+            self.refreshed.set()
+        return results
+
+    def get_objects(self, ids):
+        return [
+            {"id": i, "options": {"short_backing_asset": "1.3.0"},
+             "current_feed": {"settlement_price": int(i.split(".")[2])}}
+            if i[:4] == "2.4." else bitasset(int(i.split(".")[2]), symbols[int(i.split(".")[2])])
+            for i in ids
+        ]
+
+    def lookup_asset_symbols(self, names):
+        return [bitasset(symbols.index(s), s) for s in names]
+
+    def get_ticker(self, base, quote):
+        return {
+            "base_volume": "10", "quote_volume": "20",
+            "lowest_ask": "1", "highest_bid": "2", "latest": base[4:],
+            "percent_change": "0.5"}
+
+    def get_object(self, id):
+        return self.get_objects([id])[0]
+
+    def get_asset(self, key):
+        self.calls.append("get_asset")
+        return bitasset(symbols.index(key), key)
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        Asset.cache.clear()
+        Asset.use_registry = False
+        self.bitshares = FakeBitShares(TickerRPC())
+        self.markets = Markets(
+            ["USD:BTS", "CNY:BTS", "EUR:BTS", "GOLD:USD"],
+            bitshares_instance=self.bitshares)
+
+    def tearDown(self):
+        self.markets.stop()
+        Asset.cache.clear()
+        Asset.use_registry = True
+
+    def test_refresh(self):
+        self.assertEqual(len(self.bitshares.rpc.batches), 1)
+        table = self.markets.refresh()
+        # Tickers and deduplicated bitasset lookups in one round trip
+        self.assertEqual(self.bitshares.rpc.batches[-1], ["get_ticker"] * 4 + ["get_objects"])
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table[0]["quote_symbol"], "USD")
+        self.assertEqual(table[0]["quoteSettlement_price"], 1.0)
+        self.assertEqual(table[0]["quote_volume"], 20.0)
+        self.assertNotIn("quoteSettlement_price", table[3])
+        self.assertEqual(self.markets.ticker("CNY:BTS")["quoteSettlement_price"], 2.0)
+
+        # Same as for a single market
+        market = self.markets["CNY:BTS"]
+        self.assertEqual(market.ticker(), self.markets.ticker("CNY:BTS"))
+        self.assertIn("GOLD:USD", self.markets)
+        self.assertNotIn("BTS:USD", self.markets)
+        self.assertIsInstance(self.markets[0], Market)
+
+    def test_schedule(self):
+        tables = []
+        self.bitshares.rpc.refreshed.clear()
+        self.markets.start(60, callback=tables.append)
+        self.assertTrue(self.bitshares.rpc.refreshed.wait(5))
+        self.markets.stop()
+        self.markets.thread.join(5)
+        self.assertEqual(len(tables), 1)
+        self.assertIsNotNone(self.markets.updated)
+
+    def test_registry(self):
+        data_dir = tempfile.mkdtemp()
+        registry = storage.AssetRegistry()
+        registry.data_dir = data_dir
+        registry.sqlDataBaseFile = os.path.join(data_dir, "test.sqlite")
+        registry.config = storage.Configuration()
+        registry.config.data_dir = data_dir
+        registry.config.sqlDataBaseFile = registry.sqlDataBaseFile
+        config, assetRegistry = storage.configStorage, storage.assetRegistry
+        storage.configStorage, storage.assetRegistry = registry.config, registry
+        try:
+            registry.add(self.bitshares.rpc, [bitasset(i, s) for i, s in enumerate(symbols)])
+            Asset.cache.clear()
+            Asset.use_registry = True
+            bitshares = FakeBitShares(TickerRPC())
+            markets = Markets(["USD:BTS", "GOLD:USD"], bitshares_instance=bitshares)
+            # The assets only hold the fields of the registry
+            self.assertEqual(bitshares.rpc.batches, [])
+            table = markets.refresh()
+            self.assertEqual(bitshares.rpc.batches, [["get_ticker"] * 2 + ["get_objects"]])
+            self.assertEqual(bitshares.rpc.calls, [])
+            self.assertEqual(table[1]["core_exchange_rate"], 1.0)
+        finally:
+            storage.configStorage, storage.assetRegistry = config, assetRegistry
+            shutil.rmtree(data_dir)
+
+    def test_separator(self):
+        for market in ["GDEX.BTC1:BTS", "GDEX.BTC1/BTS", "GDEX.BTC1-BTS"]:
+            self.assertEqual(MARKET_SEPARATOR.split(market), ["GDEX.BTC1", "BTS"])
+
+
+if __name__ == '__main__':
+    unittest.main()
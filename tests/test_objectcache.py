@@ -0,0 +1,63 @@
+import unittest
+from bitshares.objectcache import ObjectCache
+from bitshares.account import Account
+from fakes import FakeBitShares, FakeRPC
+
+
+class AccountRPC(FakeRPC):
+    """ Records the API calls made to look up accounts
+    """
+    def get_objects(self, ids):
+        self.calls.append("get_objects")
+        return [{"id": "1.2.100", "name": "init0"}]
+
+    def lookup_account_names(self, names):
+        return self.get_objects(names)
+
+
+class Testcases(unittest.TestCase):
+
+    def test_aliases(self):
+        cache = ObjectCache()
+        cache.set("1.3.0", {"symbol": "BTS"}, aliases=["BTS"])
+        self.assertEqual(cache.get("BTS"), {"symbol": "BTS"})
+        self.assertEqual(cache.get("1.3.0"), {"symbol": "BTS"})
+        self.assertTrue(cache.update("BTS", {"symbol": "BTS", "x": 1}))
+        self.assertEqual(cache.get("1.3.0")["x"], 1)
+        cache.remove("BTS")
+        self.assertNotIn("1.3.0", cache)
+        self.assertIsNone(cache.get("BTS"))
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_lru(self):
+        cache = ObjectCache(max_size=2)
+        cache.set("a", 1, aliases=["A"])
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(sorted(cache.keys()), ["a", "c"])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("A"), 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_ttl(self):
+        cache = ObjectCache(ttl=60)
+        cache.set("a", 1, aliases=["A"])
+        cache.set("b", 2, ttl=-1)
+        self.assertEqual(cache.get("A"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_account(self):
+        bts = FakeBitShares(AccountRPC())
+        Account.cache.clear()
+        Account("init0", bitshares_instance=bts)
+        account = Account("1.2.100", bitshares_instance=bts)
+        self.assertEqual(account["name"], "init0")
+        self.assertEqual(len(bts.rpc.calls), 1)
+        Account.cache.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
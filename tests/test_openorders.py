@@ -0,0 +1,115 @@
+import unittest
+from bitshares.account import Account
+from bitshares.asset import Asset
+from bitshares.market import Market
+from bitshares.openorders import OpenOrderIndex
+from fakes import FakeBitShares, FakeRPC, asset
+
+
+class OrdersRPC(FakeRPC):
+
+    def __init__(self):
+        super(OrdersRPC, self).__init__()
+        self.orders = []
+
+    def get_full_accounts(self, accounts, subscribe):
+        self.calls.append("get_full_accounts")
+        return [[accounts[0], {"limit_orders": self.orders}]]
+
+
+def order(id, sell, receive, seller="1.2.100"):
+    return {
+        "id": id,
+        "seller": seller,
+        "for_sale": 1000,
+        "sell_price": {
+            "base": {"amount": 1000, "asset_id": sell},
+            "quote": {"amount": 3000, "asset_id": receive},
+        },
+        "expiration": "2030-01-01T00:00:00",
+    }
+
+
+usd = {"base": {"id": "1.3.0"}, "quote": {"id": "1.3.121"}}
+cny = {"base": {"id": "1.3.0"}, "quote": {"id": "1.3.113"}}
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.bitshares = FakeBitShares(OrdersRPC())
+        self.bitshares.rpc.orders = [
+            order("1.7.1", "1.3.0", "1.3.121"),
+            order("1.7.2", "1.3.121", "1.3.0"),
+            order("1.7.3", "1.3.113", "1.3.0"),
+        ]
+        self.index = OpenOrderIndex("1.2.100", bitshares_instance=self.bitshares)
+        self.index.refresh()
+
+    def test_snapshot(self):
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(
+            sorted(o["id"] for o in self.index.orders(usd)), ["1.7.1", "1.7.2"])
+        self.assertEqual([o["id"] for o in self.index.orders(cny)], ["1.7.3"])
+        self.assertEqual(sorted(self.index.markets()), [
+            ("1.3.0", "1.3.113"), ("1.3.0", "1.3.121")])
+
+    def test_notifications(self):
+        updates = []
+        self.index.on_update += updates.append
+        # New and partially filled orders
+        self.index.process_object(order("1.7.4", "1.3.0", "1.3.121"))
+        changed = order("1.7.1", "1.3.0", "1.3.121")
+        changed["for_sale"] = 500
+        self.index.process_object(changed)
+        self.assertEqual(self.index.get("1.7.1")["for_sale"], 500)
+        self.assertEqual(len(self.index.orders(usd)), 3)
+        # Orders of other accounts are ignored
+        self.index.process_object(order("1.7.5", "1.3.0", "1.3.121", seller="1.2.200"))
+        self.assertNotIn("1.7.5", self.index)
+        # Removed orders
+        self.index.process_removed("1.7.3")
+        self.assertEqual(self.index.orders(cny), [])
+        self.index.process_market(["1.7.2", order("1.7.6", "1.3.113", "1.3.0")])
+        self.assertEqual(
+            sorted(o["id"] for o in self.index.orders()), ["1.7.1", "1.7.4", "1.7.6"])
+        self.assertEqual(len(updates), 4)
+        # A single snapshot
+        self.assertEqual(len(self.bitshares.rpc.calls), 1)
+
+    def test_market(self):
+        market = Market(
+            base={"id": "1.3.0", "symbol": "BTS", "precision": 5},
+            quote={"id": "1.3.121", "symbol": "USD", "precision": 4},
+            bitshares_instance=self.bitshares)
+        orders = market.accountopenorders(index=self.index)
+        self.assertEqual(sorted(o["orderid"] for o in orders), ["1.7.1", "1.7.2"])
+        Account.cache.set("1.2.100", {"id": "1.2.100", "name": "init0"}, aliases=["init0"])
+        try:
+            self.assertEqual(len(market.accountopenorders("init0", index=self.index)), 2)
+        finally:
+            Account.cache.clear()
+        with self.assertRaises(ValueError):
+            market.accountopenorders("1.2.101", index=self.index)
+
+    def test_account(self):
+        Asset.use_registry = False
+        for i, symbol in [(0, "BTS"), (121, "USD"), (113, "CNY")]:
+            Asset.cache.set("1.3.%d" % i, asset(i, symbol), aliases=[symbol])
+        Account.cache.set("1.2.100", {"id": "1.2.100", "name": "init0"}, aliases=["init0"])
+        try:
+            account = Account("init0", bitshares_instance=self.bitshares)
+            orders = account.indexed_openorders(self.index)
+            self.assertEqual(sorted(o["id"] for o in orders), ["1.7.1", "1.7.2", "1.7.3"])
+            self.assertEqual(len(self.bitshares.rpc.calls), 1)
+            Account.cache.set("1.2.101", {"id": "1.2.101", "name": "init1"}, aliases=["init1"])
+            with self.assertRaises(ValueError):
+                Account("init1", bitshares_instance=self.bitshares).indexed_openorders(self.index)
+        finally:
+            Account.cache.clear()
+            Asset.cache.clear()
+            Asset.use_registry = True
+
+
+if __name__ == '__main__':
+    unittest.main()
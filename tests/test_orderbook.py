@@ -0,0 +1,142 @@
+import unittest
+from bitshares.orderbook import OrderBook, OrderBookSide
+from fakes import FakeBitShares, FakeRPC
+
+
+class OrdersRPC(FakeRPC):
+
+    def __init__(self):
+        super(OrdersRPC, self).__init__()
+        self.orders = []
+
+    def get_limit_orders(self, base, quote, limit):
+        self.calls.append("get_limit_orders")
+        return self.orders
+
+
+market = {
+    "base": {"id": "1.3.0", "symbol": "BTS", "precision": 5},
+    "quote": {"id": "1.3.121", "symbol": "USD", "precision": 4},
+}
+
+
+def bid(id, price, amount):
+    """ Buy ``amount`` USD for ``price`` BTS each
+    """
+    base = int(price * amount * 10 ** 5)
+    return {
+        "id": id, "for_sale": base,
+        "sell_price": {
+            "base": {"amount": base, "asset_id": "1.3.0"},
+            "quote": {"amount": int(amount * 10 ** 4), "asset_id": "1.3.121"}}}
+
+
+def ask(id, price, amount):
+    """ Sell ``amount`` USD for ``price`` BTS each
+    """
+    quote = int(amount * 10 ** 4)
+    return {
+        "id": id, "for_sale": quote,
+        "sell_price": {
+            "base": {"amount": quote, "asset_id": "1.3.121"},
+            "quote": {"amount": int(price * amount * 10 ** 5), "asset_id": "1.3.0"}}}
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.bitshares = FakeBitShares(OrdersRPC())
+        self.bitshares.rpc.orders = [
+            bid("1.7.1", 300, 1), bid("1.7.2", 290, 2), bid("1.7.3", 300, 3),
+            ask("1.7.4", 310, 1), ask("1.7.5", 320, 2),
+        ]
+        self.book = OrderBook(market, bitshares_instance=self.bitshares)
+        self.book.refresh()
+
+    def test_side(self):
+        side = OrderBookSide(descending=True)
+        side.add("1.7.1", 1.0, 1, 1)
+        side.add("1.7.2", 2.0, 1, 2)
+        side.add("1.7.3", 1.5, 1, 1.5)
+        self.assertEqual([p for p, _, _ in side.depth()], [2.0, 1.5, 1.0])
+        side.add("1.7.2", 0.5, 2, 1)
+        self.assertEqual(side.best(), (1.5, 1, 1.5))
+        self.assertTrue(side.remove("1.7.3"))
+        self.assertFalse(side.remove("1.7.3"))
+        self.assertEqual(side.worst(), 0.5)
+        self.assertEqual(len(side), 2)
+
+    def test_level_totals(self):
+        side = OrderBookSide()
+        side.add("1.7.1", 1.0, 1, 1)
+        side.add("1.7.2", 1.0, 2, 2)
+        side.add("1.7.3", 1.0, 4, 4)
+        self.assertEqual(side.best(), (1.0, 7, 7))
+        side.add("1.7.2", 1.0, 3, 3)
+        side.remove("1.7.1")
+        self.assertEqual(side.best(), (1.0, 7, 7))
+        side.remove("1.7.3")
+        side.remove("1.7.2")
+        self.assertIsNone(side.best())
+
+    def test_snapshot(self):
+        self.assertEqual(self.book.best_bid, (300.0, 4.0, 1200.0))
+        self.assertEqual(self.book.best_ask, (310.0, 1.0, 310.0))
+        self.assertEqual(self.book.spread, 10.0)
+        depth = self.book.depth()
+        self.assertEqual(depth["bids"], [(300.0, 4.0), (290.0, 2.0)])
+        self.assertEqual(depth["asks"], [(310.0, 1.0), (320.0, 2.0)])
+
+    def test_updates(self):
+        updates = []
+        self.book.on_update += updates.append
+        self.book.process_market([
+            ask("1.7.6", 305, 1),
+            "1.7.1",
+            bid("1.7.3", 300, 1),
+            [[4, {"order_id": "1.7.3", "is_maker": True}], [0]],
+            [[4, {"order_id": "1.7.99", "is_maker": False}], [0]],
+        ])
+        self.assertEqual(self.book.best_bid, (300.0, 1.0, 300.0))
+        self.assertEqual(self.book.best_ask, (305.0, 1.0, 305.0))
+        self.assertEqual(self.book.snapshots, 1)
+        self.assertEqual(len(updates), 1)
+
+    def test_gaps(self):
+        # Removal of an order that we don't know
+        self.book.process_market(["1.7.99"])
+        self.assertEqual(self.book.snapshots, 2)
+        # Maker fill of an order that we don't know
+        self.book.process_market([[[4, {"order_id": "1.7.98", "is_maker": True}], [0]]])
+        self.assertEqual(self.book.snapshots, 3)
+        # Crossed book
+        self.book.process_market([bid("1.7.7", 315, 1)])
+        self.assertEqual(self.book.snapshots, 4)
+        self.assertEqual(self.book.best_bid[0], 300.0)
+
+    def test_truncated(self):
+        self.book.limit = 2
+        self.book.refresh()
+        self.assertEqual(self.book.truncated, {"bids": True, "asks": True})
+        # Beyond the worst known price
+        self.book.process_market([ask("1.7.8", 330, 1)])
+        self.assertEqual(self.book.depth()["asks"], [(310.0, 1.0), (320.0, 2.0)])
+        self.book.process_market(["1.7.4"])
+        self.assertEqual(self.book.snapshots, 2)
+        # Half of the orders are gone
+        self.bitshares.rpc.orders = self.bitshares.rpc.orders[2:]
+        self.book.process_market(["1.7.4", "1.7.5"])
+        self.assertEqual(self.book.snapshots, 3)
+
+    def test_truncated_refresh(self):
+        self.book.limit = 2
+        self.book.refresh()
+        self.book.refresh()
+        self.assertEqual(self.book.truncated, {"bids": True, "asks": True})
+        depth = self.book.depth()
+        self.assertEqual(depth["bids"], [(300.0, 4.0), (290.0, 2.0)])
+        self.assertEqual(depth["asks"], [(310.0, 1.0), (320.0, 2.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from bitshares.account import Account
+from bitshares.asset import Asset
+from bitshares.exceptions import TransactionExpiredError
+from bitshares.pipeline import BroadcastPipeline, transaction_id
+from bitsharesbase.signedtransactions import Signed_Transaction
+from fakes import FakeBitShares, NodeRPC, pub, transfer
+
+
+class BroadcastRPC(NodeRPC):
+    """ Rejects transfers of 13 satoshis and includes all other
+        transactions in the next block
+    """
+    def __init__(self, **kwargs):
+        super(BroadcastRPC, self).__init__(**kwargs)
+        self.head = 1000
+        self.time = "2000-01-01T00:00:00"
+        self.blocks = dict()
+
+    def broadcast_transaction(self, tx, api=None):
+        if tx["operations"][0][1]["amount"]["amount"] == 13:
+            raise ValueError("insufficient balance")
+        self.broadcast.append(tx)
+
+    def get_dynamic_global_properties(self):
+        properties = super(BroadcastRPC, self).get_dynamic_global_properties()
+        properties["head_block_number"] = self.head
+        properties["time"] = self.time
+        if self.broadcast:
+            self.head += 1
+            self.blocks[self.head] = {"transactions": self.broadcast}
+            self.broadcast = []
+        return properties
+
+    def get_block(self, num):
+        return self.blocks.get(num)
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        Asset.use_registry = False
+        Account.cache.set("1.2.100", {
+            "id": "1.2.100", "name": "init0",
+            "active": {"weight_threshold": 1, "key_auths": [[pub, 1]], "account_auths": []},
+        }, aliases=["init0"])
+        self.bitshares = FakeBitShares(BroadcastRPC())
+
+    def tearDown(self):
+        Account.cache.clear()
+        Asset.use_registry = True
+
+    def test_broadcast(self):
+        with BroadcastPipeline(bitshares_instance=self.bitshares) as pipeline:
+            futures = [pipeline.submit(transfer(), "init0") for i in range(2)]
+            failed = pipeline.submit(transfer(13), "init0")
+        first, second = [f.result() for f in futures]
+        self.assertRaises(ValueError, failed.result)
+
+        # Identical transactions differ in their expiration
+        self.assertNotEqual(first["id"], second["id"])
+        self.assertNotEqual(first["trx"]["expiration"], second["trx"]["expiration"])
+        self.assertEqual(first["id"], transaction_id(Signed_Transaction(**first["trx"])))
+        self.assertIsNone(first["block_num"])
+        self.assertEqual(len(self.bitshares.rpc.broadcast), 2)
+        self.assertEqual(len(first["trx"]["signatures"]), 1)
+        self.assertEqual(self.bitshares.rpc.calls.count("get_required_fees"), 3)
+
+    def test_confirm(self):
+        pipeline = BroadcastPipeline(
+            bitshares_instance=self.bitshares, confirm=True, interval=0.01)
+        result = pipeline.submit(transfer(), "init0").result(timeout=60)
+        self.assertEqual(result["block_num"], 1001)
+        self.assertEqual(result["trx_num"], 0)
+
+        # The block does not contain the transaction
+        self.bitshares.rpc.broadcast_transaction = lambda tx, api=None: None
+        self.bitshares.rpc.time = "2100-01-01T00:00:00"
+        future = pipeline.submit(transfer(2), "init0")
+        self.assertRaises(TransactionExpiredError, future.result, 60)
+        pipeline.stop()
+
+    def test_stop(self):
+        pipeline = BroadcastPipeline(
+            bitshares_instance=self.bitshares, confirm=True, interval=0.01)
+        # Never included in a block
+        self.bitshares.rpc.broadcast_transaction = lambda tx, api=None: None
+        future = pipeline.submit(transfer(), "init0")
+        signers = pipeline.signers
+        pipeline.stop(wait=False)
+        self.assertRaises(RuntimeError, future.result, 60)
+        self.assertIsNone(pipeline.signers)
+        self.assertTrue(signers._shutdown)
+        self.assertEqual(pipeline.unconfirmed, {})
+        # The pipeline can be started again
+        del self.bitshares.rpc.broadcast_transaction
+        with pipeline:
+            future = pipeline.submit(transfer(2), "init0")
+        self.assertEqual(future.result(60)["block_num"], 1001)
+
+
+if __name__ == '__main__':
+    unittest.main()
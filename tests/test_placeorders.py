@@ -0,0 +1,64 @@
+import unittest
+from bitshares.account import Account
+from bitshares.asset import Asset
+from bitshares.market import Market
+from fakes import FakeBitShares, NodeRPC, asset, pub
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        Asset.use_registry = False
+        Asset.cache.set("1.3.0", asset(0, "BTS", 5), aliases=["BTS"])
+        Asset.cache.set("1.3.121", asset(121, "USD", 4), aliases=["USD"])
+        Account.cache.set("1.2.100", {
+            "id": "1.2.100", "name": "init0",
+            "active": {"weight_threshold": 1, "key_auths": [[pub, 1]], "account_auths": []},
+        }, aliases=["init0"])
+
+    def tearDown(self):
+        Asset.cache.clear()
+        Account.cache.clear()
+        Asset.use_registry = True
+
+    def market(self, bitshares):
+        return Market(
+            base=Asset("BTS", bitshares_instance=bitshares),
+            quote=Asset("USD", bitshares_instance=bitshares),
+            bitshares_instance=bitshares)
+
+    def test_place_orders(self):
+        bitshares = FakeBitShares(NodeRPC())
+        market = self.market(bitshares)
+        txs = market.place_orders([
+            ("buy", 300, 10),
+            {"type": "sell", "price": 320, "amount": 5},
+        ], account="init0")
+        self.assertEqual(len(txs), 1)
+        self.assertEqual(bitshares.rpc.calls, [
+            "batch", "get_required_fees", "get_dynamic_global_properties"])
+        tx = bitshares.rpc.broadcast[0]
+        self.assertEqual(len(tx["signatures"]), 1)
+        buy, sell = [op[1] for op in tx["operations"]]
+        self.assertEqual(buy["fee"]["amount"], 500)
+        self.assertEqual(buy["amount_to_sell"], {"amount": 300000000, "asset_id": "1.3.0"})
+        self.assertEqual(buy["min_to_receive"], {"amount": 100000, "asset_id": "1.3.121"})
+        self.assertEqual(sell["amount_to_sell"], {"amount": 50000, "asset_id": "1.3.121"})
+        self.assertEqual(sell["min_to_receive"], {"amount": 160000000, "asset_id": "1.3.0"})
+
+    def test_ladder_packing(self):
+        bitshares = FakeBitShares(NodeRPC(maximum_transaction_size=256 + 3 * 40))
+        market = self.market(bitshares)
+        txs = market.place_ladder("sell", 320, 1, 10, spacing=0.1, account="init0")
+        # 3 orders per transaction, a single fee lookup
+        self.assertEqual([len(tx["operations"]) for tx in txs], [3, 3, 3, 1])
+        self.assertEqual(bitshares.rpc.calls.count("get_required_fees"), 1)
+        prices = [
+            op[1]["min_to_receive"]["amount"] / op[1]["amount_to_sell"]["amount"]
+            for tx in bitshares.rpc.broadcast for op in tx["operations"]]
+        self.assertAlmostEqual(prices[1] / prices[0], 1.1)
+        self.assertEqual(len(prices), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from bitshares.asset import Asset
+from bitshares.price import Price, Order, FilledOrder
+
+# No node is needed
+bitshares = object()
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        Asset.use_registry = False
+        for id, symbol, precision in [("1.3.0", "BTS", 5), ("1.3.121", "USD", 4)]:
+            Asset.cache.set(id, {
+                "id": id,
+                "symbol": symbol,
+                "precision": precision,
+                "options": {"flags": 0, "issuer_permissions": 0, "description": ""},
+            }, aliases=[symbol])
+        self.sell_price = {
+            "base": {"amount": 3150, "asset_id": "1.3.121"},
+            "quote": {"amount": 100000, "asset_id": "1.3.0"},
+        }
+
+    def tearDown(self):
+        Asset.cache.clear()
+        Asset.use_registry = True
+
+    def test_from_chain(self):
+        slow = Price(self.sell_price, bitshares_instance=bitshares)
+        fast = Price.from_chain(self.sell_price, bitshares_instance=bitshares)
+        self.assertIsInstance(fast, Price)
+        self.assertEqual(fast["price"], slow["price"])
+        self.assertEqual(fast["base"]["symbol"], "USD")
+        self.assertEqual(fast["quote"]["amount"], 1.0)
+        self.assertEqual(fast["base"]["asset"]["precision"], 4)
+        self.assertEqual(repr(fast), repr(slow))
+
+    def test_order_from_chain(self):
+        order = {
+            "id": "1.7.1000",
+            "seller": "1.2.100",
+            "for_sale": 3150,
+            "sell_price": self.sell_price,
+        }
+        o = Order.from_chain(order, bitshares_instance=bitshares)
+        self.assertIsInstance(o, Order)
+        self.assertEqual(o["id"], "1.7.1000")
+        self.assertEqual(o["seller"], "1.2.100")
+        self.assertEqual(o["price"], Order(order, bitshares_instance=bitshares)["price"])
+
+    def test_filledorder_from_chain(self):
+        op = {
+            "receives": {"amount": 3150, "asset_id": "1.3.121"},
+            "pays": {"amount": 100000, "asset_id": "1.3.0"},
+            "account_id": "1.2.100",
+        }
+        o = FilledOrder.from_chain(op, "1.3.121", bitshares_instance=bitshares)
+        self.assertEqual(o["type"], "sell")
+        self.assertAlmostEqual(o["price"], 0.315)
+        o = FilledOrder.from_chain(op, "1.3.0", bitshares_instance=bitshares)
+        self.assertEqual(o["type"], "buy")
+        self.assertEqual(o["base"]["symbol"], "BTS")
+        # History entry of get_fill_order_history
+        entry = {"id": "0.0.1", "time": "2018-01-01T00:00:00", "op": op}
+        o = FilledOrder.from_chain(entry, "1.3.0", bitshares_instance=bitshares)
+        self.assertEqual(o["time"].year, 2018)
+        self.assertEqual(o["account_id"], "1.2.100")
+
+    def test_copy_and_arithmetic(self):
+        p = Price.from_chain(self.sell_price, bitshares_instance=bitshares)
+        c = p.copy()
+        c["base"] *= 2
+        self.assertAlmostEqual(p["price"], 0.315)
+        self.assertAlmostEqual((p * 2)["price"], 0.63)
+        self.assertAlmostEqual((p / 2)["price"], 0.1575)
+        self.assertIs(c["base"]["asset"], p["base"]["asset"])
+        self.assertTrue(p < p * 2)
+        self.assertTrue(p * 2 >= p)
+        self.assertTrue(p == 0.315)
+
+    def test_compare_other_market(self):
+        p = Price.from_chain(self.sell_price, bitshares_instance=bitshares)
+        q = Price.from_chain({
+            "base": {"amount": 3150, "asset_id": "1.3.0"},
+            "quote": {"amount": 100000, "asset_id": "1.3.121"},
+        }, bitshares_instance=bitshares)
+        with self.assertRaises(AssertionError):
+            p < q
+
+
+if __name__ == '__main__':
+    unittest.main()
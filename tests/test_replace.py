@@ -0,0 +1,86 @@
+import unittest
+from bitshares.account import Account
+from bitshares.asset import Asset
+from bitshares.market import Market
+from fakes import FakeBitShares, NodeRPC, asset, pub
+
+
+def limit_order(id, to_sell, to_receive, for_sale=None):
+    return {
+        "id": id,
+        "seller": "1.2.100",
+        "for_sale": for_sale if for_sale is not None else to_sell["amount"],
+        "sell_price": {"base": to_sell, "quote": to_receive},
+        "expiration": "2030-01-01T00:00:00",
+    }
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        Asset.use_registry = False
+        Asset.cache.set("1.3.0", asset(0, "BTS", 5), aliases=["BTS"])
+        Asset.cache.set("1.3.121", asset(121, "USD", 4), aliases=["USD"])
+        Account.cache.set("1.2.100", {
+            "id": "1.2.100", "name": "init0",
+            "active": {"weight_threshold": 1, "key_auths": [[pub, 1]], "account_auths": []},
+        }, aliases=["init0"])
+        self.bitshares = FakeBitShares(NodeRPC())
+        self.orders = {
+            # buy 10 USD at 300 BTS/USD
+            "1.7.1": limit_order(
+                "1.7.1",
+                {"amount": 300000000, "asset_id": "1.3.0"},
+                {"amount": 100000, "asset_id": "1.3.121"}),
+            # sell 10 USD at 320 BTS/USD, half filled
+            "1.7.2": limit_order(
+                "1.7.2",
+                {"amount": 100000, "asset_id": "1.3.121"},
+                {"amount": 320000000, "asset_id": "1.3.0"},
+                for_sale=50000),
+        }
+        self.bitshares.rpc.get_objects = lambda ids: [
+            self.orders.get(i) for i in ids]
+        self.market = Market(
+            base=Asset("BTS", bitshares_instance=self.bitshares),
+            quote=Asset("USD", bitshares_instance=self.bitshares),
+            bitshares_instance=self.bitshares)
+
+    def tearDown(self):
+        Asset.cache.clear()
+        Account.cache.clear()
+        Asset.use_registry = True
+
+    def test_replace_changed_levels(self):
+        txs = self.market.replace(["1.7.1", "1.7.2", "1.7.3"], [
+            ("buy", 300, 10),
+            ("sell", 330, 5),
+        ], account="init0")
+        # A single transaction, cancels first
+        self.assertEqual(len(txs), 1)
+        tx = self.bitshares.rpc.broadcast[0]
+        self.assertEqual([op[0] for op in tx["operations"]], [2, 1])
+        cancel, create = [op[1] for op in tx["operations"]]
+        self.assertEqual(cancel["order"], "1.7.2")
+        self.assertEqual(cancel["fee"]["amount"], 500)
+        self.assertEqual(create["amount_to_sell"], {"amount": 50000, "asset_id": "1.3.121"})
+
+    def test_replace_unchanged(self):
+        txs = self.market.replace(["1.7.1", "1.7.2"], [
+            {"type": "buy", "price": 300, "amount": 10},
+            ("sell", 320, 5),
+        ], account="init0")
+        self.assertEqual(txs, [])
+        self.assertEqual(self.bitshares.rpc.broadcast, [])
+
+    def test_replace_tolerance(self):
+        orders = [("buy", 300.5, 10)]
+        self.assertEqual(self.market.replace(
+            ["1.7.1"], orders, account="init0", tolerance=0.01), [])
+        self.market.replace(["1.7.1"], orders, account="init0")
+        tx = self.bitshares.rpc.broadcast[0]
+        self.assertEqual([op[0] for op in tx["operations"]], [2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
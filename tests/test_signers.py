@@ -0,0 +1,72 @@
+import hashlib
+import unittest
+from bitsharesbase import operations, signers
+from bitsharesbase.account import PrivateKey
+from bitsharesbase.objects import Operation
+from bitsharesbase.signedtransactions import Signed_Transaction
+
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+
+# Signatures of libsecp256k1 (the first one with the first nonce, the
+# second one after a non-canonical signature)
+vectors = [
+    (b"0", "2079d47e35e3e7a895d57d79433676596b83937d2262f20cf295d30ee26fd7e2"
+           "7b15f666fb6b7a6d70ed022d8ba4c62b45b1fcdab47da921be5e22a6c3aa9ef000"),
+    (b"1", "1f2c2df69bb178858966478bb868283528d3d361fdb0d4b307e23730cb287eef"
+           "9b2063f6c38a215d104098e824181c918e37a96cca73f061356896ad57cd5c4fa1"),
+]
+
+
+def installed():
+    backends = []
+    for name in signers.preferred_backends:
+        try:
+            signers._load_backend(name)
+        except ImportError:
+            continue
+        backends.append(name)
+    return backends
+
+
+class Testcases(unittest.TestCase):
+
+    def tearDown(self):
+        signers.use()
+
+    def test_vectors(self):
+        secret = signers.decode_wif(wif)
+        self.assertEqual(secret, bytes(PrivateKey(wif)))
+        for name in installed():
+            signers.use(name)
+            for message, signature in vectors:
+                self.assertEqual(
+                    signers.sign_digest(hashlib.sha256(message).digest(), secret).hex(),
+                    signature, name)
+
+    def test_transaction(self):
+        op = operations.Transfer(**{
+            "fee": {"amount": 100, "asset_id": "1.3.0"},
+            "from": "1.2.100",
+            "to": "1.2.101",
+            "amount": {"amount": 1, "asset_id": "1.3.0"},
+        })
+        signatures = set()
+        for name in installed() + ["graphene"]:
+            signers.use(name)
+            tx = Signed_Transaction(
+                ref_block_num=34294, ref_block_prefix=3707022213,
+                expiration="2016-04-06T08:29:27", operations=[Operation(op)])
+            tx.sign([wif, wif], chain="BTS")
+            tx.verify([PrivateKey(wif).pubkey], "BTS")
+            self.assertEqual(len(tx.data["signatures"].data), 1)
+            if name != "graphene":
+                signatures.add(bytes(tx.data["signatures"].data[0]))
+        # Byte-identical
+        self.assertEqual(len(signatures), 1)
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, signers.use, "openssl")
+
+
+if __name__ == '__main__':
+    unittest.main()
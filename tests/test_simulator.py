@@ -0,0 +1,82 @@
+import unittest
+from bitshares.simulator import Simulator, _match_amounts
+
+market = {
+    "base": {"id": "1.3.0", "symbol": "BTS", "precision": 5},
+    "quote": {"id": "1.3.121", "symbol": "USD", "precision": 4},
+}
+book = {"bids": [(300, 50), (299, 10)], "asks": [(310, 40), (311, 10)]}
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = Simulator(market, balances={"BTS": 100000, "USD": 100})
+        self.sim.snapshot(book)
+
+    def test_rounding(self):
+        # Taker receives 1 satoshi and pays 334 instead of 333.33
+        self.assertEqual(_match_amounts(500, 3, 3, 1000), (334, 1, True))
+        # The maker is filled and receives 1000
+        self.assertEqual(_match_amounts(2000, 3, 3, 1000), (1000, 3, False))
+
+        sim = Simulator(market, balances={"BTS": 1})
+        sim.create(False, 3, 1000)
+        sim.create(True, 500, 1, account="sim")
+        self.assertEqual(sim.balances["sim"], {"1.3.0": 100000 - 334, "1.3.121": 1})
+        self.assertEqual(sim.orders[1].for_sale, 2)
+
+    def test_taker(self):
+        self.sim.sell(299, 55)
+        fills = self.sim.fills
+        self.assertEqual(len(fills), 2)
+        self.assertEqual(fills[0]["receives"], {"amount": 1500000000, "asset_id": "1.3.0"})
+        self.assertEqual(fills[1]["pays"], {"amount": 50000, "asset_id": "1.3.121"})
+        self.assertFalse(fills[0]["is_maker"])
+        self.assertEqual(self.sim.best_bid, 299)
+        self.assertEqual(self.sim.pnl(price=299)["value"], 15000 + 299 * 5 - 55 * 299)
+
+    def test_maker(self):
+        id = self.sim.buy(305, 10)["orderid"]
+        self.assertEqual(self.sim.best_bid, 305)
+        self.sim.trade("sell", 300, 4)
+        self.assertEqual(self.sim.fills[-1]["order_id"], id)
+        self.assertTrue(self.sim.fills[-1]["is_maker"])
+        self.assertEqual(self.sim.accountopenorders()[0]["amount"], 6)
+        self.sim.cancel(id)
+        self.assertEqual(self.sim.accountopenorders(), [])
+        self.assertEqual(self.sim.pnl(price=305), {
+            "base": -1220.0, "quote": 4.0, "value": 0.0, "price": 305,
+            "fills": 1, "volume": 4.0})
+
+    def test_rejected(self):
+        # Fill or kill beyond the book
+        with self.assertRaises(ValueError):
+            self.sim.buy(311, 60, killfill=True)
+        self.assertEqual(self.sim.fills, [])
+        # More than the balance
+        with self.assertRaises(ValueError):
+            self.sim.sell(400, 101)
+        self.sim.buy(311, 40, killfill=True)
+        self.assertEqual(self.sim.best_ask, 311)
+
+    def test_replay(self):
+        def strategy(sim, event):
+            if not sim.accountopenorders():
+                sim.sell(sim.best_ask - 1, 5, expiration=60)
+
+        pnl = self.sim.run([
+            (100, "trade", "buy", 305, 1),
+            (120, "trade", "buy", 320, 2),
+            (200, "snapshot", {"bids": [(300, 50)], "asks": [(315, 40)]}),
+        ], strategy)
+        # Partially filled by the second trade, then expired
+        self.assertEqual(pnl["fills"], 1)
+        self.assertEqual(pnl["quote"], -2)
+        self.assertEqual(pnl["base"], 2 * 309)
+        self.assertEqual(self.sim.fills[0]["time"], 120)
+        self.assertEqual([o["price"] for o in self.sim.accountopenorders()], [314])
+
+
+if __name__ == '__main__':
+    unittest.main()
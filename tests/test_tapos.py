@@ -0,0 +1,60 @@
+import time
+import unittest
+from bitshares.tapos import TaposProvider, block_params
+from bitshares.transactionbuilder import TransactionBuilder
+from bitshares.fees import FeeSchedule
+from graphenebase.transactions import getBlockParams
+from fakes import FakeBitShares, NodeRPC, block_id, transfer
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.bitshares = FakeBitShares(NodeRPC())
+        self.bitshares.fee_schedule = FeeSchedule(bitshares_instance=self.bitshares)
+        self.bitshares.tapos = TaposProvider(bitshares_instance=self.bitshares)
+        self.tapos = self.bitshares.tapos
+
+    def test_params(self):
+        self.assertEqual(
+            block_params(1000, block_id), getBlockParams(self.bitshares.rpc))
+
+    def test_notifications(self):
+        self.tapos.process_block(block_id)
+        self.assertEqual(self.tapos.block_num, 1000)
+        self.assertEqual(self.tapos.block_params(), block_params(1000, block_id))
+
+        newer = "000003e9" + "ab" * 16
+        self.tapos.process_object({
+            "id": "2.1.0", "head_block_number": 1001, "head_block_id": newer})
+        # Late notification of an older block
+        self.tapos.process_block(block_id)
+        self.assertEqual(self.tapos.block_params(), block_params(1001, newer))
+        self.assertNotIn("get_dynamic_global_properties", self.bitshares.rpc.calls)
+
+    def test_stale(self):
+        self.tapos.block_params()
+        self.assertEqual(self.bitshares.rpc.calls, ["get_dynamic_global_properties"])
+        self.tapos.block_params()
+        self.assertEqual(len(self.bitshares.rpc.calls), 1)
+        self.tapos.updated = time.time() - self.tapos.max_age - 1
+        self.tapos.block_params()
+        self.assertEqual(len(self.bitshares.rpc.calls), 2)
+
+    def test_transactionbuilder(self):
+        self.tapos.process_block(block_id)
+        self.bitshares.fee_schedule.process_object(
+            self.bitshares.rpc.get_objects(["2.0.0"])[0])
+        del self.bitshares.rpc.calls[:]
+        builder = TransactionBuilder(bitshares_instance=self.bitshares)
+        builder.appendOps(transfer())
+        builder.constructTx()
+        ref_block_num, ref_block_prefix = block_params(1000, block_id)
+        self.assertEqual(builder["ref_block_num"], ref_block_num)
+        self.assertEqual(builder["ref_block_prefix"], ref_block_prefix)
+        # No API calls at all
+        self.assertEqual(self.bitshares.rpc.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
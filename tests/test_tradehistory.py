@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from bitshares import storage
+from bitshares.storage import TradeStore
+from bitshares.tradehistory import TradeHistory
+from bitshares.utils import formatTime
+from fakes import FakeBitShares, FakeRPC
+
+market = {
+    "base": {"id": "1.3.0", "symbol": "BTS", "precision": 5},
+    "quote": {"id": "1.3.121", "symbol": "USD", "precision": 4},
+}
+stop = 1500000000
+
+
+class TradesRPC(FakeRPC):
+    """ Knows a trade every minute and records the calls
+    """
+    def get_trade_history(self, base, quote, newest, oldest, limit):
+        self.calls.append((newest, oldest))
+        return self.trades(newest, oldest, limit)
+
+    def get_trade_history_by_sequence(self, base, quote, start, oldest, limit):
+        self.calls.append((start, oldest))
+        return self.trades(formatTime(float(start * 60)), oldest, limit)
+
+    def trades(self, newest, oldest, limit):
+        newest, oldest = [
+            int(time.mktime(time.strptime(t, "%Y-%m-%dT%H:%M:%S"))) - time.timezone
+            for t in (newest, oldest)]
+        return [{
+            "sequence": t // 60,
+            "date": formatTime(float(t)),
+            "price": "300.0",
+            "amount": "1.0",
+            "value": "300.0",
+            "type": "buy",
+            "side1_account_id": "1.2.%d" % (100 + t // 60 % 2),
+            "side2_account_id": "1.2.200",
+        } for t in range(newest // 60 * 60, oldest - 1, -60)][:limit]
+
+
+class BusyRPC(TradesRPC):
+    """ Knows 250 trades within a single second
+    """
+    def get_trade_history(self, base, quote, newest, oldest, limit):
+        self.calls.append((newest, oldest))
+        return [self.trade(s) for s in range(250, 0, -1)][:limit]
+
+    def get_trade_history_by_sequence(self, base, quote, start, oldest, limit):
+        self.calls.append((start, oldest))
+        return [self.trade(s) for s in range(min(start, 250), 0, -1)][:limit]
+
+    def trade(self, sequence):
+        return {
+            "sequence": sequence,
+            "date": formatTime(float(stop - 10)),
+            "price": "300.0", "amount": "1.0", "value": "300.0",
+            "type": "buy"}
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        store = TradeStore()
+        store.data_dir = self.data_dir
+        store.sqlDataBaseFile = os.path.join(self.data_dir, "test.sqlite")
+        self.tradeStore = storage.tradeStore
+        storage.tradeStore = store
+        self.bitshares = FakeBitShares(TradesRPC())
+        self.history = TradeHistory(market, bitshares_instance=self.bitshares)
+
+    def tearDown(self):
+        storage.tradeStore = self.tradeStore
+        shutil.rmtree(self.data_dir)
+
+    def test_backfill(self):
+        start = stop - 300 * 60
+        self.assertEqual(self.history.backfill(start, stop), 300)
+        # Four pages of at most 100 trades
+        self.assertEqual(len(self.bitshares.rpc.calls), 4)
+        trades = self.history.trades(start, stop)
+        self.assertEqual(len(trades), 300)
+        self.assertEqual(trades[0]["datetime"], stop - 60)
+        self.assertEqual(trades[-1]["datetime"], start)
+
+        # Stored trades are not obtained again
+        self.assertEqual(self.history.backfill(start + 3600, stop), 0)
+        self.assertEqual(len(self.bitshares.rpc.calls), 4)
+
+    def test_same_second(self):
+        self.bitshares.rpc = BusyRPC()
+        self.assertEqual(self.history.backfill(stop - 3600, stop), 250)
+        self.assertEqual(len(self.bitshares.rpc.calls), 3)
+        self.assertEqual(self.history.gaps(stop - 3600, stop), [])
+
+    def test_gaps(self):
+        self.history.backfill(stop - 3600, stop - 1800)
+        self.history.backfill(stop - 600, stop)
+        self.assertEqual(
+            self.history.gaps(stop - 3600, stop),
+            [(stop - 1800, stop - 600)])
+        # Overlapping fetches keep a single copy of each trade
+        self.history.fetch(stop - 1800 - 120, stop - 600 + 120)
+        self.assertEqual(self.history.gaps(stop - 3600, stop), [])
+        self.assertEqual(len(self.history.trades(stop - 3600, stop)), 60)
+
+    def test_account(self):
+        self.history.backfill(stop - 600, stop)
+        trades = self.history.trades(account="1.2.101", limit=3)
+        self.assertEqual(len(trades), 3)
+        self.assertTrue(all(t["account1"] == "1.2.101" for t in trades))
+        self.assertEqual(len(self.history.trades(account="1.2.200")), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
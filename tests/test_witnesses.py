@@ -0,0 +1,73 @@
+import unittest
+from bitshares.witness import Witness, Witnesses
+from bitshares.committee import CommitteeMembers
+from fakes import FakeBitShares, FakeRPC
+
+
+class WitnessesRPC(FakeRPC):
+    """ Knows a number of witnesses
+    """
+    def __init__(self, num):
+        super(WitnessesRPC, self).__init__()
+        self.witnesses = {
+            "1.6.%d" % i: {
+                "id": "1.6.%d" % i,
+                "witness_account": "1.2.%d" % (100 + i),
+                "committee_member_account": "1.2.%d" % (100 + i),
+                "total_missed": 0,
+            } for i in range(num)
+        }
+
+    def lookup_witness_accounts(self, lower, limit):
+        names = sorted(
+            ["init%d" % int(i.split(".")[2]), i] for i in self.witnesses)
+        return [n for n in names if n[0] >= lower][:limit]
+
+    def get_witnesses(self, ids):
+        return [
+            dict(self.witnesses[i]) if i in self.witnesses else None
+            for i in ids
+        ]
+
+    lookup_committee_member_accounts = lookup_witness_accounts
+    get_committee_members = get_witnesses
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        Witness.cache.clear()
+
+    def test_witnesses(self):
+        bts = FakeBitShares(WitnessesRPC(1500))
+        witnesses = Witnesses(bitshares_instance=bts, chunk_size=100)
+        self.assertEqual(len(witnesses), 1500)
+        self.assertEqual(bts.rpc.round_trips, 2)
+        self.assertIs(witnesses["init7"], witnesses["1.6.7"])
+        self.assertIs(witnesses["1.2.107"], witnesses["1.6.7"])
+        # Served from the cache
+        self.assertEqual(Witness("init7", bitshares_instance=bts)["id"], "1.6.7")
+
+    def test_refresh(self):
+        bts = FakeBitShares(WitnessesRPC(3))
+        witnesses = Witnesses(bitshares_instance=bts)
+        witness = witnesses["init1"]
+        bts.rpc.witnesses["1.6.1"]["total_missed"] = 5
+        del bts.rpc.witnesses["1.6.2"]
+        witnesses.refresh()
+        self.assertEqual(bts.rpc.round_trips, 3)
+        self.assertEqual(witness["total_missed"], 5)
+        self.assertEqual(len(witnesses), 2)
+        self.assertNotIn("init2", witnesses)
+        witnesses.process_notice(dict(bts.rpc.witnesses["1.6.0"], total_missed=9))
+        self.assertEqual(witnesses["init0"]["total_missed"], 9)
+
+    def test_committee(self):
+        bts = FakeBitShares(WitnessesRPC(11))
+        members = CommitteeMembers(bitshares_instance=bts)
+        self.assertEqual(len(members), 11)
+        self.assertEqual(members["init10"]["committee_member_account"], "1.2.110")
+
+
+if __name__ == '__main__':
+    unittest.main()